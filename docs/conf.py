@@ -63,7 +63,7 @@ autodoc_mock_imports = [
     "ssd1306",
     "utime",
     "framebuf",
-    # 'micropython',  # note that europi.py currently depends on this module _not_ being mocked in order to set TEST_ENV
+    "micropython",
 ]
 
 autosummary_generate = True
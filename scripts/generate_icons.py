@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+This script converts the 1-bit images in `software/icons` into the `bytes` literals of the
+`icons.py` firmware module. Simply execute this script from the root of the project directory
+after adding or editing an image.
+
+   $ python3 scripts/generate_icons.py
+
+Images are read from plain PBM files, which can be edited by hand or exported from most image
+editors. Other image formats are converted if Pillow is installed. Black pixels (1 in a PBM) are
+drawn, white pixels are transparent.
+
+Two kinds of data are generated:
+
+* Atlases: a group of equally sized icons packed into a single `IconAtlas`, one icon after
+  another in `MONO_HLSB` format.
+* Frames: a full screen image, in the `MONO_VLSB` format of the display's own buffer, so that it
+  can be copied straight into `oled.buffer`.
+"""
+import os
+
+ICONS_DIR = "software/icons"
+OUTPUT_FILE = "software/firmware/icons.py"
+
+OLED_WIDTH = 128
+OLED_HEIGHT = 32
+
+ATLASES = {
+    # The wave shapes of the HarmonicLFOs script, in the order of HarmonicLFOs.MODES_SHAPES.
+    "LFO_SHAPES": [
+        "lfo_sine",
+        "lfo_saw",
+        "lfo_square",
+        "lfo_off",
+        "lfo_random",
+        "lfo_noise",
+    ],
+}
+
+FRAMES = {
+    "BOOTSPLASH": "bootsplash",
+}
+
+HEADER = '''"""1-bit icons and images, generated from the images in ``software/icons`` by
+``scripts/generate_icons.py``. Do not edit this file by hand, edit the images and regenerate it.
+
+The data is stored in ``bytes`` literals, which stay in flash when the firmware is frozen, see
+:class:`icon_atlas.IconAtlas`.
+"""
+from icon_atlas import IconAtlas
+'''
+
+
+def read_pbm(path):
+    """Returns the pixels of a plain (P1) or raw (P4) PBM file as a list of rows of 0s and 1s."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    tokens = []
+    position = 0
+    while len(tokens) < 3:
+        while data[position : position + 1].isspace():
+            position += 1
+        if data[position : position + 1] == b"#":
+            position = data.index(b"\n", position)
+            continue
+        start = position
+        while not data[position : position + 1].isspace():
+            position += 1
+        tokens.append(data[start:position].decode())
+    magic, width, height = tokens[0], int(tokens[1]), int(tokens[2])
+
+    if magic == "P4":
+        row_bytes = (width + 7) // 8
+        raw = data[position + 1 :]
+        return [
+            [(raw[y * row_bytes + x // 8] >> (7 - x % 8)) & 1 for x in range(width)]
+            for y in range(height)
+        ]
+    if magic != "P1":
+        raise ValueError(f"{path}: unsupported PBM format {magic}")
+
+    bits = [int(c) for c in data[position:].decode() if c in "01"]
+    return [bits[y * width : (y + 1) * width] for y in range(height)]
+
+
+def read_image(path):
+    """Returns the pixels of an image as a list of rows of 0s and 1s."""
+    if path.endswith(".pbm"):
+        return read_pbm(path)
+    try:
+        from PIL import Image
+    except ImportError:
+        raise SystemExit(f"{path}: Pillow is required to convert images other than PBM")
+    image = Image.open(path).convert("1")
+    return [
+        [int(image.getpixel((x, y)) == 0) for x in range(image.width)] for y in range(image.height)
+    ]
+
+
+def to_mono_hlsb(pixels):
+    """Packs pixels into rows of bytes, most significant bit leftmost."""
+    data = bytearray()
+    for row in pixels:
+        for x in range(0, len(row), 8):
+            byte = 0
+            for bit, value in enumerate(row[x : x + 8]):
+                byte |= value << (7 - bit)
+            data.append(byte)
+    return bytes(data)
+
+
+def to_mono_vlsb(pixels):
+    """Packs pixels into pages of 8 rows, one byte per column, least significant bit on top."""
+    data = bytearray()
+    for page in range(0, len(pixels), 8):
+        for x in range(len(pixels[0])):
+            byte = 0
+            for bit, row in enumerate(pixels[page : page + 8]):
+                byte |= row[x] << bit
+            data.append(byte)
+    return bytes(data)
+
+
+def find_image(name):
+    for filename in sorted(os.listdir(ICONS_DIR)):
+        if os.path.splitext(filename)[0] == name:
+            return os.path.join(ICONS_DIR, filename)
+    raise SystemExit(f"No image named '{name}' in {ICONS_DIR}")
+
+
+def format_bytes(data, indent):
+    """Formats data as a bytes literal split across lines."""
+    hex_data = "".join(f"\\x{b:02x}" for b in data)
+    width = 96 - indent
+    width -= width % 4
+    lines = [hex_data[i : i + width] for i in range(0, len(hex_data), width)]
+    return "\n".join(f'{" " * indent}b"{line}"' for line in lines)
+
+
+def generate_atlas(name, images):
+    icons = [read_image(find_image(image)) for image in images]
+    height, width = len(icons[0]), len(icons[0][0])
+    for image, icon in zip(images, icons):
+        if (len(icon), len(icon[0])) != (height, width):
+            raise SystemExit(f"{image} is not the same size as {images[0]} ({width}x{height})")
+    data = b"".join(to_mono_hlsb(icon) for icon in icons)
+    print(f"Generating: {name} ({len(icons)} {width}x{height} icons, {len(data)} bytes)")
+    return (
+        f"# {', '.join(images)}\n"
+        f"{name} = IconAtlas(\n"
+        f"    (\n{format_bytes(data, 8)}\n    ),\n"
+        f"    {width},\n"
+        f"    {height},\n"
+        f")\n"
+    )
+
+
+def generate_frame(name, image):
+    pixels = read_image(find_image(image))
+    if (len(pixels[0]), len(pixels)) != (OLED_WIDTH, OLED_HEIGHT):
+        raise SystemExit(f"{image} must be {OLED_WIDTH}x{OLED_HEIGHT}")
+    print(f"Generating: {name} ({OLED_WIDTH}x{OLED_HEIGHT} frame)")
+    return f"# {image}\n{name} = (\n{format_bytes(to_mono_vlsb(pixels), 4)}\n)\n"
+
+
+if __name__ == "__main__":
+    sections = [HEADER]
+    sections += [generate_atlas(name, images) for name, images in ATLASES.items()]
+    sections += [generate_frame(name, image) for name, image in FRAMES.items()]
+
+    with open(OUTPUT_FILE, "w") as f:
+        f.write("\n\n".join(sections))
+    print(f"Wrote {OUTPUT_FILE}")
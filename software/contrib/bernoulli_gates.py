@@ -1,5 +1,4 @@
 from europi import *
-from time import sleep_ms
 from random import random
 from europi_script import EuroPiScript
 import machine
@@ -12,6 +11,9 @@ BERNOULLI_INDI_WID = 5
 # Trigger Time (some module may not be able to catch up the trigger if it is too short)
 BERNOULLI_TRG_T = 20
 
+# How long the indicator stays on the display after a trigger, longer than a frame so it is seen
+BERNOULLI_INDI_T = 100
+
 class SingleBernoulliGate():
     def __init__(self, control_knob =  k1, control_port = ain, out_port = (cv1, cv2, cv3), visualization_para = ('P1', (0, 0), 0, -3), port3_func = 'clock', port3_source_cv = None):
         '''
@@ -27,6 +29,7 @@ class SingleBernoulliGate():
         '''
         self.mode_flg = 0 # mode 0: Trigger, mode 1: Gate, mode 2: Toggle
         self.coin = 0 # probability
+        self.toss_time = None # ticks_ms of the last toss in trigger mode
         self.right_possibility = 0 # change every iteration
         self.left_possibility = 0
         self.right_possibility_sampled = 0 # only change when triggered
@@ -80,22 +83,18 @@ class SingleBernoulliGate():
         if self.mode_flg == 0 or self.mode_flg == 1:
             if self.coin < (self.right_possibility_sampled):
                 self.left_port.off()
-                self.right_port.on()
                 if self.mode_flg == 0:
-                    # Draw right indicator
-                    oled.fill_rect(int(OLED_WIDTH / 2 + self.right_possibility * BERNOULLI_BAR_LEN) + 2, 
-                                   int((OLED_HEIGHT - BERNOULLI_BAR_WID) / 2) + self.bar_pos_offset, 
-                                   BERNOULLI_INDI_WID, 
-                                   BERNOULLI_BAR_WID, 1)
+                    self.right_port.trigger(BERNOULLI_TRG_T)
+                    self.toss_time = ticks_ms()
+                else:
+                    self.right_port.on()
             else:
-                self.left_port.on()
                 self.right_port.off()
                 if self.mode_flg == 0:
-                    # Draw left indicator
-                    oled.rect(int(OLED_WIDTH / 2 - self.left_possibility * BERNOULLI_BAR_LEN) - BERNOULLI_INDI_WID - 2, 
-                              int((OLED_HEIGHT - BERNOULLI_BAR_WID) / 2) + self.bar_pos_offset, 
-                              BERNOULLI_INDI_WID, 
-                              BERNOULLI_BAR_WID, 1)
+                    self.left_port.trigger(BERNOULLI_TRG_T)
+                    self.toss_time = ticks_ms()
+                else:
+                    self.left_port.on()
         else:
             if self.coin < (self.right_possibility_sampled):
                 self.left_port.toggle()
@@ -103,55 +102,60 @@ class SingleBernoulliGate():
 
     def function_port_maneuver(self):
         if self.port3_func == 'none':
-            pass
+            return
         elif self.port3_func == 'clock':
-            self.function_port.on()
+            value = True
+        elif self.port3_func == 'and':
+            value = (self.port3_source_cv._duty and self.left_port._duty) != 0
+        elif self.port3_func == 'or':
+            value = (self.port3_source_cv._duty or self.left_port._duty) != 0
+        elif self.port3_func == 'xor':
+            value = (self.port3_source_cv._duty ^ self.left_port._duty) != 0
         else:
-            if self.port3_func == 'and':
-                self.function_port.value((self.port3_source_cv._duty and self.left_port._duty) != 0)
-            elif self.port3_func == 'or':
-                self.function_port.value((self.port3_source_cv._duty or self.left_port._duty) != 0)
-            elif self.port3_func == 'xor':
-                self.function_port.value((self.port3_source_cv._duty ^ self.left_port._duty) != 0)
-            else:
-                self.function_port.off()
+            value = False
+
+        # The logic functions hold their value in gate mode, otherwise the function port sends a trigger
+        if self.mode_flg == 1 and self.port3_func != 'clock':
+            self.function_port.value(value)
+        elif value:
+            self.function_port.trigger(BERNOULLI_TRG_T)
+        else:
+            self.function_port.off()
+
+    def next_mode(self):
+        self.mode_flg += 1
+        if self.mode_flg == 3:
+            self.mode_flg = 0
+            # Triggers end by themselves, turn off any gates left on by the toggle mode
+            self.left_port.off()
+            self.right_port.off()
+
+    def indicator_visualization(self):
+        if self.coin < (self.right_possibility_sampled):
+            # Draw right indicator
+            oled.fill_rect(int(OLED_WIDTH / 2 + self.right_possibility * BERNOULLI_BAR_LEN) + 2, 
+                           int((OLED_HEIGHT - BERNOULLI_BAR_WID) / 2) + self.bar_pos_offset, 
+                           BERNOULLI_INDI_WID, 
+                           BERNOULLI_BAR_WID, 1)
+        else:
+            # Draw left indicator
+            oled.rect(int(OLED_WIDTH / 2 - self.left_possibility * BERNOULLI_BAR_LEN) - BERNOULLI_INDI_WID - 2, 
+                      int((OLED_HEIGHT - BERNOULLI_BAR_WID) / 2) + self.bar_pos_offset, 
+                      BERNOULLI_INDI_WID, 
+                      BERNOULLI_BAR_WID, 1)
 
     def regular_visualization(self):
         if self.mode_flg == 0:
             oled.text('Tr', self.text1_pos, OLED_HEIGHT-8, 1)
+            # Hold the indicator long enough for the display to show it
+            if self.toss_time is not None and ticks_diff(ticks_ms(), self.toss_time) < BERNOULLI_INDI_T:
+                self.indicator_visualization()
         elif self.mode_flg == 1:
             oled.text('G', self.text1_pos, OLED_HEIGHT-8, 1)
-            # Draw indicator
-            if self.coin < (self.right_possibility_sampled):
-                oled.fill_rect(int(OLED_WIDTH / 2 + self.right_possibility * BERNOULLI_BAR_LEN) + 2, 
-                               int((OLED_HEIGHT - BERNOULLI_BAR_WID) / 2) + self.bar_pos_offset, 
-                               BERNOULLI_INDI_WID, 
-                               BERNOULLI_BAR_WID, 1)                
-            else:
-                oled.rect(int(OLED_WIDTH / 2 - self.left_possibility * BERNOULLI_BAR_LEN) - BERNOULLI_INDI_WID - 2, 
-                          int((OLED_HEIGHT - BERNOULLI_BAR_WID) / 2) + self.bar_pos_offset, 
-                          BERNOULLI_INDI_WID, 
-                          BERNOULLI_BAR_WID, 1)
+            self.indicator_visualization()
         elif self.mode_flg == 2:
             oled.text('Tg', self.text1_pos, OLED_HEIGHT-8, 1)
 
-    def regular_maneuver(self):
-        if self.mode_flg == 0:
-            self.left_port.off()
-            self.right_port.off()
-            if self.port3_func != 'none':
-                self.function_port.off()
-        elif self.mode_flg == 1:
-            if self.port3_func == 'clock':
-                self.function_port.off()
-            else:
-                pass
-        elif self.mode_flg == 2:
-            if self.port3_func == 'none':
-                pass
-            else:
-                self.function_port.off()
-
 class BernoulliGates(EuroPiScript):
     def __init__(self):
         self.toss_flg = 0
@@ -172,15 +176,11 @@ class BernoulliGates(EuroPiScript):
 
         @b1.handler
         def mode_switch_1():
-            self.first_gate.mode_flg += 1
-            if self.first_gate.mode_flg == 3:
-                self.first_gate.mode_flg = 0
+            self.first_gate.next_mode()
 
         @b2.handler
         def mode_switch_2():
-            self.second_gate.mode_flg += 1
-            if self.second_gate.mode_flg == 3:
-                self.second_gate.mode_flg = 0
+            self.second_gate.next_mode()
 
     def main(self):
         while True:
@@ -211,9 +211,6 @@ class BernoulliGates(EuroPiScript):
             # Regular maneuver
             self.first_gate.regular_visualization()
             self.second_gate.regular_visualization()
-            sleep_ms(BERNOULLI_TRG_T)
-            self.first_gate.regular_maneuver()
-            self.second_gate.regular_maneuver()
             oled.show()
     
 if __name__ == "__main__":    
@@ -1,8 +1,9 @@
 from europi import *
 from random import random
-from time import sleep_ms, ticks_ms, ticks_add, ticks_diff
+from time import sleep_ms
 import machine
 from europi_script import EuroPiScript
+from timing import Ticker
 
 # Internal clock tempo range.
 MAX_BPM = 280
@@ -18,12 +19,14 @@ class CoinToss(EuroPiScript):
         self.internal_clock = True
         self._prev_clock = 0
         self._tempo = 0
-        self._deadline = 0
+        self._ticker = Ticker(self.get_period_us())
 
         @b1.handler
         def toggle_clock():
             """Toggle between internal clock and external clock from digital in."""
             self.internal_clock = not self.internal_clock
+            # Restart the internal clock from now rather than catching up on the missed ticks
+            self._ticker.reset()
 
         @b2.handler
         def toggle_gate():
@@ -35,19 +38,16 @@ class CoinToss(EuroPiScript):
         """Read the current tempo set by k1 within set range."""
         return round(k1.read_position(MAX_BPM - MIN_BPM) + MIN_BPM)
 
-    def get_next_deadline(self):
-        """Get the deadline for next clock tick whole note."""
-        # The duration of a quarter note in ms for the current tempo.
-        wait_ms = int(((60 / self.tempo()) / 4) * 1000)
-        return ticks_add(ticks_ms(), wait_ms)
+    def get_period_us(self):
+        """Get the time between clock ticks."""
+        # The duration of a quarter note in us for the current tempo.
+        return int(((60 / self.tempo()) / 4) * 1_000_000)
 
     def wait(self):
         """Pause script execution waiting for next quarter note in the clock cycle."""
         if self.internal_clock:
-            while True:
-                if ticks_diff(self._deadline, ticks_ms()) <= 0:
-                    self._deadline = self.get_next_deadline()
-                    return
+            self._ticker.period_us = self.get_period_us()
+            self._ticker.wait()
         else:  # External clock
             # Loop until digital in goes high (clock pulse received).
             while not self.internal_clock:
@@ -3,6 +3,8 @@ import machine
 from time import ticks_diff, ticks_ms
 from random import randint, uniform
 from europi_script import EuroPiScript
+from clock_tracker import ClockTracker
+from gc_manager import GCManager
 import gc
 
 '''
@@ -49,6 +51,9 @@ March-23    decreased maxRandomPatterns to 32 to avoid crashes on some systems
 
 class Consequencer(EuroPiScript):
     def __init__(self):
+        # Collects garbage between clock pulses, so collections don't delay the triggers
+        self.gcManager = GCManager(ClockTracker(din))
+
         # Initialize sequencer pattern arrays   
         p = pattern()     
         self.BD=p.BD
@@ -236,18 +241,18 @@ class Consequencer(EuroPiScript):
 
     def getPattern(self):
         # If mode 2 and there is CV on the analogue input use it, if not use the knob position
-        val = 100 * ain.percent()
+        val = 100 * self.inputs.ain.percent()
         if self.analogInputMode == 2 and val > self.minAnalogInputVoltage:
             self.pattern = int((len(self.BD) / 100) * val)
-            self.pattern = min(int((len(self.BD) / 100) * val) + k2.read_position(len(self.BD)), len(self.BD)-1)
+            self.pattern = min(int((len(self.BD) / 100) * val) + self.inputs.k2.read_position(len(self.BD)), len(self.BD)-1)
         else:
-            self.pattern = k2.read_position(len(self.BD))
+            self.pattern = self.inputs.k2.read_position(len(self.BD))
         
         self.step_length = len(self.BD[self.pattern])
 
     def getCvPattern(self):
         # If analogue input mode 3, get the CV pattern from CV input
-        val = 100 * ain.percent()
+        val = 100 * self.inputs.ain.percent()
         if self.analogInputMode == 3 and val > self.minAnalogInputVoltage:
             # Convert percentage value to a representative index of the pattern array
             self.CvPattern = int((len(self.random4) / 100) * val)
@@ -261,18 +266,21 @@ class Consequencer(EuroPiScript):
 
     def getRandomness(self):
         # If mode 1 and there is CV on the analogue input use it, if not use the knob position
-        val = 100 * ain.percent()
+        val = 100 * self.inputs.ain.percent()
         if self.analogInputMode == 1 and val > self.minAnalogInputVoltage:
-            self.randomness = min(val + k1.read_position(), 99)
+            self.randomness = min(val + self.inputs.k1.read_position(), 99)
         else:
-            self.randomness = k1.read_position()
+            self.randomness = self.inputs.k1.read_position()
 
     def main(self):
         while True:
+            # Read the inputs once per loop, they are used by several of the following methods
+            self.inputs = snapshot()
             self.getPattern()
             self.getRandomness()
             self.getCvPattern()
             self.updateScreen()
+            self.gcManager.idle()
             # If I have been running, then stopped for longer than reset_timeout, reset the steps and clock_step to 0
             if self.clock_step != 0 and ticks_diff(ticks_ms(), din.last_triggered()) > self.reset_timeout:
                 self.step = 0
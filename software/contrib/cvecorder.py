@@ -97,6 +97,11 @@ class CVecorder(EuroPiScript):
                 self.saveState()
                 self.loadState()
 
+        # The clock handlers save a finished recording to flash, which can take longer than the
+        # time between clocks. Queue the clocks and handle them via micropython.schedule() so that
+        # none are lost while saving.
+        din.defer(schedule=True)
+
         @din.handler
         def dInput():
             self.handleClock()
@@ -230,7 +230,7 @@ class ChannelMenu:
         pattern_str = str(g)
         
         oled.fill(0)
-        oled.text(f"-- CV {generator_index+1} --", 0, 0)
+        oled.cached_text(f"-- CV {generator_index+1} --", 0, 0)
         if len(pattern_str) > 16:
             pattern_row1 = pattern_str[0:16]
             pattern_row2 = pattern_str[16:]
@@ -276,7 +276,7 @@ class SettingsMenu:
         @return a tuple of the form (menu_item, lower_bound, upper_bound, current_setting, new_setting)
         """
         
-        menu_item = k1.range(len(self.menu_items))
+        menu_item = k1.read_stable_position(len(self.menu_items))
         lower_bound = 0
         upper_bound = 0
         current_setting = 0
@@ -298,7 +298,7 @@ class SettingsMenu:
             upper_bound = 100
             current_setting = int(self.generator.skip * 100)
             
-        new_setting = k2.range(upper_bound-lower_bound+1) + lower_bound
+        new_setting = k2.read_stable_position(upper_bound-lower_bound+1) + lower_bound
         
         return (menu_item, lower_bound, upper_bound, current_setting, new_setting)
         
@@ -306,7 +306,7 @@ class SettingsMenu:
         (menu_item, lower_bound, upper_bound, current_setting, new_setting) = self.read_knobs()
         
         oled.fill(0)
-        oled.text(f"-- {self.menu_items[menu_item]} --", 0, 0)
+        oled.cached_text(f"-- {self.menu_items[menu_item]} --", 0, 0)
         oled.text(f"{current_setting} <- {new_setting}", 0, 10)
         oled.show()
         
@@ -1,12 +1,20 @@
 from europi import *
-from math import cos, radians
-from time import sleep_ms
+from utime import ticks_add, ticks_diff, ticks_us
 from machine import freq
 from random import randint
 from europi_script import EuroPiScript
+from icons import LFO_SHAPES
+from ui import Plot
+from oscillator import Oscillator, PHASE_MASK, PHASE_ONE, SAW, SINE, SMOOTH_RANDOM, SQUARE
 
 MAX_VOLTAGE = MAX_OUTPUT_VOLTAGE # Default is inherited but this can be overriden by replacing "MAX_OUTPUT_VOLTAGE" with an integer
 MAX_HARMONIC = 32 # Too high a value may be hard to select using the knob, but the actual hardware limit is only reached at 4096
+MAX_MV = int(MAX_VOLTAGE * 1000)
+RANDOM_CYCLES = 8 # The RANDOM shape's wavetable is spread over this many of the LFO's cycles, so that it takes a while to repeat
+STEP_US = 1000 # The outputs are updated on a fixed grid of deadlines this far apart
+LOOP_US = 3000 # The original display-driven loop advanced the LFOs by the master rate about this often, the rate is scaled so that each k1 position keeps its cycle time
+MAX_INCREMENT = PHASE_ONE // 2 - 1 # An LFO moving half a cycle or more per step would alias, so faster rates are held at this
+FRAME_US = 1000000 // 30 # The display and knobs are updated at most 30 times per second
 
 
 class HarmonicLFOs(EuroPiScript):
@@ -18,6 +26,7 @@ class HarmonicLFOs(EuroPiScript):
         'RANDOM': 4,
         'NOISE': 5,
     }
+    SHAPE_TABLES = [SINE, SAW, SQUARE, None, SMOOTH_RANDOM, None]
 
     def __init__(self):
         super().__init__()
@@ -31,41 +40,49 @@ class HarmonicLFOs(EuroPiScript):
         self.MODES_COUNT = len(self.MODES_SHAPES)
 
         # Initialise all the other variables
-        self.degree = 0
-        self.rad = radians(self.degree)
         self.delay, self.increment_value = self.get_delay_increment_value()
-        self.pixel_x = OLED_WIDTH-1
-        self.pixel_y = OLED_HEIGHT-1
+        self.oscillators = [Oscillator(max_mv=MAX_MV) for _ in range(6)]
+        self.update_oscillators()
+        self.millivolts = [0] * 6
+        self.plot = Plot(traces=6, max_value=MAX_MV, x=20, width=OLED_WIDTH-20)
         self.selected_lfo = 0
-        self.clock_division = self.selected_lfo_start_value = self.get_clock_division()
 
         # Set the digital input and button handlers
         din.handler(self.reset)
         b1.handler(self.change_mode)
         b2.handler(self.increment_selection)
-
-    def get_clock_division(self):
-        """Determine the new clock division based on the position of knob 2"""
-        return k2.read_position(MAX_HARMONIC) + 1
+        k2.on_change(self.change_clock_division, steps=MAX_HARMONIC)
 
     def reset(self):
         """Reset all LFOs to zero volts, maintaining their divisions"""
-        self.degree = 0
+        for oscillator in self.oscillators:
+            oscillator.reset()
 
     def change_mode(self):
         """Change the mode that controls wave shape"""
         self.modes[self.selected_lfo] = (self.modes[self.selected_lfo] + 1) % self.MODES_COUNT
+        self.update_oscillators()
         self.save_state()
 
     def get_delay_increment_value(self):
-        """Calculate the wait time between degrees"""
+        """Calculate the master rate, as a number of degrees every LOOP_US"""
         delay = (0.1 - (k1.read_position(100, 1) / 1000)) + (ain.read_voltage(1) / 100)
         return delay, round((((1 / delay) - 10) / 1) + 1)
 
+    def update_oscillators(self):
+        """Set each oscillator's wavetable and its phase increment per STEP_US from its mode, division and the master rate"""
+        degrees_per_step = self.increment_value * STEP_US / LOOP_US
+        for oscillator, mode, multiplier in zip(self.oscillators, self.modes, self.divisions):
+            oscillator.table = self.SHAPE_TABLES[mode]
+            if mode == self.MODES_SHAPES['RANDOM']:
+                multiplier *= RANDOM_CYCLES
+            increment = int(degrees_per_step * PHASE_ONE / (360 * multiplier))
+            # A negative master rate, from a high voltage on ain, runs the LFOs backwards as it always has
+            oscillator.increment = clamp(increment, -MAX_INCREMENT, MAX_INCREMENT) & PHASE_MASK
+
     def increment_selection(self):
         """Move the selection to the next LFO"""
         self.selected_lfo = (self.selected_lfo + 1) % 6
-        self.selected_lfo_start_value = self.get_clock_division()
 
     def save_state(self):
         """Save the current set of divisions to file"""
@@ -78,112 +95,21 @@ class HarmonicLFOs(EuroPiScript):
         })
         
     def update_display(self):
-        """Update the OLED display every 10 cycles (degrees)"""
-        oled.scroll(-1, 0)
-
-        if round(self.degree, -1) % 10 == 0:
-            oled.show()
-            
-    def increment(self):
-        """Increment the current degree and determine new values of delay and increment_value"""
-        self.degree += self.increment_value
-        self.delay, self.increment_value = self.get_delay_increment_value()
-        sleep_ms(int(self.delay))
-        
+        """Add the current voltages to the plot and redraw the OLED display"""
+        self.plot.add(*self.millivolts)
+        self.display_selected_lfo()
+        self.plot.draw()
+        oled.show()
+
+    def read_rate(self):
+        """Determine new values of delay and increment_value, updating the oscillators if they changed"""
+        delay, increment_value = self.get_delay_increment_value()
+        if (delay, increment_value) != (self.delay, self.increment_value):
+            self.delay, self.increment_value = delay, increment_value
+            self.update_oscillators()
+
     def draw_wave(self):
-        shape = self.modes[self.selected_lfo]
-
-        if shape == self.MODES_SHAPES['SINE']:
-            oled.pixel(3, 31, 1)
-            oled.pixel(3, 30, 1)
-            oled.pixel(3, 29, 1)
-            oled.pixel(4, 28, 1)
-            oled.pixel(4, 27, 1)
-            oled.pixel(4, 26, 1)
-            oled.pixel(4, 25, 1)
-            oled.pixel(5, 24, 1)
-            oled.pixel(6, 23, 1)
-            oled.pixel(7, 23, 1)
-            oled.pixel(8, 24, 1)
-            oled.pixel(9, 25, 1)
-            oled.pixel(9, 26, 1)
-            oled.pixel(9, 27, 1)
-            oled.pixel(10, 28, 1)
-            oled.pixel(10, 29, 1)
-            oled.pixel(11, 30, 1)
-            oled.pixel(12, 31, 1)
-            oled.pixel(13, 31, 1)
-            oled.pixel(14, 30, 1)
-            oled.pixel(15, 29, 1)
-            oled.pixel(15, 28, 1)
-            oled.pixel(15, 27, 1)
-            oled.pixel(15, 26, 1)
-            oled.pixel(16, 25, 1)
-            oled.pixel(16, 24, 1)
-            oled.pixel(16, 23, 1)
-        elif shape == self.MODES_SHAPES['SAW']:
-            oled.line(3, 31, 9, 24, 1)
-            oled.vline(9, 24, 8, 1)
-            oled.line(9, 31, 15, 24, 1)
-            oled.vline(15, 24, 8, 1)
-        elif shape == self.MODES_SHAPES['SQUARE']:
-            oled.vline(3, 24, 8, 1)
-            oled.hline(3, 24, 6, 1)
-            oled.vline(9, 24, 8, 1)
-            oled.hline(9, 31, 6, 1)
-            oled.vline(15, 24, 8, 1)
-        elif shape == self.MODES_SHAPES['OFF']:
-            oled.line(3, 24, 15, 31, 1)
-            oled.line(15, 24, 3, 31, 1)
-        elif shape == self.MODES_SHAPES['RANDOM']:
-            oled.pixel(3, 29, 1)
-            oled.pixel(4, 28, 1)
-            oled.pixel(4, 27, 1)
-            oled.pixel(5, 26, 1)
-            oled.pixel(6, 26, 1)
-            oled.pixel(7, 27, 1)
-            oled.pixel(8, 28, 1)
-            oled.pixel(9, 28, 1)
-            oled.pixel(10, 27, 1)
-            oled.pixel(10, 26, 1)
-            oled.pixel(10, 25, 1)
-            oled.pixel(11, 24, 1)
-            oled.pixel(12, 25, 1)
-            oled.pixel(13, 26, 1)
-            oled.pixel(13, 27, 1)
-            oled.pixel(14, 28, 1)
-            oled.pixel(14, 29, 1)
-            oled.pixel(15, 30, 1)
-            oled.pixel(16, 30, 1)
-        elif shape == self.MODES_SHAPES['NOISE']:
-            oled.pixel(3, 26, 1)
-            oled.pixel(3, 30, 1)
-            oled.pixel(4, 24, 1)
-            oled.pixel(4, 23, 1)
-            oled.pixel(5, 31, 1)
-            oled.pixel(5, 29, 1)
-            oled.pixel(6, 25, 1)
-            oled.pixel(6, 23, 1)
-            oled.pixel(7, 29, 1)
-            oled.pixel(7, 25, 1)
-            oled.pixel(8, 26, 1)
-            oled.pixel(8, 30, 1)
-            oled.pixel(9, 27, 1)
-            oled.pixel(9, 24, 1)
-            oled.pixel(10, 26, 1)
-            oled.pixel(10, 29, 1)
-            oled.pixel(11, 24, 1)
-            oled.pixel(11, 30, 1)
-            oled.pixel(12, 23, 1)
-            oled.pixel(12, 25, 1)
-            oled.pixel(13, 29, 1)
-            oled.pixel(13, 25, 1)
-            oled.pixel(14, 28, 1)
-            oled.pixel(14, 26, 1)
-            oled.pixel(15, 24, 1)
-            oled.pixel(15, 31, 1)
-            oled.pixel(16, 27, 1)
-            oled.pixel(16, 30, 1)
+        LFO_SHAPES.blit(oled, self.modes[self.selected_lfo], 3, 23)
 
     def display_selected_lfo(self):
         """Draw the current LFO's number and division to the OLED display"""
@@ -197,57 +123,48 @@ class HarmonicLFOs(EuroPiScript):
         
         self.draw_wave()
         
-    def calculate_voltage(self, cv, multiplier):
-        """Determine the voltage based on current degree, wave shape, and MAX_VOLTAGE"""
-        three_sixty = 360 * multiplier
-        degree_three_sixty = self.degree % three_sixty
-        shape = self.modes[cvs.index(cv)]
-        voltage = 0
-
-        if shape == self.MODES_SHAPES['SINE']:
-            voltage = (0 - (cos(self.rad * (1 / multiplier))) + 1) * (MAX_VOLTAGE / 2)
-        elif shape == self.MODES_SHAPES['SAW']:
-            voltage = (degree_three_sixty / three_sixty) * MAX_VOLTAGE
-        elif shape == self.MODES_SHAPES['SQUARE']:
-            voltage = MAX_VOLTAGE * (int((degree_three_sixty / three_sixty) * MAX_VOLTAGE) < (MAX_VOLTAGE / 2))
-        elif shape == self.MODES_SHAPES['RANDOM']:  # This is NOT actually random, it is the sum of 3 out of sync sine waves, but it produces a fluctuating voltage that is near impossible to predict over time, and which can be clocked to be in time
-            voltage = (((0 - (cos(self.rad * (1 / multiplier))) + 1) * (MAX_VOLTAGE / 2)) / 3) \
-                    + (((0 - (cos(self.rad * (1 / (multiplier * 2.3)))) + 1) * (MAX_VOLTAGE / 2)) / 3) \
-                    + (((0 - (cos(self.rad * (1 / (multiplier * 5.6)))) + 1) * (MAX_VOLTAGE / 2)) / 3)
-        elif shape == self.MODES_SHAPES['NOISE']:  # The division knob is affecting the spread for the noise
-            voltage = MAX_VOLTAGE * randint(0, int((1000 / MAX_HARMONIC) * multiplier)) / 1000
-
-        return voltage
-        
-    def display_graphic_lines(self):
-        """Draw the lines displaying each LFO's voltage to the OLED display"""
-        self.rad = radians(self.degree)
-        oled.vline(self.pixel_x, 0, OLED_HEIGHT, 0)
-
-        for cv, multiplier in zip(cvs, self.divisions):
-            volts = self.calculate_voltage(cv, multiplier)
-            cv.voltage(volts)
-            oled.pixel(self.pixel_x, self.pixel_y - int(volts * (self.pixel_y / 10)), 1)
+    def calculate_voltage(self, index, multiplier):
+        """Determine an LFO's voltage in millivolts, based on its oscillator, wave shape and MAX_VOLTAGE"""
+        shape = self.modes[index]
 
-    def check_change_clock_division(self):
-        """Change current LFO's division with knob movement detection"""
-        self.clock_division = self.get_clock_division()
-
-        if self.clock_division != self.selected_lfo_start_value:
-            self.selected_lfo_start_value = self.divisions[self.selected_lfo] = self.clock_division
-            self.save_state()
+        if shape == self.MODES_SHAPES['OFF']:
+            return 0
+        elif shape == self.MODES_SHAPES['NOISE']:  # The division knob is affecting the spread for the noise
+            return MAX_MV * randint(0, int((1000 / MAX_HARMONIC) * multiplier)) // 1000
+        # RANDOM is NOT actually random, it is a smooth wavetable that takes several cycles to repeat, but it produces a fluctuating voltage that is near impossible to predict over time, and which can be clocked to be in time
+        return self.oscillators[index].value()
+
+    def step_lfos(self, steps):
+        """Advance every LFO by a number of STEP_US steps and set the outputs to their new voltages"""
+        for i, multiplier in enumerate(self.divisions):
+            oscillator = self.oscillators[i]
+            oscillator.advance((oscillator.increment * steps) & PHASE_MASK)
+            self.millivolts[i] = self.calculate_voltage(i, multiplier)
+            cvs[i].voltage_mv(self.millivolts[i])
+
+    def change_clock_division(self, position):
+        """Change current LFO's division when knob 2 is moved to a new position"""
+        self.divisions[self.selected_lfo] = position + 1
+        self.update_oscillators()
+        self.save_state()
 
     def main(self):
+        # The LFOs are advanced by the number of steps that have elapsed since the last update, on a fixed grid of
+        # deadlines, so their frequencies do not depend on how long drawing and reading the knobs takes
+        next_step = next_frame = ticks_us()
         while True:
-            self.check_change_clock_division()
-            
-            self.display_graphic_lines()
-            
-            self.display_selected_lfo()
-            
-            self.update_display()
-            
-            self.increment()
+            now = ticks_us()
+
+            steps = ticks_diff(now, next_step) // STEP_US + 1
+            if steps > 0:
+                next_step = ticks_add(next_step, steps * STEP_US)
+                self.step_lfos(steps)
+
+            if ticks_diff(now, next_frame) >= 0:
+                next_frame = ticks_add(now, FRAME_US)
+                k2.poll()
+                self.read_rate()
+                self.update_display()
 
 
 if __name__ == "__main__":
@@ -18,6 +18,10 @@ SCREENSAVER_TIMEOUT_MS = 1000 * 60 * 20
 #  input
 AIN_VOLTAGE_CUTOFF = 0.8
 
+## The width of the band around the cutoff that ain must cross to change state,
+#  so that a noisy voltage near the cutoff doesn't flicker
+AIN_HYSTERESIS = 0.2
+
 class Logic(EuroPiScript):
     """The main workhorse of the whole module
 
@@ -49,12 +53,27 @@ class Logic(EuroPiScript):
         @b2.handler
         def on_b2_press():
             self.last_interaction_time = time.ticks_ms()
-        
+
+        # ain is compared to the cutoff in the background, many times faster than this loop could read it
+        ain.comparator(threshold=AIN_VOLTAGE_CUTOFF, hysteresis=AIN_HYSTERESIS)
+
+        last_state = None
         while True:
             
             # read both inputs as 0/1
             x = din.value()
-            y = 1 if ain.read_voltage() > AIN_VOLTAGE_CUTOFF else 0
+            y = ain.comparator_value()
+
+            # check if we've been idle for too long; if so, blank the screen
+            # to prevent burn-in
+            now = time.ticks_ms()
+            idle = time.ticks_diff(now, self.last_interaction_time) > SCREENSAVER_TIMEOUT_MS
+
+            # only update the outputs and the display when something has changed
+            state = x | (y << 1) | (idle << 2)
+            if state == last_state:
+                continue
+            last_state = state
             
             x_and_y = x & y
             x_or_y = x | y
@@ -70,10 +89,7 @@ class Logic(EuroPiScript):
             cv5.value(x_nor_y)
             cv6.value(x_xnor_y)
             
-            # check if we've been idle for too long; if so, blank the screen
-            # to prevent burn-in
-            now = time.ticks_ms()
-            if time.ticks_diff(now, self.last_interaction_time) > SCREENSAVER_TIMEOUT_MS:
+            if idle:
                 oled.fill(0)
             else:
                 display_txt = " &:{0}  |:{1}  ^:{2}\n!&:{3} !|:{4} !^:{5}".format(
@@ -1,11 +1,13 @@
 from europi import *
 import machine
+import uasyncio
 from time import ticks_diff, ticks_ms
+from utime import ticks_add, ticks_us
 from europi_script import EuroPiScript
-try:
-    import uasyncio as asyncio
-except ImportError:
-    import asyncio
+from clock_tracker import ClockTracker
+from edge_capture import EdgeCapture
+from gc_manager import GCManager
+from timing import Ticker
 from random import randint
 
 '''
@@ -45,11 +47,10 @@ output_6: clock / 32
 
 Known Issues:
 - If playback is restarted while screen 2 is in config mode, playback will be slightly irratic, especially when moving knobs
-- BPM occasionally drifts by 1ms - possibly due to asyncio, pico performance limitations, or some other as-yet unknown error
 
 '''
 
-class MasterClockInner(EuroPiScript):
+class MasterClock(EuroPiScript):
     def __init__(self):
         # Overclock the Pico for improved performance.
         machine.freq(250_000_000)
@@ -64,9 +65,15 @@ class MasterClockInner(EuroPiScript):
         self.k2Unlocked = False
         self.previousSelectedDivision = 0
         self.previousActiveOption = ''
-        self.previousClockTime = 0
-        self.inputClockDiffs = []
+        # Measures the period of an external clock on din, from edges timestamped by the PIO
+        self.clockTracker = ClockTracker()
+        self.edgeCapture = EdgeCapture(din)
+        self.edgeCapture.track(self.clockTracker)
+        self.edgeCapture.start()
         self.clockSelectionScreenActive = False
+        # Collects garbage between clock pulses, so collections don't delay them
+        self.gcManager = GCManager()
+        self.nextClockUs = ticks_us()
 
         self.MIN_BPM = 20  # Successfully calibrated to >= 20 and <= 240 BPM
         self.MAX_BPM = 240
@@ -82,8 +89,6 @@ class MasterClockInner(EuroPiScript):
             self.clockDivisions.append(n)
         self.clockDivisions.append('r')
         
-        # When enabled, set msDriftCompensation to 30
-        # When disabled, set msDriftCompensation to 28
         self.DEBUG = False
 
         # Default value is using an internal clock source
@@ -95,11 +100,8 @@ class MasterClockInner(EuroPiScript):
         # Note: Currently does not work well using a Din Sync input - Perhaps the pico cannot keep up?
         self.inputClockDivision = 1
 
-        # In testing a 17ms drift was found at all tempos and a 25ms drift when editing BPM/PW
-        # Adding this offset brings the BPM and pulse width back into a reasonable tolerance
-        # self.msDriftCompensationConfigMode is an additional offset if configMode causes additional slowdown
-        self.msDriftCompensation = 17
-        self.msDriftCompensationConfigMode = 0
+        # Schedules the internal clock's pulses on absolute deadlines, so the tempo does not drift
+        self.ticker = Ticker(0)
 
         # Vars to drive UI
         self.markerPositions = [ [0, 0], [69, 0], [0, 12], [40, 12], [80, 12], [0, 24], [40, 24], [80, 24]]
@@ -110,10 +112,6 @@ class MasterClockInner(EuroPiScript):
         self.calcSleepTime()
         self.getPulseWidth()
 
-        self.tasks = []
-        for n in range(6):
-            self.tasks.append(0)            
-
         # Starts/Stops the master clock
         @b1.handler_falling
         def StartStop():
@@ -152,25 +150,20 @@ class MasterClockInner(EuroPiScript):
         # Trigger clock if using an external clock, or reset if not
         @din.handler
         def dinTrigger():
+            # Pass the captured edges to the clock tracker
+            self.edgeCapture.poll()
             if self.externalClockInput:
+                # The next external clock is expected one period from now
+                self.nextClockUs = ticks_add(ticks_us(), self.clockTracker.period_us())
                 # Divide input clocks by self.inputClockDivision and trigger the clock
                 if self.clockInputNum % self.inputClockDivision == 0:
                     self.clockTrigger()
-                    if self.clockInputNum > 1: # Ignore the first entry as it has no reference
-                        self.mSBetweenClockCycles = time.ticks_diff(ticks_ms(), self.previousClockTime)
-                        # Cap the BPM calcs at at 240 BPM to avoid steam coming out of the pico's ears
-                        if self.mSBetweenClockCycles < 250:
-                            self.inputClockDiffs.append(self.mSBetweenClockCycles)
-                        else:
-                            self.inputClockDiffs.append(250)
-                        # Only keep 20 values in the buffer
-                        if len(self.inputClockDiffs) == 20:
-                            del self.inputClockDiffs[0]
-
-                        if self.clockInputNum > 3: # Only calculate is there are > 3 entries
-                            self.bpm = self.calculateBpm(self.inputClockDiffs)
-                    self.previousClockTime = ticks_ms()
-                    
+                    # Only calculate the BPM once the tracker has a steady clock period
+                    if self.clockTracker.stable():
+                        self.mSBetweenClockCycles = self.clockTracker.period_us() * self.inputClockDivision // 1000
+                        # Clamp the BPM calcs to the supported range to avoid steam coming out of the pico's ears
+                        self.bpm = clamp(int(self.clockTracker.bpm(self.CLOCKS_PER_QUARTER_NOTE * self.inputClockDivision)), self.MIN_BPM, self.MAX_BPM)
+
                 self.clockInputNum += 1
             else:
                 self.step = 1
@@ -197,16 +190,6 @@ class MasterClockInner(EuroPiScript):
         
         self.saveState()
 
-    def bpmFromMs(self, ms):
-        return int(((1/(ms/1000))*60)/4)
-
-    def calculateBpm(self, list):
-        self.averageDiff = self.average(list)
-        return self.bpmFromMs(self.averageDiff)
-
-    def average(self, list):
-        return sum(list) / len(list)
-
     '''Show running status'''
     def screen1(self):
         oled.fill(0)
@@ -215,7 +198,6 @@ class MasterClockInner(EuroPiScript):
             oled.text('B1:Start', 0, 23, 1)
         else:
             oled.text('B1:Stop', 0, 23, 1)
-        oled.show()
 
     '''config screen'''
     def screen2(self):
@@ -284,17 +266,11 @@ class MasterClockInner(EuroPiScript):
         oled.text('/' + str(self.outputDivisions[4]), 45, 24, 1)
         oled.text('/' + str(self.outputDivisions[5]), 85, 24, 1)
         oled.text(configMarker, self.markerPositions[self.activeOption-1][0], self.markerPositions[self.activeOption-1][1], 1)
-        oled.show() 
-
-    ''' Holds given output (cv) high for pulseWidthMs duration '''
-    async def outputPulse(self, cv):
-        cv.voltage(5)
-        await asyncio.sleep_ms(self.pulseWidthMs)
-        cv.off()
 
     ''' Given a desired BPM, calculate the time to sleep between clock pulses '''
     def calcSleepTime(self):
         self.mSBetweenClockCycles = int((60000 / self.bpm / self.CLOCKS_PER_QUARTER_NOTE))
+        self.ticker.period_us = 60_000_000 // (self.bpm * self.CLOCKS_PER_QUARTER_NOTE)
     
     def checkForAinBPM(self):
         val = 100 * ain.percent()
@@ -329,6 +305,11 @@ class MasterClockInner(EuroPiScript):
 
     ''' Sends output pulses at required division '''
     def clockTrigger(self):
+        # Hold off garbage collections until the pulses have been sent
+        with self.gcManager.critical():
+            self.sendPulses()
+
+    def sendPulses(self):
 
         if self.DEBUG:
             print('BPM: ' + str(self.bpm) + ' cycle: ' + str(self.mSBetweenClockCycles) + ' PW:' + str(self.pulseWidthMs))
@@ -336,15 +317,14 @@ class MasterClockInner(EuroPiScript):
         for idx, output in enumerate(self.outputDivisions):
             if output != 'r':
                 if self.step % output == 0:
-                    if self.tasks[idx] != 0 and not self.tasks[idx].done() and self.DEBUG:
-                        print(f'Task: {idx} is not done')
                     if self.DEBUG:
-                        print(f'calling outputPulse({idx}) on division {output}')
-                    self.tasks[idx] = asyncio.create_task(self.outputPulse(cvs[idx]))
+                        print(f'triggering output {idx} on division {output}')
+                    # Holds the output high for pulseWidthMs, the pulse is ended in the background
+                    cvs[idx].trigger(self.pulseWidthMs)
             else:
                 # Fire pulses randomly
                 if randint(0, 1):
-                    self.tasks[idx] = asyncio.create_task(self.outputPulse(cvs[idx]))
+                    cvs[idx].trigger(self.pulseWidthMs)
 
         # advance/reset clock step, resetting at the lowest common multiple
         if self.step < self.lcm(self.outputDivisions):
@@ -356,13 +336,10 @@ class MasterClockInner(EuroPiScript):
         # Get time of last step to use in the auto reset function
         self.previousStepTime = ticks_ms()
 
-        # Debug task output to check for overrunning tasks i.e. memory leaks
-        if self.DEBUG:
-            for i in self.tasks:
-                if i != 0:
-                    print(f'[{i}] done: {str(i.done())}. state: {str(i.state)}. data: {str(i.data)}. coro: {str(i.coro)}')
-                else:
-                    print(0)
+    # Keep using the save state file from when the script ran inside a wrapper class
+    @property
+    def _state_filename(self):
+        return "saved_state_MasterClockInner.txt"
 
     ''' Save working vars to a save state file'''
     def saveState(self):
@@ -388,14 +365,40 @@ class MasterClockInner(EuroPiScript):
 
         self.saveState()
 
+    ''' Sends the internal clock's pulses, while the UI task runs in between '''
+    async def clock(self):
+        while True:
+            if self.running and not self.externalClockInput:
+                self.calcSleepTime()
+                # Sleep until the next pulse is due, the time spent by the UI is absorbed by the ticker
+                await self.ticker.wait_async()
+                self.clockTrigger()
+                self.nextClockUs = self.ticker.deadline()
+            else:
+                # Send the first pulse straight away when the clock starts
+                self.ticker.reset(immediate=True)
+                await uasyncio.sleep_ms(10)
+
     async def main(self):
+        try:
+            await self.ui()
+        finally:
+            # Don't leave the capture's state machine running once the script exits
+            self.edgeCapture.stop()
+
+    ''' Runs the display, knobs and garbage collection, alongside the clock task '''
+    async def ui(self):
+        uasyncio.create_task(self.clock())
         while True:
             if not self.clockSelectionScreenActive:
-                # Display selected screen
+                # Display selected screen, sending it in chunks so the clock task is not held up
                 if self.screen == 1:
                     self.screen1()
                 else:
                     self.screen2()
+                await oled.flush()
+            else:
+                await uasyncio.sleep_ms(50)
 
             # Auto reset function after resetTimeout
             if self.step != 0 and ticks_diff(ticks_ms(), self.previousStepTime) > self.resetTimeout:
@@ -405,29 +408,15 @@ class MasterClockInner(EuroPiScript):
             if not self.configMode and not self.externalClockInput:
                 self.checkForAinBPM()
 
-            if self.running and not self.externalClockInput:
-                self.clockTrigger()
-                self.calcSleepTime()
-                if self.configMode:
-                    await asyncio.sleep_ms(int(self.mSBetweenClockCycles - self.msDriftCompensation - self.msDriftCompensationConfigMode))
-                else:
-                    await asyncio.sleep_ms(int(self.mSBetweenClockCycles - self.msDriftCompensation))
+            # Collect garbage now if it will be done before the next clock pulse, or whenever it's
+            # needed if the clock has stopped
+            if ticks_diff(ticks_us(), self.nextClockUs) > self.resetTimeout * 1000:
+                self.gcManager.idle()
             else:
-                # need to add this otherwise the async tasks never start
-                await asyncio.sleep_ms(0)
-
-class MasterClock(EuroPiScript):
-    def __init__(self):
-        pass
-    def main(self):
-        mc = MasterClockInner()
-        el = asyncio.get_event_loop()
-        el.create_task(mc.main())
-        el.run_forever()
+                self.gcManager.collect_before(self.nextClockUs)
+            if self.DEBUG and self.gcManager.collections:
+                print(f'GC pause: {self.gcManager.last_pause_us}us max: {self.gcManager.max_pause_us}us late: {self.gcManager.late_collections}')
+                self.gcManager.reset_stats()
 
 if __name__ == '__main__':
-    m = MasterClock()
-    m.main()
-
-
-
+    MasterClock().run()
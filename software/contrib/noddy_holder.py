@@ -51,7 +51,11 @@ class NoddyHolder(EuroPiScript):
         # channel
         self.channel_1 = [0,-1]
         self.channel_2 = [0,-1]
-        
+
+        # The handlers sample the input and redraw the screen, which is too slow to do in the
+        # IRQ, so they are queued and called from the main loop.
+        din.defer()
+
         # Triggered when din goes HIGH.
         @din.handler
         def dinTrigger():
@@ -108,6 +112,7 @@ class NoddyHolder(EuroPiScript):
     def main(self):
         self.update_screen()
         while True:
+            din.dispatch()
             self.update()
             
     def update_screen(self):
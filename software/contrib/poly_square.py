@@ -321,7 +321,7 @@ class PolySquare(EuroPiScript):
             self.update_tuning_settings()
         else:
             self.detune_amount = k1.percent() / 12
-            new_mode = k2.read_position(len(self.modes))
+            new_mode = k2.read_stable_position(len(self.modes))
             if not new_mode == self.current_mode:
                 self.ui_update_requested = True
                 self.current_mode = new_mode
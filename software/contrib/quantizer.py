@@ -34,6 +34,14 @@ MODE_CONTINUOUS=1
 #  =20 minutes
 SCREENSAVER_TIMEOUT_MS = 1000 * 60 * 20
 
+## How many ADC samples are averaged for each reading of the input
+#
+#  In continuous mode readings are also passed through a median filter, which removes the
+#  noise that would otherwise need hundreds of samples to average out. If the EuroPi config's
+#  ain_filter is set, that filter is used instead
+TRIGGERED_SAMPLES = 500
+CONTINUOUS_SAMPLES = 8
+
 
 SELECT_OPTION_Y = 16
 HALF_CHAR_WIDTH = int(CHAR_WIDTH / 2)
@@ -177,7 +185,7 @@ class ModeChooser:
         
     def draw(self):
         oled.fill(0)
-        oled.text(f"Mode", 0, 0)
+        oled.cached_text(f"Mode", 0, 0)
         
         current_mode = self.mode_names[self.quantizer.mode]
         new_mode = self.read_mode(mode='string')
@@ -218,7 +226,7 @@ class RootChooser:
         
     def draw(self):
         oled.fill(0)
-        oled.text(f"Transpose", 0, 0)
+        oled.cached_text(f"Transpose", 0, 0)
         
         new_root = self.read_root(mode='string')
         current_root = self.root_names[self.quantizer.root]
@@ -247,7 +255,7 @@ class OctaveChooser:
         
     def draw(self):
         oled.fill(0)
-        oled.text(f"Octave", 0, 0)
+        oled.cached_text(f"Octave", 0, 0)
         
         new_octave = self.read_octave(mode='string')
         current_octave = self.quantizer.octave
@@ -309,7 +317,7 @@ class IntervalChooser:
         
     def draw(self):
         oled.fill(0)
-        oled.text(f"Output {self.n}", 0, 0)
+        oled.cached_text(f"Output {self.n}", 0, 0)
         
         new_interval = self.read_interval(mode='string')
         current_interval = self.interval_names[self.quantizer.intervals[self.n-2]+12]
@@ -393,6 +401,11 @@ class QuantizerScript(EuroPiScript):
         
         # Continious quantizing, or only on an external trigger?
         self.mode = MODE_TRIGGERED
+
+        # Filter the readings of the input, see read_quantize_output, unless the user has chosen
+        # their own filter in the EuroPi config
+        if self.europi_config["ain_filter"] == "none":
+            ain.set_filters(MedianFilter())
         
         # What semitone is the root of the scale?
         # 0 = C, 1 = C#/Db, 2 = D, etc...
@@ -516,7 +529,12 @@ class QuantizerScript(EuroPiScript):
         Called by the main loop in continuous mode or the rising clock handler
         in triggered mode
         """
-        self.input_voltage = ain.read_voltage(500)   # increase the number of samples to help reduce noise
+        if self.mode == MODE_CONTINUOUS:
+            self.input_voltage = ain.read_voltage(CONTINUOUS_SAMPLES)
+        else:
+            # each triggered reading is independent of the previous ones, so don't filter it against them
+            ain.reset_filters()
+            self.input_voltage = ain.read_voltage(TRIGGERED_SAMPLES)   # increase the number of samples to help reduce noise
         self.quantize(self.input_voltage)
         
         cv1.voltage(self.output_voltage)
@@ -537,12 +555,12 @@ class QuantizerScript(EuroPiScript):
             item_text_width = item_widths[index]
             if item_text == current_item:
                 oled.fill_rect((x - 1), SELECT_OPTION_Y, (item_text_width + 3), (CHAR_HEIGHT + 4), 1)
-                oled.text(item_text, x, (SELECT_OPTION_Y + 2), 0)
+                oled.cached_text(item_text, x, (SELECT_OPTION_Y + 2), 0)
             elif item_text == new_item:
                 oled.rect((x - 1), SELECT_OPTION_Y, (item_text_width + 3), (CHAR_HEIGHT + 4), 1)
-                oled.text(item_text, x, (SELECT_OPTION_Y + 2), 1)
+                oled.cached_text(item_text, x, (SELECT_OPTION_Y + 2), 1)
             else:
-                oled.text(item_text, x, (SELECT_OPTION_Y + 2), 1)
+                oled.cached_text(item_text, x, (SELECT_OPTION_Y + 2), 1)
             x += item_text_width + CHAR_WIDTH
     
     def main(self):
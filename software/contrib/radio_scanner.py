@@ -1,7 +1,7 @@
 
 try:
     # Local development
-    from software.firmware.europi import ain, b1, b2, clamp, cvs, din, k1, k2, oled
+    from software.firmware.europi import ain, b1, b2, clamp, cvs, din, k1, k2, oled, snapshot
     from software.firmware.europi import MAX_OUTPUT_VOLTAGE, OLED_HEIGHT, OLED_WIDTH
     from software.firmware.europi_script import EuroPiScript
 except ImportError:
@@ -85,15 +85,17 @@ class RadioScanner(EuroPiScript):
     def main(self):
 
         while True:
+            inputs = snapshot()
+
             if self.knob_mapping != 1:
-                x = k1.percent()
+                x = inputs.k1.percent()
             else:
-                x = clamp(ain.percent() + k1.percent(), 0, 1)
+                x = clamp(inputs.ain.percent() + inputs.k1.percent(), 0, 1)
 
             if self.knob_mapping != 2:
-                y = k2.percent()
+                y = inputs.k2.percent()
             else:
-                y = clamp(ain.percent() + k2.percent(), 0, 1)
+                y = clamp(inputs.ain.percent() + inputs.k2.percent(), 0, 1)
 
             self.do_step(x, y)
 
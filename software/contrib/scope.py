@@ -19,15 +19,15 @@ try:
         k2,
         oled,
     )
+    from software.firmware.ui import Plot
 except ImportError:
     from europi import MAX_INPUT_VOLTAGE, OLED_HEIGHT, OLED_WIDTH, ain, b1, b2, cv1, cv2, cv4, din, k1, k2, oled
+    from ui import Plot
 
 MAX_RATE = OLED_WIDTH
 Y_TRUE = int(OLED_HEIGHT / 3 * 2)
 Y_FALSE = int(OLED_HEIGHT / 3)
 D_WAVE_HEIGHT = Y_TRUE - Y_FALSE + 1
-RIGHT_EDGE = OLED_WIDTH - 1
-Y_PIXELS = OLED_HEIGHT - 1
 
 
 class Scope(EuroPiScript):
@@ -61,6 +61,8 @@ class Scope(EuroPiScript):
     def __init__(self) -> None:
         super().__init__()
         self.enabled = [True, True]  # digital, analog
+        self.digital_plot = Plot(y=OLED_HEIGHT - Y_TRUE, height=D_WAVE_HEIGHT, connected=True)
+        self.analog_plot = Plot(max_value=MAX_INPUT_VOLTAGE)
 
     def toggle(self, index):
         def f():
@@ -76,43 +78,27 @@ class Scope(EuroPiScript):
     def read_max_disp_voltage():
         return k2.read_position(MAX_INPUT_VOLTAGE) + 1
 
-    @staticmethod
-    def calc_y_pos(max_disp_voltage, a_voltage):
-        return Y_PIXELS - int(a_voltage / max_disp_voltage * Y_PIXELS)
-
     def main(self):
         b1.handler(self.toggle(0))
         b2.handler(self.toggle(1))
 
         oled.fill(0)
-        old_value = din.value()
 
         while True:
             rate = self.read_sample_rate()
             max_disp_voltage = self.read_max_disp_voltage()
+            self.analog_plot.set_range(0, max_disp_voltage)
 
             for _ in range(rate):
-                if any(self.enabled):
-                    oled.scroll(-1, 0)
-                    oled.vline(RIGHT_EDGE, 0, OLED_HEIGHT, 0)
-
                 d_value = din.value()
                 cv2.value(d_value)
                 cv4.value(not d_value)
 
-                if self.enabled[0]:  # digital wave
-                    y_pos = Y_TRUE if d_value else Y_FALSE
-                    oled.pixel(RIGHT_EDGE, OLED_HEIGHT - y_pos, 1)
-                    if d_value != old_value:
-                        oled.vline(RIGHT_EDGE, Y_FALSE + 1, D_WAVE_HEIGHT, 1)
-                    old_value = d_value
-
                 a_voltage = ain.read_voltage(1)
                 cv1.voltage(a_voltage)
 
-                if self.enabled[1]:  # analog wave
-                    y_pos = self.calc_y_pos(max_disp_voltage, a_voltage)
-                    oled.pixel(RIGHT_EDGE, y_pos, 1)
+                self.digital_plot.add(d_value)
+                self.analog_plot.add(a_voltage)
 
                 if not self.enabled[0] and not self.enabled[1]:  # details output
                     rate = self.read_sample_rate()
@@ -125,7 +111,13 @@ class Scope(EuroPiScript):
 
                 sleep(0.001)
 
-            oled.show()
+            if any(self.enabled):
+                oled.fill(0)
+                if self.enabled[0]:  # digital wave
+                    self.digital_plot.draw(clear=False)
+                if self.enabled[1]:  # analog wave
+                    self.analog_plot.draw(clear=False)
+                oled.show()
 
 
 if __name__ == "__main__":
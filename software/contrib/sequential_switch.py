@@ -114,7 +114,7 @@ class NumOutsChooser:
     def draw(self):
         num_outs = self.read_num_outs()
         oled.fill(0)
-        oled.text(f"-- # Outputs --", 0, 0)
+        oled.cached_text(f"-- # Outputs --", 0, 0)
         oled.text(f"{self.parent.num_outputs} <- {num_outs}", 0, 10)
         oled.show()
     
@@ -142,7 +142,7 @@ class ModeChooser:
     def draw(self):
         new_mode = self.read_mode()
         oled.fill(0)
-        oled.text(f"-- Mode --", 0, 0)
+        oled.cached_text(f"-- Mode --", 0, 0)
         oled.text(f"{self.mode_names[self.parent.mode]} <- {self.mode_names[new_mode]}", 0, 10)
         oled.show()
 
@@ -46,11 +46,13 @@ try:
     from software.firmware import europi
     from software.firmware.europi import CHAR_HEIGHT, OLED_HEIGHT, OLED_WIDTH
     from software.firmware.europi_script import EuroPiScript
+    from software.firmware.ui import Plot
 
 except ImportError:
     import europi
     from europi import CHAR_HEIGHT, OLED_HEIGHT, OLED_WIDTH
     from europi_script import EuroPiScript
+    from ui import Plot
 
 
 # Script Constants
@@ -86,6 +88,7 @@ class SmoothRandomVoltages(EuroPiScript):
 
         # Visualization display choice.
         self.visualization = 0  # 0: Bars, 1: Scope, 2: Blank.
+        self.plot = Plot(traces=3, max_value=europi.MAX_OUTPUT_VOLTAGE)
 
         # Voltage source choice.
         self.voltage_source = 0  # 0: random, 1: analog input.
@@ -148,6 +151,7 @@ class SmoothRandomVoltages(EuroPiScript):
 
     def update_display(self):
         """Show current voltage visualizations."""
+        self.plot.add(*self.voltages)
         if self.visualization == 0:
             self.display_bars()
         elif self.visualization == 1:
@@ -182,13 +186,7 @@ class SmoothRandomVoltages(EuroPiScript):
 
     def display_scope(self):
         """Draw a real-time line representing the slew value for each of the 3 voltages."""
-        pixel_x = 0
-        pixel_y = europi.OLED_HEIGHT - 1
-        europi.oled.scroll(1, 0)
-        europi.oled.vline(pixel_x, 0, europi.OLED_HEIGHT, 0)
-        europi.oled.pixel(pixel_x, pixel_y - int(self.voltages[0] * (pixel_y / 10)), 1)
-        europi.oled.pixel(pixel_x, pixel_y - int(self.voltages[1] * (pixel_y / 10)), 1)
-        europi.oled.pixel(pixel_x, pixel_y - int(self.voltages[2] * (pixel_y / 10)), 1)
+        self.plot.draw()
 
     def main(self):
         # Start the main loop.
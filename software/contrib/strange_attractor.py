@@ -2,6 +2,7 @@ from europi import *
 import machine
 from europi_script import EuroPiScript
 from utime import ticks_diff, ticks_ms
+from timing import Ticker
 from math import fabs, floor
 from random import choice
 
@@ -41,6 +42,9 @@ VERSION = "1.0"
 # Maximum voltage output. Cranking this up may cause issues with some modules.
 MAX_OUTPUT = MAX_OUTPUT_VOLTAGE
 
+# How often the knobs are read while waiting for the next update, in microseconds.
+KNOB_POLL_US = 20_000
+
 """
 Implementation of strange attractors, providing chaotic values for modulation.
 
@@ -245,9 +249,9 @@ class StrangeAttractor(EuroPiScript):
         self.selected_attractor = choice(range(0, len(self.attractors)))
         self.a = self.attractors[self.selected_attractor]
         # Initialize variables
-        self.checkpoint = 0
         # time before update
         self.period = 100
+        self.ticker = Ticker(self.period * 1000)
         # output range.
         self.range = MAX_OUTPUT
         # initial threshold for gates
@@ -351,6 +355,7 @@ class StrangeAttractor(EuroPiScript):
             self.period = low - ((low - mid) * (val / 50))
         else:
             self.period = mid - ((mid - high) * (val - 50) / 50)
+        self.ticker.period_us = int(self.period * 1000)
 
     def update_threshold(self):
         self.threshold = k2.read_position(steps=41)
@@ -377,14 +382,14 @@ class StrangeAttractor(EuroPiScript):
         cv5.value(self.gate5)
         cv6.value(self.gate6)
 
-        self.checkpoint = ticks_ms()
         self.update_screen()
 
     def main(self):
         while True:
             self.update_speed()
             self.update_threshold()
-            if ticks_diff(ticks_ms(), self.checkpoint) > self.period:
+            # Sleep until the next update is due, waking up regularly to read the knobs
+            if self.ticker.wait(timeout_us=KNOB_POLL_US):
                 self.update()
 
     def initialise_message(self, att_name=None):
@@ -122,9 +122,10 @@ class BootloaderMenu(EuroPiScript):
         # let the user make a selection
         old_selected = -1
         while not self.run_request:
-            if old_selected != self.menu.selected:
-                old_selected = self.menu.selected
-                self.menu.draw_menu()
+            selected = self.menu.selected
+            if old_selected != selected:
+                old_selected = selected
+                self.menu.draw_menu(selected)
             time.sleep(0.1)
         return scripts_mapping[self.run_request]
 
@@ -144,4 +145,4 @@ class BootloaderMenu(EuroPiScript):
             europi.b1._handler_both(europi.b2, self.exit_to_menu)
             europi.b2._handler_both(europi.b1, self.exit_to_menu)
 
-            script_class().main()
+            script_class().run()
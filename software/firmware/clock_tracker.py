@@ -0,0 +1,152 @@
+"""Measures the tempo of a clock on an input from the timestamps of its rising edges.
+
+A :class:`ClockTracker` attached to an input is told the ``ticks_us`` of each rising edge by the
+input's IRQ, and keeps the most recent intervals between edges in a fixed size ``array``. Intervals
+that are far from the current period, such as a missed or doubled clock pulse, are rejected, so a
+single glitch does not disturb the tempo, while a run of them is taken as a change of tempo::
+
+    from europi import *
+    from clock_tracker import ClockTracker
+
+    clock = ClockTracker(din)
+
+    while True:
+        if clock.stable():
+            oled.centre_text(f"{clock.bpm(ppqn=4):.1f} BPM")
+
+The period, BPM and stability are kept up to date as each edge arrives, so reading them costs the
+same however many intervals are tracked. This lets scripts predict the next clock, size gates to
+the clock period or multiply the clock without measuring it themselves.
+"""
+from array import array
+
+from utime import ticks_add, ticks_diff
+
+DEFAULT_INTERVALS = 8
+
+# How far, as a percentage of the current period, an interval may be from the period and still be
+# counted as part of the same tempo.
+DEFAULT_TOLERANCE_PERCENT = 20
+
+# The number of consecutive rejected intervals after which the tempo is taken to have changed.
+DEFAULT_MAX_OUTLIERS = 3
+
+# Gaps between edges longer than this mean the clock stopped, and the tempo is measured afresh.
+DEFAULT_TIMEOUT_US = 2_000_000
+
+MICROSECONDS_PER_MINUTE = 60_000_000
+
+
+class ClockTracker:
+    """Tracks the period of the clock on a digital input.
+
+    The tracker measures every rising edge of the input, whatever handlers a script sets on it. It
+    can also be fed timestamps directly by passing no input and calling :meth:`on_edge`.
+
+    :param reader: the :class:`europi.DigitalReader` to track, usually ``din``, or None
+    :param size: the number of intervals averaged to find the period
+    :param tolerance_percent: how far an interval may be from the period, as a percentage of the
+        period, before it is rejected as an outlier
+    :param max_outliers: the number of consecutive outliers that are taken as a change of tempo
+    :param timeout_us: the longest gap between edges, in microseconds, before the clock is
+        considered stopped
+    """
+
+    def __init__(
+        self,
+        reader=None,
+        size=DEFAULT_INTERVALS,
+        tolerance_percent=DEFAULT_TOLERANCE_PERCENT,
+        max_outliers=DEFAULT_MAX_OUTLIERS,
+        timeout_us=DEFAULT_TIMEOUT_US,
+    ):
+        if size < 1:
+            raise ValueError(f"ClockTracker expects a positive size, got: {size}")
+        self.size = size
+        self.tolerance_percent = tolerance_percent
+        self.max_outliers = max_outliers
+        self.timeout_us = timeout_us
+        self.intervals = array("l", [0] * size)
+        self.reset()
+        if reader is not None:
+            reader.track(self)
+
+    def reset(self):
+        """Forget the measured tempo."""
+        self.index = 0
+        self.count = 0
+        self.total = 0
+        self.outliers = 0
+        self.last_edge_us = 0
+        self._started = False
+
+    def _restart(self):
+        self.index = 0
+        self.count = 0
+        self.total = 0
+        self.outliers = 0
+
+    def on_edge(self, ticks):
+        """Record a rising edge at the given ``ticks_us``.
+
+        This is called from the input's IRQ, so it does not allocate memory.
+        """
+        last = self.last_edge_us
+        self.last_edge_us = ticks
+        if not self._started:
+            self._started = True
+            return
+        interval = ticks_diff(ticks, last)
+        if interval <= 0 or interval > self.timeout_us:
+            self._restart()
+            return
+
+        count = self.count
+        if count:
+            period = self.total // count
+            if abs(interval - period) > (period * self.tolerance_percent) // 100:
+                self.outliers += 1
+                if self.outliers < self.max_outliers:
+                    return
+                # Too many outliers in a row, the tempo has changed. Start again from this interval.
+                self._restart()
+                count = 0
+        self.outliers = 0
+
+        index = self.index
+        if count == self.size:
+            self.total -= self.intervals[index]
+        else:
+            self.count = count + 1
+        self.intervals[index] = interval
+        self.total += interval
+        index += 1
+        self.index = 0 if index == self.size else index
+
+    def period_us(self):
+        """Return the average interval between edges in microseconds, or 0 if no interval has been
+        measured yet."""
+        count = self.count
+        if not count:
+            return 0
+        return (self.total + (count >> 1)) // count
+
+    def bpm(self, ppqn=1):
+        """Return the tempo in beats per minute, or 0 if no interval has been measured yet.
+
+        :param ppqn: the number of clock pulses per beat (quarter note)
+        """
+        period = self.period_us()
+        if not period:
+            return 0
+        return MICROSECONDS_PER_MINUTE / (period * ppqn)
+
+    def stable(self):
+        """Return True if every tracked interval matches the tempo and the last interval was not an
+        outlier."""
+        return self.count == self.size and self.outliers == 0
+
+    def next_edge_us(self):
+        """Return the ``ticks_us`` at which the next edge is expected, or the time of the last edge
+        if no interval has been measured yet."""
+        return ticks_add(self.last_edge_us, self.period_us())
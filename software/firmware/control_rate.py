@@ -0,0 +1,96 @@
+"""Generates control voltages from a hardware timer at a fixed rate.
+
+Scripts that produce modulation by sleeping in their main loop have an output rate that depends on
+how long everything else in the loop takes, so drawing to the display or reading the knobs makes
+the outputs jitter. A :class:`ControlRate` engine instead calls a callback for each output from a
+``machine.Timer``, so the outputs are updated at a steady rate however busy the main loop is::
+
+    from europi import *
+    from control_rate import ControlRate
+
+    engine = ControlRate(freq=1000)
+    ramp = [0]
+
+    def saw(tick):
+        ramp[0] = (ramp[0] + 10) % 10000
+        return ramp[0]
+
+    engine.channel(0, saw)
+    engine.start()
+
+    while True:
+        ...  # UI work only, the outputs are updated by the engine
+
+Callbacks are called from the timer interrupt, so they must be short and should not allocate
+memory: keep state in preallocated lists or arrays, and use integers rather than floats.
+"""
+from machine import Timer
+
+from europi import cvs
+
+DEFAULT_CONTROL_RATE = 1000
+
+# Tick counts wrap at this mask so that they stay small ints, which do not allocate.
+TICKS_MASK = 0x3FFFFFFF
+
+
+class ControlRate:
+    """Calls a callback for each of a set of outputs at a fixed rate, and sets the output to the
+    value it returns.
+
+    Each callback is passed the engine's tick count, which increases by one per update and wraps
+    at ``TICKS_MASK``, and returns the output's new voltage as an integer number of millivolts (see
+    :meth:`europi.Output.voltage_mv`), or ``None`` to leave the output unchanged.
+
+    :param outputs: the outputs to drive, by default all six of ``europi.cvs``
+    :param freq: the number of updates per second
+    """
+
+    def __init__(self, outputs=cvs, freq=DEFAULT_CONTROL_RATE):
+        if freq <= 0:
+            raise ValueError(f"ControlRate expects a positive freq, got: {freq}")
+        self.outputs = outputs
+        self.freq = freq
+        self.ticks = 0
+        self._callbacks = [None] * len(outputs)
+        self._timer = None
+
+    @property
+    def running(self):
+        """True if the engine is currently updating its outputs."""
+        return self._timer is not None
+
+    def channel(self, index, callback):
+        """Set the callback for the output at ``index``, or remove it if ``callback`` is None."""
+        self._callbacks[index] = callback
+
+    def clear(self):
+        """Remove all of the callbacks."""
+        for index in range(len(self._callbacks)):
+            self._callbacks[index] = None
+
+    def start(self):
+        """Start updating the outputs in the background."""
+        if self.running:
+            return
+        self._timer = Timer()
+        self._timer.init(mode=Timer.PERIODIC, freq=self.freq, callback=self._tick)
+
+    def stop(self):
+        """Stop updating the outputs. They are left at their last values."""
+        if not self.running:
+            return
+        self._timer.deinit()
+        self._timer = None
+
+    def _tick(self, timer):
+        # Timer callback, must not allocate.
+        tick = self.ticks
+        callbacks = self._callbacks
+        for index in range(len(callbacks)):
+            callback = callbacks[index]
+            if callback is not None:
+                millivolts = callback(tick)
+                if millivolts is not None:
+                    self.outputs[index].voltage_mv(millivolts)
+        self.ticks = (tick + 1) & TICKS_MASK
@@ -0,0 +1,194 @@
+"""Timestamps the edges of a digital input in hardware, with one of the RP2040's PIO state machines.
+
+Pin IRQs are handled by MicroPython some time after the edge, and that time varies with garbage
+collection and with whatever the main loop is doing, so timing a clock with ``ticks_us()`` in a
+handler jitters by up to several milliseconds. An :class:`EdgeCapture` instead runs a small PIO
+program that counts at a fixed rate and, on every edge of the input, pushes the count into the
+state machine's FIFO, where it waits until the script reads it::
+
+    from europi import *
+    from clock_tracker import ClockTracker
+    from edge_capture import EdgeCapture
+
+    clock = ClockTracker()
+    capture = EdgeCapture(din)
+    capture.track(clock)
+    capture.start()
+
+    while True:
+        capture.poll()
+        ...  # clock.period_us() is now accurate to a microsecond
+
+Timestamps count in microseconds by default, and wrap like ``ticks_us()`` values, so they can be
+compared with ``utime.ticks_diff()``. They are counted from when the capture started though, so
+they can only be compared with each other, not with ``ticks_us()``.
+
+The FIFO holds up to 8 edges, further edges are lost, so :meth:`EdgeCapture.poll` must be called
+at least once every 8 edges.
+"""
+from rp2 import PIO, StateMachine, asm_pio
+
+from europi import EVENT_FALLING, EVENT_RISING, on_reset
+
+# The PIO program's loops take this many cycles, so it runs this many times faster than it counts.
+CYCLES_PER_COUNT = 3
+DEFAULT_COUNT_FREQ = 1_000_000
+
+# The default state machine is the last one of the second PIO block, leaving the others free for
+# scripts, such as PolySquare, that use the first ones.
+DEFAULT_CAPTURE_SM = 7
+
+# Each FIFO entry is 29 bits of count and 1 bit of edge type.
+COUNT_BITS = 29
+COUNT_WRAP = 1 << COUNT_BITS
+COUNT_MASK = COUNT_WRAP - 1
+
+# Timestamps wrap at this mask, like ticks_us(), so that they stay small ints, which do not allocate.
+TICKS_MASK = 0x3FFFFFFF
+
+
+# X is decremented exactly once every 3 cycles, whether waiting for an edge or pushing one, and is
+# pushed into the RX FIFO on each edge with a low bit of 0 for a rising edge or 1 for a falling edge.
+# Both edge paths push X as it is one decrement after the edge was seen, so the time between any two
+# edges is exact to a count. The digital input is inverted, its pin is low while the gate is high.
+# Every 'jmp(x_dec)' jumps to the instruction that follows it, so when X wraps through zero and the
+# jump is not taken, the program carries on as if it had been, and no count is lost.
+@asm_pio(in_shiftdir=PIO.SHIFT_LEFT, fifo_join=PIO.JOIN_RX)
+def capture_prog():
+    set(y, 1)
+    wrap_target()
+    # Wait for the gate to rise
+    label("rising")
+    jmp(x_dec, "rise_check")[1]
+    label("rise_check")
+    jmp(pin, "rising")
+    jmp(x_dec, "rise_in")
+    label("rise_in")
+    in_(x, 29)
+    in_(null, 1)
+    jmp(x_dec, "rise_push")
+    label("rise_push")
+    push(noblock)[1]
+    # Wait for the gate to fall
+    label("falling")
+    jmp(x_dec, "fall_check")
+    label("fall_check")
+    jmp(pin, "fell")
+    jmp("falling")
+    label("fell")
+    nop()
+    jmp(x_dec, "fall_in")
+    label("fall_in")
+    in_(x, 29)
+    in_(y, 1)
+    jmp(x_dec, "fall_push")
+    label("fall_push")
+    push(noblock)[1]
+    wrap()
+
+
+class EdgeCapture:
+    """Captures the timestamp of every rising and falling edge of a digital input.
+
+    :param reader: the :class:`europi.DigitalReader` to capture, usually ``din``
+    :param sm_id: the id of the state machine to run the capture program on, from 0 to 7
+    :param count_freq: the timestamps' resolution, in counts per second
+    """
+
+    def __init__(self, reader, sm_id=DEFAULT_CAPTURE_SM, count_freq=DEFAULT_COUNT_FREQ):
+        self.reader = reader
+        self.sm_id = sm_id
+        self.count_freq = count_freq
+        self._sm = None
+        self._handler = None
+        self._tracker = None
+        self.reset()
+
+    def reset(self):
+        """Reset the edge counts and the timestamp of the last edge."""
+        self.edges = 0
+        self.rising_edges = 0
+        # The timestamp of the last edge returned by read().
+        self.ticks = 0
+        self._last_count = 0
+        self._epoch = 0
+
+    @property
+    def running(self):
+        """True if edges are being captured."""
+        return self._sm is not None
+
+    def start(self):
+        """Start capturing edges. Timestamps count from zero when the capture starts.
+
+        The capture is stopped by :meth:`stop`, or by ``europi.reset_state()``, so that the state
+        machine doesn't keep running after the script has exited.
+        """
+        if self.running:
+            return
+        self.reset()
+        self._sm = StateMachine(
+            self.sm_id,
+            capture_prog,
+            freq=CYCLES_PER_COUNT * self.count_freq,
+            jmp_pin=self.reader.pin,
+        )
+        self._sm.active(1)
+        on_reset(self.stop)
+
+    def stop(self):
+        """Stop capturing edges. Edges still in the FIFO are discarded."""
+        if not self.running:
+            return
+        self._sm.active(0)
+        self._sm = None
+
+    def handler(self, func):
+        """Set a function to call from :meth:`poll` for each edge, with the edge type,
+        ``EVENT_RISING`` or ``EVENT_FALLING``, and its timestamp."""
+        if not callable(func):
+            raise ValueError("Provided handler func is not callable")
+        self._handler = func
+
+    def track(self, tracker):
+        """Pass the timestamp of every rising edge read by :meth:`poll` to ``tracker.on_edge()``,
+        see :class:`clock_tracker.ClockTracker`, or stop if ``tracker`` is None."""
+        self._tracker = tracker
+
+    def available(self):
+        """Return the number of captured edges waiting to be read."""
+        if not self.running:
+            return 0
+        return self._sm.rx_fifo()
+
+    def read(self):
+        """Return the type of the oldest captured edge, ``EVENT_RISING`` or ``EVENT_FALLING``, or
+        None if there are none. The edge's timestamp is stored in ``ticks``."""
+        if not self.available():
+            return None
+        raw = self._sm.get()
+        count = COUNT_MASK - (raw >> 1)
+        # The count wraps sooner than ticks, carry the wraps into the upper bit of the timestamp.
+        if count < self._last_count:
+            self._epoch = (self._epoch + COUNT_WRAP) & TICKS_MASK
+        self._last_count = count
+        self.ticks = (self._epoch + count) & TICKS_MASK
+        self.edges += 1
+        if raw & 1:
+            return EVENT_FALLING
+        self.rising_edges += 1
+        return EVENT_RISING
+
+    def poll(self):
+        """Read every captured edge, passing each to the handler and rising edges to the tracker,
+        and return the number of edges read."""
+        count = 0
+        event = self.read()
+        while event is not None:
+            if event == EVENT_RISING and self._tracker is not None:
+                self._tracker.on_edge(self.ticks)
+            if self._handler is not None:
+                self._handler(event, self.ticks)
+            count += 1
+            event = self.read()
+        return count
@@ -16,19 +16,26 @@ Will set the CV output 3 to a voltage of 4.5V.
 import sys
 import time
 
+from array import array
+from collections import OrderedDict
+
+import micropython
 from machine import ADC
 from machine import I2C
 from machine import PWM
 from machine import Pin
+from machine import Timer
 from machine import freq
 
 
 from ssd1306 import SSD1306_I2C
+from utime import ticks_add, ticks_diff, ticks_ms, ticks_us
 
 from version import __version__
 
-from framebuf import FrameBuffer, MONO_HLSB
+from framebuf import FrameBuffer, MONO_HLSB, MONO_VLSB
 from europi_config import load_europi_config
+from icons import BOOTSPLASH
 
 if sys.implementation.name == "micropython":
     TEST_ENV = False  # We're in micropython, so we can assume access to real hardware
@@ -60,6 +67,15 @@ OLED_HEIGHT = 32
 I2C_CHANNEL = 0
 I2C_FREQUENCY = 400000
 
+# SSD1306 commands used to address a window of the display's memory.
+SSD1306_SET_COL_ADDR = 0x21
+SSD1306_SET_PAGE_ADDR = 0x22
+# The I2C cost, in bytes, of addressing a window (6 commands of 3 bytes each) and starting a
+# data transfer (address and control bytes).
+SSD1306_WINDOW_COST = 20
+# The maximum number of framebuffer bytes sent by a single Display.tick().
+DEFAULT_CHUNK_BYTES = 32
+
 # Standard max int consts.
 MAX_UINT16 = 65535
 
@@ -68,6 +84,25 @@ MIN_INPUT_VOLTAGE = 0
 MAX_INPUT_VOLTAGE = 12
 DEFAULT_SAMPLES = 32
 
+# The RP2040 ADC is 12 bit, read_u16() readings are left aligned to 16 bits.
+ADC_RESOLUTION_BITS = 12
+ADC_SHIFT = 16 - ADC_RESOLUTION_BITS
+
+# Background ADC sampling rate, in Hz.
+DEFAULT_SAMPLER_FREQ = 2000
+
+# Fixed point precision of the deadzone scaling in AnalogueReader.read_u16_filtered().
+DEADZONE_SCALE_BITS = 13
+
+# AnalogueInput comparator defaults, see AnalogueInput.comparator().
+DEFAULT_COMPARATOR_THRESHOLD = 1.0
+DEFAULT_COMPARATOR_HYSTERESIS = 0.2
+DEFAULT_COMPARATOR_SAMPLES = 4
+DEFAULT_COMPARATOR_FREQ = 2000
+
+# How far past the edge of a position, as a fraction of a position, a knob must move to change it.
+DEFAULT_KNOB_HYSTERESIS = 0.25
+
 # Output voltage range
 MIN_OUTPUT_VOLTAGE = 0
 MAX_OUTPUT_VOLTAGE = 10
@@ -75,14 +110,28 @@ MAX_OUTPUT_VOLTAGE = 10
 # PWM Frequency
 PWM_FREQ = 100_000
 
+# Output trigger pulses, see Output.trigger() and PulseScheduler.
+DEFAULT_TRIGGER_MS = 10
+DEFAULT_PULSE_FREQ = 1000
+
 # Default font is 8x8 pixel monospaced font.
 CHAR_WIDTH = 8
 CHAR_HEIGHT = 8
 
+# Pre-rendered text cache limits. Each cached character costs CHAR_WIDTH bytes.
+DEFAULT_TEXT_CACHE_BYTES = 1024
+CENTRE_LAYOUT_CACHE_SIZE = 8
+
 # Digital input and output binary values.
 HIGH = 1
 LOW = 0
 
+# Deferred digital input events, see DigitalReader.defer().
+DEFAULT_EVENT_QUEUE_SIZE = 16
+EVENT_RISING = 0
+EVENT_FALLING = 1
+EVENT_BOTH = 2
+
 
 # Helper functions.
 
@@ -92,20 +141,58 @@ def clamp(value, low, high):
     return max(min(value, high), low)
 
 
+@micropython.native
+def _first_difference(a, b, start, end):
+    # Returns the index of the first byte in [start, end) that differs between a and b, or end.
+    i = start
+    while i < end:
+        if a[i] != b[i]:
+            return i
+        i += 1
+    return end
+
+
+@micropython.native
+def _last_difference(a, b, start, end):
+    # Returns the index of the last byte in [start, end) that differs between a and b.
+    # Must only be called when a difference is known to exist.
+    i = end - 1
+    while a[i] == b[i]:
+        i -= 1
+    return i
+
+
+# Functions called by reset_state() to release hardware started by other modules, see on_reset().
+_reset_hooks = []
+
+
+def on_reset(func):
+    """Call ``func`` from :func:`reset_state`, once, so that hardware started outside of this
+    module, like a PIO state machine, is released when the device is reset."""
+    if func not in _reset_hooks:
+        _reset_hooks.append(func)
+
+
 def reset_state():
-    """Return device to initial state with all components off and handlers reset."""
+    """Return device to initial state with all components off, handlers reset and the input
+    filters set by the EuroPi configuration."""
     if not TEST_ENV:
         oled.fill(0)
+    oled.cancel_pending()
     [cv.off() for cv in cvs]
-    [d.reset_handler() for d in (b1, b2, din)]
+    [d.reset_handler() for d in (b1, b2, din, k1, k2, ain)]
+    configure_filter(ain, europi_config["ain_filter"])
+    configure_filter(k1, europi_config["knob_filter"])
+    configure_filter(k2, europi_config["knob_filter"])
+    sampler.stop()
+    pulses.stop()
+    while _reset_hooks:
+        _reset_hooks.pop()()
 
 
 def bootsplash():
     """Display the EuroPi version when booting."""
-    image = b"\x00\x00\x00\x01\xf0\x00\x00\x00\x00\x00\x00\x00\x03\x00\x00\x00\x00\x00\x00\x02\x08\x00\x00\x00\x00\x00\x00\x00\x03\x00\x00\x00\x00\x00\x00\x04\x04\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x03\xc4\x04\x00\x18\x00\x00\x00p\x07\x00\x00\x00\x00\x00\x00\x0c$\x02\x00~\x0c\x18\xb9\x8c8\xc3\x00\x00\x00\x00\x00\x10\x14\x01\x00\xc3\x0c\x18\xc3\x060c\x00\x00\x00\x00\x00\x10\x0b\xc0\x80\x81\x8c\x18\xc2\x020#\x00\x00\x00\x00\x00 \x04\x00\x81\x81\x8c\x18\x82\x02 #\x00\x00\x00\x00\x00A\x8a|\x81\xff\x0c\x18\x82\x02 #\x00\x00\x00\x00\x00FJC\xc1\x80\x0c\x18\x82\x02 #\x00\x00\x00\x00\x00H\x898\x00\x80\x0c\x18\x83\x060c\x00\x00\x00\x00\x00S\x08\x87\x00\xc3\x060\x81\x8c8\xc3\x00\x00\x00\x00\x00d\x08\x00\xc0<\x01\xc0\x80p7\x03\x00\x00\x00\x00\x00X\x08p \x00\x00\x00\x00\x000\x00\x00\x00\x00\x00\x00#\x88H \x00\x00\x00\x00\x000\x00\x00\x00\x00\x00\x00L\xb8& \x00\x00\x00\x00\x000\x00\x00\x00\x00\x00\x00\x91P\x11 \x00\x00\x00\x00\x000\x00\x00\x00\x00\x00\x00\xa6\x91\x08\xa0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc9\x12\x84`\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x12\x12C\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00$\x11 \x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00H\x0c\x90\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00@\x12\x88\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00 \x12F\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x10\x10A\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x10  \x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x08  \x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x04@@\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc6\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x008\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
-    TH = bytearray(image)
-    fb = FrameBuffer(TH, 128, 32, MONO_HLSB)
-    oled.blit(fb, 0, 0)
+    oled.buffer[:] = BOOTSPLASH
 
     version_str = str(__version__)
     version_length = len(version_str)
@@ -123,6 +210,11 @@ class AnalogueReader:
 
     This class in inherited by classes like Knob and AnalogueInput and does
     not need to be used by user scripts.
+
+    Readings can be smoothed by filters, which are much cheaper than taking a
+    large number of samples, see ``set_filters()``. The ``ain_filter`` and
+    ``knob_filter`` options of the EuroPi configuration set a filter on
+    ``ain``, ``k1`` and ``k2``.
     """
 
     def __init__(self, pin, samples=DEFAULT_SAMPLES, deadzone=0.0):
@@ -130,13 +222,25 @@ class AnalogueReader:
         self.pin = ADC(Pin(pin))
         self.set_samples(samples)
         self.set_deadzone(deadzone)
+        self._ring = None  # Set while a BackgroundSampler is feeding this reader.
+        self._filters = ()
 
     def _sample_adc(self, samples=None):
-        # Over-samples the ADC and returns the average.
+        # Use the latest background average if a sampler is running.
+        if self._ring is not None:
+            value = self._ring.average()
+        else:
+            value = self._read_adc(samples or self._samples)
+        for f in self._filters:
+            value = f.update(value)
+        return value
+
+    def _read_adc(self, samples):
+        # Over-samples the ADC and returns the rounded average, bypassing any sampler or filters.
         value = 0
-        for _ in range(samples or self._samples):
+        for _ in range(samples):
             value += self.pin.read_u16()
-        return round(value / (samples or self._samples))
+        return (value + (samples >> 1)) // samples
 
     def set_samples(self, samples):
         """Override the default number of sample reads with the given value."""
@@ -144,21 +248,68 @@ class AnalogueReader:
             raise ValueError(f"set_samples expects an int value, got: {samples}")
         self._samples = samples
 
+    def set_filters(self, *filters):
+        """Pass every reading through the given filters, in order, such as an :class:`EMAFilter`
+        or a :class:`MedianFilter`. Calling this with no filters removes them.
+
+        Filters keep a history of readings, so each reader needs its own filter instances.
+        """
+        self._filters = filters
+        self.reset_filters()
+
+    def reset_filters(self):
+        """Clear the history of the reader's filters, so that the next reading passes through
+        unchanged. This is useful when a reading should not be affected by old readings, such as
+        in a script that only samples on a clock."""
+        for f in self._filters:
+            f.reset()
+
     def set_deadzone(self, deadzone):
         """Override the default deadzone with the given value."""
         if not isinstance(deadzone, float):
             raise ValueError(f"set_deadzone expects an float value, got: {deadzone}")
         self._deadzone = deadzone
+        # The raw readings that map to 0 and MAX_UINT16 with this deadzone, and the fixed point
+        # scale between them, used by read_u16_filtered().
+        self._dz_low = round(deadzone * MAX_UINT16 / (1 + 2 * deadzone))
+        self._dz_high = round((1 + deadzone) * MAX_UINT16 / (1 + 2 * deadzone))
+        span = self._dz_high - self._dz_low
+        self._dz_scale = ((MAX_UINT16 << DEADZONE_SCALE_BITS) + span - 1) // span
 
     def percent(self, samples=None, deadzone=None):
         """Return the percentage of the component's current relative range."""
+        return self._percent(self._sample_adc(samples), deadzone)
+
+    def _percent(self, raw, deadzone=None):
+        # Converts a raw reading to a percentage, see percent().
         dz = self._deadzone
         if deadzone is not None:
             dz = deadzone
-        value = self._sample_adc(samples) / MAX_UINT16
+        value = raw / MAX_UINT16
         value = value * (1.0 + 2.0 * dz) - dz
         return clamp(value, 0.0, 1.0)
 
+    def read_u16_filtered(self, samples=None):
+        """Return the component's current relative position as an int from 0 to ``MAX_UINT16``,
+        after filtering and removing the deadzone.
+
+        This is the integer equivalent of ``percent() * MAX_UINT16``. It does not use any floating
+        point math so it is faster, and does not allocate memory so it is safe to call from
+        interrupt handlers.
+        """
+        return self._u16(self._sample_adc(samples))
+
+    def _u16(self, raw):
+        # Converts a raw reading to a position, see read_u16_filtered().
+        raw = clamp(raw, self._dz_low, self._dz_high)
+        return min(((raw - self._dz_low) * self._dz_scale) >> DEADZONE_SCALE_BITS, MAX_UINT16)
+
+    def range_int(self, steps=100, samples=None):
+        """Return a value from 0 to ``steps`` (upper bound excluded) chosen by the current
+        position, like ``range()``, but using only integer math. ``steps`` must be less than
+        16384."""
+        return (self.read_u16_filtered(samples) * steps) >> 16
+
     def range(self, steps=100, samples=None, deadzone=None):
         """Return a value (upper bound excluded) chosen by the current voltage value."""
         if not isinstance(steps, int):
@@ -172,12 +323,233 @@ class AnalogueReader:
         """Return a value from a list chosen by the current voltage value."""
         if not isinstance(values, list):
             raise ValueError(f"choice expects a list, got: {values}")
+        if deadzone is None:
+            return values[self.range_int(len(values), samples)]
         percent = self.percent(samples, deadzone)
         if percent == 1.0:
             return values[-1]
         return values[int(percent * len(values))]
 
 
+class SampleRing:
+    """A fixed size ring buffer of raw ADC readings which maintains a running sum, so that the
+    average of the most recent ``size`` readings is available in O(1).
+
+    This class is used by the :class:`BackgroundSampler` and does not need to be used by user
+    scripts.
+    """
+
+    def __init__(self, pin, size):
+        self.pin = pin
+        self.size = size
+        self.samples = array("H", [0] * size)
+        self.index = 0
+        self.total = 0
+
+    def fill(self, value):
+        """Replace every reading in the ring with the given value."""
+        for i in range(self.size):
+            self.samples[i] = value
+        self.index = 0
+        self.total = value * self.size
+
+    def push(self, value):
+        """Replace the oldest reading in the ring with the given value."""
+        index = self.index
+        self.total += value - self.samples[index]
+        self.samples[index] = value
+        index += 1
+        self.index = 0 if index == self.size else index
+
+    def average(self):
+        """Return the rounded average of the readings in the ring."""
+        return (self.total + (self.size >> 1)) // self.size
+
+
+class EMAFilter:
+    """An exponential moving average filter. Each reading moves the output ``1 / 2**shift`` of the
+    way towards the new reading, so larger values of ``shift`` smooth more but respond more slowly.
+    """
+
+    def __init__(self, shift=3):
+        self.shift = shift
+        self._total = None
+
+    def reset(self):
+        self._total = None
+
+    def update(self, value):
+        if self._total is None:
+            self._total = value << self.shift
+        else:
+            self._total += value - (self._total >> self.shift)
+        return self._total >> self.shift
+
+
+class MovingAverageFilter:
+    """A moving average filter, returning the average of the most recent ``size`` readings."""
+
+    def __init__(self, size=8):
+        self._ring = SampleRing(None, size)
+        self._primed = False
+
+    def reset(self):
+        self._primed = False
+
+    def update(self, value):
+        if self._primed:
+            self._ring.push(value)
+        else:
+            self._ring.fill(value)
+            self._primed = True
+        return self._ring.average()
+
+
+class MedianFilter:
+    """A median filter, returning the middle value of the most recent ``size`` readings. Unlike an
+    average, it ignores occasional readings that are far from the rest, such as noise spikes.
+
+    :param size: the number of readings, which must be odd. Each reading costs a time proportional
+        to ``size``, so keep it small.
+    """
+
+    def __init__(self, size=5):
+        if size < 1 or size % 2 == 0:
+            raise ValueError(f"MedianFilter expects an odd size, got: {size}")
+        self.size = size
+        self._samples = array("H", [0] * size)  # in the order they were read
+        self._sorted = array("H", [0] * size)
+        self._index = 0
+        self._primed = False
+
+    def reset(self):
+        self._primed = False
+
+    def update(self, value):
+        samples = self._samples
+        ordered = self._sorted
+        if not self._primed:
+            for i in range(self.size):
+                samples[i] = value
+                ordered[i] = value
+            self._primed = True
+            return value
+
+        # Remove the oldest reading from the sorted readings, then insert the new one.
+        old = samples[self._index]
+        samples[self._index] = value
+        self._index = (self._index + 1) % self.size
+        i = 0
+        while ordered[i] != old:
+            i += 1
+        while i > 0 and ordered[i - 1] > value:
+            ordered[i] = ordered[i - 1]
+            i -= 1
+        while i < self.size - 1 and ordered[i + 1] < value:
+            ordered[i] = ordered[i + 1]
+            i += 1
+        ordered[i] = value
+        return ordered[self.size >> 1]
+
+
+class SlewFilter:
+    """A slew limiter, the output follows the readings but moves by at most ``max_step`` per
+    reading."""
+
+    def __init__(self, max_step=1024):
+        self.max_step = max_step
+        self._value = None
+
+    def reset(self):
+        self._value = None
+
+    def update(self, value):
+        if self._value is None:
+            self._value = value
+        else:
+            self._value = clamp(value, self._value - self.max_step, self._value + self.max_step)
+        return self._value
+
+
+INPUT_FILTERS = {
+    "ema": EMAFilter,
+    "moving_average": MovingAverageFilter,
+    "median": MedianFilter,
+    "slew": SlewFilter,
+}
+
+
+def configure_filter(reader, name):
+    """Set a reader's filter from its name in ``INPUT_FILTERS``, or remove it if the name is
+    ``"none"``, as used in the EuroPi config."""
+    if name == "none":
+        reader.set_filters()
+    else:
+        reader.set_filters(INPUT_FILTERS[name]())
+
+
+class BackgroundSampler:
+    """Continuously samples a set of analogue readers from a hardware timer.
+
+    Once started, each reader's ADC is read once per timer tick into a :class:`SampleRing`. Calls
+    to ``percent()``, ``range()``, ``choice()`` and ``read_voltage()`` on those readers then return
+    the average of the most recent ``samples`` readings without touching the ADC, which makes
+    them cheap to call from the main loop and safe to call from handlers. While the sampler is
+    running the ``samples`` parameter of those methods is ignored.
+
+    The sampler is opt-in. A sampler for ``ain``, ``k1`` and ``k2`` is available as
+    ``europi.sampler``::
+
+        from europi import *
+
+        sampler.start()
+
+        while True:
+            cv1.voltage(ain.read_voltage())  # no ADC reads happen here
+
+    :param readers: the :class:`AnalogueReader` instances to sample
+    :param samples: the number of readings to average over, per reader
+    :param freq: the number of readings taken per second, per reader
+    """
+
+    def __init__(self, readers, samples=DEFAULT_SAMPLES, freq=DEFAULT_SAMPLER_FREQ):
+        if not isinstance(samples, int) or samples < 1:
+            raise ValueError(f"BackgroundSampler expects a positive int samples, got: {samples}")
+        self.readers = readers
+        self.freq = freq
+        self._rings = [SampleRing(reader.pin, samples) for reader in readers]
+        self._timer = None
+
+    @property
+    def running(self):
+        """True if the sampler is currently feeding its readers."""
+        return self._timer is not None
+
+    def start(self):
+        """Prime the ring buffers and start sampling in the background."""
+        if self.running:
+            return
+        for reader, ring in zip(self.readers, self._rings):
+            ring.fill(reader._sample_adc(ring.size))
+            reader._ring = ring
+        self._timer = Timer()
+        self._timer.init(mode=Timer.PERIODIC, freq=self.freq, callback=self._sample)
+
+    def stop(self):
+        """Stop sampling. The readers go back to reading the ADC directly."""
+        if not self.running:
+            return
+        self._timer.deinit()
+        self._timer = None
+        for reader in self.readers:
+            reader._ring = None
+
+    def _sample(self, timer):
+        # Timer callback, must not allocate.
+        for ring in self._rings:
+            ring.push(ring.pin.read_u16())
+
+
 class AnalogueInput(AnalogueReader):
     """A class for handling the reading of analogue control voltage.
 
@@ -193,10 +565,36 @@ class AnalogueInput(AnalogueReader):
     want to process at the maximum speed you can use as little as 1, and the
     processor won't bog down until you get way up into the thousands if you
     wan't incredibly accurate (but quite slow) readings.
+
+    The input can also be used as a gate or clock input by turning on its
+    comparator, which compares the voltage to a threshold many times per
+    second and calls handlers when it crosses it::
+
+        ain.comparator(threshold=1.0)
+
+        @ain.comparator_handler
+        def gate_on():
+            cv1.on()
+
+        @ain.comparator_handler_falling
+        def gate_off():
+            cv1.off()
+
+    The comparator has some hysteresis, the voltage must rise to
+    ``threshold + hysteresis / 2`` to turn the gate on and fall to
+    ``threshold - hysteresis / 2`` to turn it off again, so that a noisy
+    voltage close to the threshold doesn't cause a burst of edges.
     """
 
     def __init__(self, pin, min_voltage=MIN_INPUT_VOLTAGE, max_voltage=MAX_INPUT_VOLTAGE):
         super().__init__(pin)
+        self._comparator_high_mv = None  # None while the comparator is off
+        self._comparator_low_mv = None
+        self._comparator_samples = DEFAULT_COMPARATOR_SAMPLES
+        self._comparator_timer = None
+        self._comparator_gate = 0
+        self._comparator_rising_handler = lambda: None
+        self._comparator_falling_handler = lambda: None
         self.MIN_VOLTAGE = min_voltage
         self.MAX_VOLTAGE = max_voltage
         self._gradients = []
@@ -209,18 +607,127 @@ class AnalogueInput(AnalogueReader):
                 )
         self._gradients.append(self._gradients[-1])
 
+        # The raw readings at 0 and 100 percent, and the fixed point scale between them, used by
+        # _u16() to map readings to positions without float math, like _percent().
+        self._cal_low = INPUT_CALIBRATION_VALUES[0]
+        self._cal_high = INPUT_CALIBRATION_VALUES[-1]
+        span = self._cal_high - self._cal_low
+        self._cal_scale = ((MAX_UINT16 << DEADZONE_SCALE_BITS) + span - 1) // span
+
+        # Calibration never changes at runtime, so precompute the voltage (in millivolts) of
+        # every ADC code.
+        self._millivolts = array("H", [0] * (1 << ADC_RESOLUTION_BITS))
+        centre = 1 << (ADC_SHIFT - 1)
+        for code in range(len(self._millivolts)):
+            self._millivolts[code] = round(1000 * self._calc_voltage((code << ADC_SHIFT) + centre))
+
     def percent(self, samples=None):
         """Current voltage as a relative percentage of the component's range."""
+        return self._percent(self._sample_adc(samples))
+
+    def _percent(self, raw, deadzone=None):
         # Determine the percent value from the max calibration value.
-        reading = self._sample_adc(samples) - INPUT_CALIBRATION_VALUES[0]
+        reading = raw - INPUT_CALIBRATION_VALUES[0]
         max_value = max(
             reading,
             INPUT_CALIBRATION_VALUES[-1] - INPUT_CALIBRATION_VALUES[0],
         )
         return max(reading / max_value, 0.0)
 
+    def _u16(self, raw):
+        # Converts a raw reading to a calibrated position, the integer equivalent of _percent().
+        raw = clamp(raw, self._cal_low, self._cal_high)
+        return min(((raw - self._cal_low) * self._cal_scale) >> DEADZONE_SCALE_BITS, MAX_UINT16)
+
     def read_voltage(self, samples=None):
-        raw_reading = self._sample_adc(samples)
+        """Current voltage, in volts, calibrated and clamped to the component's range."""
+        return self._millivolts[self._sample_adc(samples) >> ADC_SHIFT] / 1000
+
+    def read_millivolts(self, samples=None):
+        """Current voltage as an integer number of millivolts. Avoids float math entirely."""
+        return self._millivolts[self._sample_adc(samples) >> ADC_SHIFT]
+
+    def comparator(
+        self,
+        threshold=DEFAULT_COMPARATOR_THRESHOLD,
+        hysteresis=DEFAULT_COMPARATOR_HYSTERESIS,
+        samples=DEFAULT_COMPARATOR_SAMPLES,
+        freq=DEFAULT_COMPARATOR_FREQ,
+    ):
+        """Turn on the comparator, see the class documentation.
+
+        The comparator reads the ADC directly, using ``samples`` samples per reading, ignoring any
+        filters or background sampler, so that it reacts quickly.
+
+        :param threshold: the voltage at which the gate turns on
+        :param hysteresis: the width of the band around the threshold, in volts
+        :param samples: the number of ADC samples averaged for each comparison
+        :param freq: the number of comparisons per second made by a hardware timer. If 0, no timer
+            is used and ``poll_comparator()`` must be called instead.
+        """
+        self.comparator_off()
+        self._comparator_high_mv = round((threshold + hysteresis / 2) * 1000)
+        self._comparator_low_mv = round((threshold - hysteresis / 2) * 1000)
+        self._comparator_samples = samples
+        millivolts = self._millivolts[self._read_adc(samples) >> ADC_SHIFT]
+        self._comparator_gate = 1 if millivolts >= self._comparator_high_mv else 0
+        if freq:
+            self._comparator_timer = Timer()
+            self._comparator_timer.init(
+                mode=Timer.PERIODIC, freq=freq, callback=self._comparator_tick
+            )
+
+    def comparator_off(self):
+        """Turn off the comparator."""
+        if self._comparator_timer is not None:
+            self._comparator_timer.deinit()
+            self._comparator_timer = None
+        self._comparator_high_mv = None
+        self._comparator_low_mv = None
+        self._comparator_gate = 0
+
+    def comparator_value(self):
+        """The comparator's gate, 1 if the voltage is above the threshold, otherwise 0."""
+        return self._comparator_gate
+
+    def comparator_handler(self, func):
+        """Define the callback function to call when the comparator's gate turns on."""
+        if not callable(func):
+            raise ValueError("Provided handler func is not callable")
+        self._comparator_rising_handler = func
+
+    def comparator_handler_falling(self, func):
+        """Define the callback function to call when the comparator's gate turns off."""
+        if not callable(func):
+            raise ValueError("Provided handler func is not callable")
+        self._comparator_falling_handler = func
+
+    def reset_handler(self):
+        self.comparator_off()
+        self._comparator_rising_handler = lambda: None
+        self._comparator_falling_handler = lambda: None
+
+    def poll_comparator(self):
+        """Take a reading, updating the comparator's gate and calling the handlers if it changed.
+        Only needed if the comparator was turned on without a timer. Returns the gate."""
+        if self._comparator_high_mv is None:
+            return 0
+        millivolts = self._millivolts[self._read_adc(self._comparator_samples) >> ADC_SHIFT]
+        if self._comparator_gate:
+            if millivolts < self._comparator_low_mv:
+                self._comparator_gate = 0
+                self._comparator_falling_handler()
+        elif millivolts >= self._comparator_high_mv:
+            self._comparator_gate = 1
+            self._comparator_rising_handler()
+        return self._comparator_gate
+
+    def _comparator_tick(self, timer):
+        self.poll_comparator()
+
+    def _calc_voltage(self, raw_reading):
+        # Converts a raw reading to volts using the calibration values. Used to build the lookup
+        # table, read_voltage() should be used instead.
         reading = raw_reading - INPUT_CALIBRATION_VALUES[0]
         max_value = max(
             reading,
@@ -276,20 +783,145 @@ class Knob(AnalogueReader):
     any read_position value above 4096 (2^12) will not actually be any finer
     resolution, but will instead just go up in steps. For example using 8192
     would only return values which go up in steps of 2.
+
+    When a knob rests on the boundary between two positions, noise will make ``read_position()``
+    flicker between them. ``read_stable_position()`` applies some hysteresis, so that the position
+    only changes once the knob has moved a little way past the boundary. To run some code only when
+    the position changes, register a callback with ``on_change()`` and call ``poll()`` from the
+    main loop::
+
+        def set_division(division):
+            self.division = division + 1
+            self.save_state()
+
+        k2.on_change(set_division, steps=16)
+
+        while True:
+            k2.poll()  # only calls set_division if the knob has moved to a new position
     """
 
     def __init__(self, pin, deadzone=0.01):
         super().__init__(pin, deadzone=deadzone)
+        self._stable_steps = None
+        self._stable_position = None
+        self._change_handler = None
+        self._change_steps = 100
+        self._change_hysteresis = DEFAULT_KNOB_HYSTERESIS
 
-    def percent(self, samples=None, deadzone=None):
-        """Return the knob's position as relative percentage."""
+    def _percent(self, raw, deadzone=None):
         # Reverse range to provide increasing range.
-        return 1.0 - super().percent(samples, deadzone)
+        return 1.0 - super()._percent(raw, deadzone)
+
+    def _u16(self, raw):
+        # Reverse range to provide increasing range.
+        return MAX_UINT16 - super()._u16(raw)
 
     def read_position(self, steps=100, samples=None, deadzone=None):
         """Returns the position as a value between zero and provided integer."""
         return self.range(steps, samples, deadzone)
 
+    def read_stable_position(self, steps=100, hysteresis=DEFAULT_KNOB_HYSTERESIS, samples=None):
+        """Returns the position as a value between zero and provided integer, like
+        ``read_position()``, but only moves to a new position once the knob has turned
+        ``hysteresis`` of a position past the edge of the previous one.
+
+        The previous position is remembered between calls, so each knob should only be read with a
+        single number of steps. Changing ``steps`` starts again from the knob's current position.
+        """
+        value = self.percent(samples) * steps
+        position = self._stable_position
+        if (
+            steps != self._stable_steps
+            or value < position - hysteresis
+            or value >= position + 1 + hysteresis
+        ):
+            self._stable_steps = steps
+            self._stable_position = position = min(int(value), steps - 1)
+        return position
+
+    def on_change(self, func, steps=100, hysteresis=DEFAULT_KNOB_HYSTERESIS):
+        """Define the callback function to call from ``poll()`` when the knob's stable position,
+        out of ``steps``, changes. The function is called with the new position."""
+        if not callable(func):
+            raise ValueError("Provided handler func is not callable")
+        self._change_handler = func
+        self._change_steps = steps
+        self._change_hysteresis = hysteresis
+        self.read_stable_position(steps, hysteresis)
+
+    def reset_handler(self):
+        self._change_handler = None
+
+    def poll(self, samples=None):
+        """Read the knob's stable position, calling the ``on_change()`` callback if it has changed.
+        Returns True if the position changed, the first reading of a knob is not a change."""
+        previous = self._stable_position
+        position = self.read_stable_position(self._change_steps, self._change_hysteresis, samples)
+        if position == previous or previous is None:
+            return False
+        if self._change_handler is not None:
+            self._change_handler(position)
+        return True
+
+
+class EventQueue:
+    """A fixed size ring buffer of digital input events, each an ``EVENT_RISING``,
+    ``EVENT_FALLING`` or ``EVENT_BOTH`` and the ``ticks_us`` at which it happened.
+
+    Events are pushed from an IRQ and popped from the main loop. Pushing does not allocate memory,
+    and as only the IRQ moves the head and only the main loop moves the tail, the two never need
+    to be synchronised. When the queue is full new events are dropped and counted in
+    ``overflows``.
+
+    This class is used by :meth:`DigitalReader.defer` and does not need to be used by user
+    scripts.
+    """
+
+    def __init__(self, size):
+        # One slot is always left empty, to tell a full queue from an empty one.
+        self.size = size + 1
+        self.events = bytearray(self.size)
+        self.times = array("l", [0] * self.size)
+        self.head = 0
+        self.tail = 0
+        self.overflows = 0
+        # The ticks_us of the last event returned by pop().
+        self.ticks_us = 0
+
+    def __len__(self):
+        return (self.head - self.tail) % self.size
+
+    def push(self, event, ticks):
+        """Add an event to the queue, returning False if it was dropped because the queue is
+        full."""
+        head = self.head
+        next_head = head + 1
+        if next_head == self.size:
+            next_head = 0
+        if next_head == self.tail:
+            self.overflows += 1
+            return False
+        self.events[head] = event
+        self.times[head] = ticks
+        self.head = next_head
+        return True
+
+    def pop(self):
+        """Remove the oldest event from the queue and return it, or None if the queue is empty.
+        The event's timestamp is stored in ``ticks_us``."""
+        tail = self.tail
+        if tail == self.head:
+            return None
+        event = self.events[tail]
+        self.ticks_us = self.times[tail]
+        tail += 1
+        self.tail = 0 if tail == self.size else tail
+        return event
+
+    def clear(self):
+        """Remove every event from the queue."""
+        self.tail = self.head
+
 
 class DigitalReader:
     """A base class for common digital inputs methods.
@@ -314,27 +946,101 @@ class DigitalReader:
         # IRQ event timestamps
         self.last_rising_ms = 0
         self.last_falling_ms = 0
+        self.last_event_us = 0
+
+        # Edge and handler timing statistics, see reset_stats()
+        self.reset_stats()
+
+        # Clock tracker fed the time of each rising edge, see track()
+        self._tracker = None
+
+        # uasyncio flags set by each edge, see rising() and falling()
+        self._rising_flag = None
+        self._falling_flag = None
+
+        # Deferred event queue, see defer()
+        self.event_queue = None
+        self._schedule = False
+        self._scheduled = False
+        # Bound once, as creating a bound method allocates, which is not allowed in a hard IRQ.
+        self._scheduled_dispatch = self._run_scheduled
 
     def _bounce_wrapper(self, pin):
         """IRQ handler wrapper for falling and rising edge callback functions."""
+        self.edges_seen += 1
         if self.value() == HIGH:
-            if time.ticks_diff(time.ticks_ms(), self.last_rising_ms) < self.debounce_delay:
+            if ticks_diff(ticks_ms(), self.last_rising_ms) < self.debounce_delay:
+                self.edges_debounced += 1
                 return
-            self.last_rising_ms = time.ticks_ms()
-            return self._rising_handler()
+            self.last_rising_ms = ticks_ms()
+            event = EVENT_RISING
         else:
-            if time.ticks_diff(time.ticks_ms(), self.last_falling_ms) < self.debounce_delay:
+            if ticks_diff(ticks_ms(), self.last_falling_ms) < self.debounce_delay:
+                self.edges_debounced += 1
                 return
-            self.last_falling_ms = time.ticks_ms()
+            self.last_falling_ms = ticks_ms()
 
             # Check if 'other' pin is set and if 'other' pins is high and if this pin has been high for long enough.
             if (
                 self._other
                 and self._other.value()
-                and time.ticks_diff(self.last_falling_ms, self.last_rising_ms) > 500
+                and ticks_diff(self.last_falling_ms, self.last_rising_ms) > 500
             ):
-                return self._both_handler()
-            return self._falling_handler()
+                event = EVENT_BOTH
+            else:
+                event = EVENT_FALLING
+
+        now_us = ticks_us()
+        if event == EVENT_RISING:
+            if self._tracker is not None:
+                self._tracker.on_edge(now_us)
+            if self._rising_flag is not None:
+                self._rising_flag.set()
+        elif self._falling_flag is not None:
+            self._falling_flag.set()
+
+        if self.event_queue is None:
+            return self._handle(event, now_us)
+
+        self.event_queue.push(event, now_us)
+        if self._schedule and not self._scheduled:
+            try:
+                micropython.schedule(self._scheduled_dispatch, 0)
+                self._scheduled = True
+            except RuntimeError:
+                # The schedule queue is full, the event stays queued and is dispatched after the
+                # next edge or by the next call to dispatch().
+                pass
+
+    def _handle(self, event, edge_us):
+        # Call the handler for an edge that happened at edge_us, timing it.
+        interval = ticks_diff(edge_us, self.last_event_us)
+        self.last_event_us = edge_us
+        start = ticks_us()
+        result = self._call_handler(event)
+        duration = ticks_diff(ticks_us(), start)
+        if duration > self.max_handler_us:
+            self.max_handler_us = duration
+        # A handler that takes longer than the time since the previous edge is likely to still be
+        # running when the next edge arrives.
+        if self.edges_dispatched and duration > interval:
+            self.handler_overruns += 1
+        self.edges_dispatched += 1
+        return result
+
+    def _call_handler(self, event):
+        if event == EVENT_RISING:
+            return self._rising_handler()
+        if event == EVENT_BOTH:
+            return self._both_handler()
+        return self._falling_handler()
+
+    def _run_scheduled(self, _):
+        self._scheduled = False
+        self.dispatch()
+
+    def _enable_irq(self):
+        self.pin.irq(handler=self._bounce_wrapper, hard=self.event_queue is not None)
 
     def value(self):
         """The current binary value, HIGH (1) or LOW (0)."""
@@ -348,17 +1054,130 @@ class DigitalReader:
         if not callable(func):
             raise ValueError("Provided handler func is not callable")
         self._rising_handler = func
-        self.pin.irq(handler=self._bounce_wrapper)
+        self._enable_irq()
 
     def handler_falling(self, func):
         """Define the callback function to call when falling edge detected."""
         if not callable(func):
             raise ValueError("Provided handler func is not callable")
         self._falling_handler = func
-        self.pin.irq(handler=self._bounce_wrapper)
+        self._enable_irq()
+
+    async def rising(self):
+        """Wait for a rising edge, from a ``uasyncio`` task::
+
+            async def clock():
+                while True:
+                    await din.rising()
+                    cv1.trigger()
+
+        The task is woken by a ``uasyncio.ThreadSafeFlag`` set from the IRQ, so waiting does not
+        poll the input. Only edges since the first call are counted, and if an edge arrived since
+        the last wait returned, the wait returns straight away. Handlers are still called as
+        usual.
+        """
+        if self._rising_flag is None:
+            # uasyncio is only loaded by scripts that use it, as it takes a lot of RAM
+            import uasyncio
+
+            self._rising_flag = uasyncio.ThreadSafeFlag()
+            self._enable_irq()
+        await self._rising_flag.wait()
+
+    async def falling(self):
+        """Wait for a falling edge, from a ``uasyncio`` task, see :meth:`rising`."""
+        if self._falling_flag is None:
+            import uasyncio
+
+            self._falling_flag = uasyncio.ThreadSafeFlag()
+            self._enable_irq()
+        await self._falling_flag.wait()
+
+    def track(self, tracker):
+        """Pass the ``ticks_us`` of every rising edge to ``tracker.on_edge()``, from the IRQ, or
+        stop if ``tracker`` is None. See :class:`clock_tracker.ClockTracker`."""
+        self._tracker = tracker
+        if tracker is not None:
+            self._enable_irq()
+
+    def defer(self, size=DEFAULT_EVENT_QUEUE_SIZE, schedule=False):
+        """Record edges in a queue instead of calling the handlers from the IRQ.
+
+        By default handlers are called from the pin's IRQ, so a slow handler delays every other
+        interrupt, and edges that arrive while it runs can be missed. Once deferred, the IRQ only
+        records the type of each edge and the ``ticks_us`` at which it happened, which takes the
+        same short time however long the handlers are, and the handlers are called later from
+        :meth:`dispatch`::
+
+            din.defer()
+
+            @din.handler
+            def clock():
+                ...  # may update the display, allocate, etc.
+
+            while True:
+                din.dispatch()
+                ...
+
+        With ``schedule=True`` :meth:`dispatch` is instead called automatically via
+        ``micropython.schedule()``, as soon as the main loop's current bytecode completes.
+
+        While a handler runs, ``last_event_us`` holds the ``ticks_us`` of the edge it handles.
+        Up to ``size`` edges can wait to be handled; further edges are dropped and counted in
+        ``event_queue.overflows``.
+
+        :param size: the number of edges that can be queued
+        :param schedule: if True, dispatch the queued edges with ``micropython.schedule()``
+        """
+        self.event_queue = EventQueue(size)
+        self._schedule = schedule
+        self._scheduled = False
+        self._enable_irq()
+
+    def dispatch(self):
+        """Call the handlers of the edges queued since the last dispatch, in the order they
+        happened, and return the number of edges handled. Does nothing unless :meth:`defer` has
+        been called."""
+        queue = self.event_queue
+        if queue is None:
+            return 0
+        count = 0
+        event = queue.pop()
+        while event is not None:
+            self._handle(event, queue.ticks_us)
+            count += 1
+            event = queue.pop()
+        return count
+
+    def reset_stats(self):
+        """Reset the edge and handler statistics.
+
+        Each input keeps counts that show whether a script's handlers keep up with its edges:
+
+        * ``edges_seen``: every edge that caused an IRQ
+        * ``edges_debounced``: edges ignored because they came within ``debounce_delay`` ms of
+          the previous edge in the same direction
+        * ``edges_dispatched``: edges whose handler was called
+        * ``handler_overruns``: handlers that took longer than the time between their edge and
+          the edge before it, and so probably delayed or missed the next edge
+        * ``max_handler_us``: the longest time a handler took, in microseconds
+
+        Edges dropped because the queue of a deferred input was full are counted in
+        ``event_queue.overflows``, see :meth:`defer`.
+        """
+        self.edges_seen = 0
+        self.edges_debounced = 0
+        self.edges_dispatched = 0
+        self.handler_overruns = 0
+        self.max_handler_us = 0
 
     def reset_handler(self):
         self.pin.irq(handler=None)
+        self._tracker = None
+        self.event_queue = None
+        self._schedule = False
+        self._rising_flag = None
+        self._falling_flag = None
 
     def _handler_both(self, other, func):
         """When this and other are high, execute the both func."""
@@ -366,7 +1185,7 @@ class DigitalReader:
             raise ValueError("Provided handler func is not callable")
         self._other = other
         self._both_handler = func
-        self.pin.irq(handler=self._bounce_wrapper)
+        self._enable_irq()
 
 
 class DigitalInput(DigitalReader):
@@ -446,6 +1265,66 @@ class Button(DigitalReader):
         """
         return self.last_rising_ms
 
+    async def pressed(self):
+        """Wait for the button to be pressed, from a ``uasyncio`` task, see
+        :meth:`DigitalReader.rising`."""
+        await self.rising()
+
+    async def released(self):
+        """Wait for the button to be released, from a ``uasyncio`` task, see
+        :meth:`DigitalReader.falling`."""
+        await self.falling()
+
+
+class TextCache:
+    """A bounded, least recently used cache of text pre-rendered into single line
+    ``FrameBuffer`` strips, used by :meth:`Display.cached_text`.
+
+    :param max_bytes: the total size of the cached strips, once exceeded the least recently used
+        strips are evicted
+    """
+
+    def __init__(self, max_bytes=DEFAULT_TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._strips = OrderedDict()
+
+    def __len__(self):
+        return len(self._strips)
+
+    def get(self, text, colour=1):
+        """Return a strip with ``text`` drawn in ``colour`` on the opposite colour."""
+        key = (text, colour)
+        strip = self._strips.pop(key, None)
+        if strip is None:
+            self.misses += 1
+            strip = self._render(text, colour)
+            self.size += len(text) * CHAR_WIDTH
+            while self.size > self.max_bytes and self._strips:
+                oldest = next(iter(self._strips))
+                del self._strips[oldest]
+                self.size -= len(oldest[0]) * CHAR_WIDTH
+        else:
+            self.hits += 1
+        self._strips[key] = strip
+        return strip
+
+    def clear(self):
+        """Remove all of the cached strips."""
+        self._strips = OrderedDict()
+        self.size = 0
+
+    @staticmethod
+    def _render(text, colour):
+        width = len(text) * CHAR_WIDTH
+        strip = FrameBuffer(bytearray(width), width, CHAR_HEIGHT, MONO_VLSB)
+        if not colour:
+            strip.fill(1)
+        strip.text(text, 0, 0, colour)
+        return strip
+
 
 class Display(SSD1306_I2C):
     """A class for drawing graphics and text to the OLED.
@@ -458,6 +1337,46 @@ class Display(SSD1306_I2C):
 
     To clear the display, simply fill the display with the colour black by using ``oled.fill(0)``
 
+    ``oled.show()`` only sends the parts of the display that have changed since the last call, so
+    calling it when little or nothing has changed is cheap. The following counters can be used to
+    see how much data is being sent:
+
+    * ``last_frame_bytes``: the number of framebuffer bytes sent by the last ``show()``
+    * ``bytes_sent``: the total number of framebuffer bytes sent
+    * ``frames_sent``: the number of ``show()`` calls which sent data
+    * ``frames_skipped``: the number of ``show()`` calls which had nothing to send
+
+    ``oled.show()`` blocks until all of the changes have been sent. Scripts with time critical
+    main loops can instead use ``oled.show_async()``, which takes a copy of the frame and then
+    sends it in small chunks, one per call to ``oled.tick()``. Drawing can continue as soon as
+    ``show_async()`` returns without affecting the frame being sent::
+
+        while True:
+            if not oled.flushing:
+                draw_next_frame()
+                oled.show_async()
+            handle_clock()
+            oled.tick()
+
+    Each tick sends at most ``oled.chunk_bytes`` bytes (32 by default, about 1ms at 400kHz). If
+    ``show_async()`` is called before the previous frame has been completely sent, the newer frame
+    replaces it and the parts already sent are not sent again.
+
+    To keep redundant refreshes from stealing time from the rest of a script, ``oled`` limits the
+    rate at which ``show()`` sends frames to the display to the ``display_max_fps`` value of the
+    EuroPi configuration (30 by default, 0 disables the limit). Calls to ``show()`` that arrive
+    sooner than that are deferred: the frame is copied and sent by a timer once the frame interval
+    has passed, so the latest frame is always displayed. Deferred frames that are replaced by a
+    newer frame before being sent are counted by ``frames_dropped``, so anything that should be
+    seen, like a trigger indicator, needs to stay drawn for longer than a frame interval. The timer
+    waits for ``contrast()``, ``invert()``, ``poweroff()`` and ``poweron()`` to finish before
+    sending, but scripts that call ``write_cmd()`` directly should call ``oled.cancel_pending()``
+    first.
+
+    Text that is redrawn often, like menu items and labels, can be drawn with
+    ``oled.cached_text()`` instead of ``oled.text()``. The text is rendered once and kept in a
+    small cache (``oled.text_cache``), so redrawing it is a single ``blit``.
+
     More explanations and tips about the the display can be found in the oled_tips file
     `oled_tips.md <https://github.com/Allen-Synthesis/EuroPi/blob/main/software/oled_tips.md>`_
     """
@@ -470,11 +1389,42 @@ class Display(SSD1306_I2C):
         height=OLED_HEIGHT,
         channel=I2C_CHANNEL,
         freq=I2C_FREQUENCY,
+        max_fps=0,
     ):
         i2c = I2C(channel, sda=Pin(sda), scl=Pin(scl), freq=freq)
         self.width = width
         self.height = height
 
+        # Frame rate governor state, see set_max_fps().
+        self._frame_ms = 0
+        self._last_show_ms = 0
+        self._shown = False
+        self._deferred = False
+        self._timer = None
+        self._i2c_busy = 0
+        self.frames_dropped = 0
+        self.set_max_fps(max_fps)
+
+        self.text_cache = TextCache()
+        self._centre_layouts = OrderedDict()
+
+        # The frame last sent to the display, None when the display's contents are unknown.
+        self._shadow = None
+        # The first and last changed byte of each page, found while diffing.
+        self._dirty_x0 = array("h", [0] * (height // 8))
+        self._dirty_x1 = array("h", [0] * (height // 8))
+        # The frame being sent by tick(), and the position of the next chunk to send.
+        self._pending = None
+        self._pending_page = 0
+        self._pending_x = 0
+        self._pending_bytes = 0
+        self.flushing = False
+        self.chunk_bytes = DEFAULT_CHUNK_BYTES
+        self.last_frame_bytes = 0
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
         if len(i2c.scan()) == 0:
             if not TEST_ENV:
                 raise Exception(
@@ -482,23 +1432,267 @@ class Display(SSD1306_I2C):
                 )
         super().__init__(self.width, self.height, i2c)
 
+    def set_max_fps(self, max_fps):
+        """Limit the rate at which ``show()`` sends frames to the display. 0 removes the limit."""
+        if not isinstance(max_fps, int) or max_fps < 0:
+            raise ValueError(f"set_max_fps expects a non-negative int value, got: {max_fps}")
+        self._frame_ms = 1000 // max_fps if max_fps else 0
+
+    def show(self):
+        """Send the regions of the frame that have changed since the last call to the display."""
+        self.flushing = False
+        if self._frame_ms:
+            now = ticks_ms()
+            elapsed = ticks_diff(now, self._last_show_ms)
+            if self._shown and elapsed < self._frame_ms:
+                self._defer(self._frame_ms - elapsed)
+                return
+            self._last_show_ms = now
+            self._shown = True
+        self._deferred = False
+        self._flush(self.buffer)
+
+    def _defer(self, delay_ms):
+        # Holds a copy of the frame to be sent by the governor's timer.
+        if self._pending is None:
+            self._pending = bytearray(len(self.buffer))
+        self._pending[:] = self.buffer
+        if self._deferred:
+            self.frames_dropped += 1
+            return
+        self._deferred = True
+        if self._timer is None:
+            self._timer = Timer()
+        self._timer.init(mode=Timer.ONE_SHOT, period=delay_ms, callback=self._show_deferred)
+
+    def _show_deferred(self, timer):
+        if not self._deferred or self.flushing:
+            return
+        if self._i2c_busy:
+            # The main loop is part way through a command, try again once it has been sent.
+            self._timer.init(mode=Timer.ONE_SHOT, period=1, callback=self._show_deferred)
+            return
+        self._deferred = False
+        self._last_show_ms = ticks_ms()
+        self._flush(self._pending)
+
+    def show_async(self):
+        """Take a copy of the frame, to be sent to the display by subsequent calls to
+        :meth:`tick`."""
+        self._deferred = False
+        if self._pending is None:
+            self._pending = bytearray(len(self.buffer))
+        self._pending[:] = self.buffer
+        if self._shadow is None:
+            # Nothing to diff against, this only happens once so send it all now.
+            self.flushing = False
+            self._flush(self._pending)
+            return
+        if not self.flushing:
+            self._pending_bytes = 0
+        self._pending_page = 0
+        self._pending_x = 0
+        self.flushing = True
+
+    def tick(self):
+        """Send the next chunk of the frame passed to :meth:`show_async`, if any.
+
+        Returns True if there is more of the frame left to send.
+        """
+        if not self.flushing:
+            return False
+        frame = self._pending
+        width = self.width
+        while self._pending_page < self.pages:
+            page = self._pending_page
+            start = page * width
+            end = start + width
+            x0 = _first_difference(frame, self._shadow, start + self._pending_x, end)
+            if x0 == end:
+                self._pending_page += 1
+                self._pending_x = 0
+                continue
+            x1 = _last_difference(frame, self._shadow, x0, min(end, x0 + self.chunk_bytes))
+            self._pending_bytes += self._send(frame, page, page, x0 - start, x1 - start)
+            self._pending_x = x1 + 1 - start
+            return True
+        self.flushing = False
+        self._count_frame(self._pending_bytes)
+        return False
+
+    async def flush(self):
+        """Send the frame to the display from a ``uasyncio`` task.
+
+        This works like :meth:`show_async` followed by calls to :meth:`tick` until the frame has
+        been sent, yielding to other tasks between chunks, so the display never holds up the rest
+        of the script for more than a chunk::
+
+            async def ui():
+                while True:
+                    draw_next_frame()
+                    await oled.flush()
+
+        The ``display_max_fps`` limit is kept by waiting, without blocking other tasks, until the
+        next frame is due.
+        """
+        import uasyncio
+
+        self.show_async()
+        if self._frame_ms:
+            wait_ms = self._frame_ms - ticks_diff(ticks_ms(), self._last_show_ms)
+            if self._shown and wait_ms > 0:
+                await uasyncio.sleep_ms(wait_ms)
+            self._last_show_ms = ticks_ms()
+            self._shown = True
+        # Always yield at least once, so a loop that flushes unchanged frames can't starve others.
+        more = True
+        while more:
+            more = self.tick()
+            await uasyncio.sleep_ms(0)
+
+    def cancel_pending(self):
+        """Discard any frame deferred by the frame rate limit or passed to :meth:`show_async`
+        without sending it."""
+        if self._timer is not None:
+            self._timer.deinit()
+        self._deferred = False
+        self.flushing = False
+
+    def invalidate(self):
+        """Forget the contents of the physical display, so that the next ``show()`` sends the
+        whole frame."""
+        self._shadow = None
+
+    def _hold_deferred(self, method, *args):
+        # Runs an SSD1306 method that sends several commands, keeping the governor's timer from
+        # sending a deferred frame between them.
+        self._i2c_busy += 1
+        try:
+            method(self, *args)
+        finally:
+            self._i2c_busy -= 1
+
+    def contrast(self, contrast):
+        self._hold_deferred(SSD1306_I2C.contrast, contrast)
+
+    def invert(self, invert):
+        self._hold_deferred(SSD1306_I2C.invert, invert)
+
+    def poweroff(self):
+        self._hold_deferred(SSD1306_I2C.poweroff)
+
+    def poweron(self):
+        self._hold_deferred(SSD1306_I2C.poweron)
+
+    def _flush(self, frame):
+        # Sends the differences between frame and the shadow frame to the display.
+        width = self.width
+        if self._shadow is None:
+            self._shadow = bytearray(len(frame))
+            sent = self._send(frame, 0, self.pages - 1, 0, width - 1)
+        else:
+            sent = self._send_changes(frame, 0, self.pages)
+        self._count_frame(sent)
+
+    def _count_frame(self, sent):
+        self.last_frame_bytes = sent
+        if sent:
+            self.bytes_sent += sent
+            self.frames_sent += 1
+        else:
+            self.frames_skipped += 1
+
+    def _send_changes(self, frame, first_page, end_page):
+        # Sends the changed regions of pages [first_page, end_page) and returns the number of
+        # framebuffer bytes sent. Each changed page is sent as its own column window, unless
+        # sending whole pages is cheaper.
+        width = self.width
+        shadow = self._shadow
+        dirty_first = -1
+        dirty_last = -1
+        windowed_cost = 0
+        for page in range(first_page, end_page):
+            start = page * width
+            end = start + width
+            x0 = _first_difference(frame, shadow, start, end)
+            if x0 == end:
+                self._dirty_x0[page] = -1
+                continue
+            x1 = _last_difference(frame, shadow, x0, end)
+            self._dirty_x0[page] = x0 - start
+            self._dirty_x1[page] = x1 - start
+            if dirty_first < 0:
+                dirty_first = page
+            dirty_last = page
+            windowed_cost += SSD1306_WINDOW_COST + x1 - x0 + 1
+
+        if dirty_first < 0:
+            return 0
+
+        if SSD1306_WINDOW_COST + (dirty_last - dirty_first + 1) * width <= windowed_cost:
+            return self._send(frame, dirty_first, dirty_last, 0, width - 1)
+
+        sent = 0
+        for page in range(dirty_first, dirty_last + 1):
+            if self._dirty_x0[page] >= 0:
+                sent += self._send(frame, page, page, self._dirty_x0[page], self._dirty_x1[page])
+        return sent
+
+    def _send(self, frame, page0, page1, x0, x1):
+        # Sends a window of the frame to the display. Multi page windows must be full width.
+        offset = 32 if self.width == 64 else 0
+        self.write_cmd(SSD1306_SET_COL_ADDR)
+        self.write_cmd(x0 + offset)
+        self.write_cmd(x1 + offset)
+        self.write_cmd(SSD1306_SET_PAGE_ADDR)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+        start = page0 * self.width + x0
+        end = page1 * self.width + x1 + 1
+        data = memoryview(frame)[start:end]
+        self.write_data(data)
+        self._shadow[start:end] = data
+        return end - start
+
+    def cached_text(self, text, x, y, colour=1):
+        """Draw ``text`` like ``text()`` does, using the text cache so that redrawing the same text
+        is a single ``blit``."""
+        if text:
+            self.blit(self.text_cache.get(text, colour), x, y, 1 - colour)
+
     def centre_text(self, text):
         """Split the provided text across 3 lines of display."""
         self.fill(0)
-        # Default font is 8x8 pixel monospaced font which can be split to a
-        # maximum of 4 lines on a 128x32 display, but we limit it to 3 lines
-        # for readability.
-        lines = str(text).split("\n")
-        maximum_lines = round(self.height / CHAR_HEIGHT)
-        if len(lines) > maximum_lines:
-            raise Exception("Provided text exceeds available space on oled display.")
-        padding_top = (self.height - (len(lines) * 9)) / 2
-        for index, content in enumerate(lines):
-            x_offset = int((self.width - ((len(content) + 1) * 7)) / 2) - 1
-            y_offset = int((index * 9) + padding_top) - 1
-            self.text(content, x_offset, y_offset)
+        for content, x_offset, y_offset in self._centre_layout(str(text)):
+            self.cached_text(content, x_offset, y_offset)
         self.show()
 
+    def _centre_layout(self, text):
+        # Returns the (line, x, y) positions used to centre the text, these are cached as the
+        # same text tends to be centred over and over again.
+        layout = self._centre_layouts.pop(text, None)
+        if layout is None:
+            # Default font is 8x8 pixel monospaced font which can be split to a
+            # maximum of 4 lines on a 128x32 display, but we limit it to 3 lines
+            # for readability.
+            lines = text.split("\n")
+            maximum_lines = round(self.height / CHAR_HEIGHT)
+            if len(lines) > maximum_lines:
+                raise Exception("Provided text exceeds available space on oled display.")
+            padding_top = (self.height - (len(lines) * 9)) / 2
+            layout = tuple(
+                (
+                    content,
+                    int((self.width - ((len(content) + 1) * 7)) / 2) - 1,
+                    int((index * 9) + padding_top) - 1,
+                )
+                for index, content in enumerate(lines)
+            )
+            if len(self._centre_layouts) >= CENTRE_LAYOUT_CACHE_SIZE:
+                del self._centre_layouts[next(iter(self._centre_layouts))]
+        self._centre_layouts[text] = layout
+        return layout
+
 
 class Output:
     """A class for sending digital or analogue voltage to an output jack.
@@ -514,17 +1708,31 @@ class Output:
     def __init__(self, pin, min_voltage=MIN_OUTPUT_VOLTAGE, max_voltage=MAX_OUTPUT_VOLTAGE):
         self.pin = PWM(Pin(pin))
         self.pin.freq(PWM_FREQ)
+        self.pin.duty_u16(0)
         self._duty = 0
         self.MIN_VOLTAGE = min_voltage
         self.MAX_VOLTAGE = max_voltage
+        self._min_mv = int(min_voltage * 1000)
+        self._max_mv = int(max_voltage * 1000)
 
         self._gradients = []
         for index, value in enumerate(OUTPUT_CALIBRATION_VALUES[:-1]):
             self._gradients.append(OUTPUT_CALIBRATION_VALUES[index + 1] - value)
         self._gradients.append(self._gradients[-1])
 
+        # Duty cycle at each whole volt, and the duty per millivolt above it in Q16 fixed point,
+        # so that voltage_mv() needs nothing but integer math.
+        self._volt_duties = array("H", OUTPUT_CALIBRATION_VALUES)
+        self._mv_gradients = array("l", [(g << 16) // 1000 for g in self._gradients])
+
+        # The PulseScheduler that ends this output's triggers, and this output's index in it.
+        self._pulses = None
+        self._pulse_index = 0
+
     def _set_duty(self, cycle):
         cycle = int(cycle)
+        if cycle == self._duty:
+            return
         self.pin.duty_u16(clamp(cycle, 0, MAX_UINT16))
         self._duty = cycle
 
@@ -536,14 +1744,40 @@ class Output:
         index = int(voltage // 1)
         self._set_duty(OUTPUT_CALIBRATION_VALUES[index] + (self._gradients[index] * (voltage % 1)))
 
+    def voltage_mv(self, millivolts):
+        """Set the output voltage to the provided integer number of millivolts, within the range
+        of 0 to 10000.
+
+        This is equivalent to ``voltage(millivolts / 1000)`` but uses only integer math, so it is
+        faster and does not allocate.
+        """
+        millivolts = clamp(millivolts, self._min_mv, self._max_mv)
+        index = millivolts // 1000
+        self._set_duty(
+            self._volt_duties[index]
+            + ((self._mv_gradients[index] * (millivolts - index * 1000)) >> 16)
+        )
+
     def on(self):
         """Set the voltage HIGH at 5 volts."""
-        self.voltage(5)
+        self.voltage_mv(5000)
 
     def off(self):
         """Set the voltage LOW at 0 volts."""
         self._set_duty(0)
 
+    def trigger(self, duration_ms=DEFAULT_TRIGGER_MS):
+        """Set the voltage HIGH at 5 volts, and back to LOW after ``duration_ms`` milliseconds.
+
+        This returns straight away, the output is turned off in the background by the
+        :class:`PulseScheduler` ``europi.pulses``, which is started by the first trigger. Calling
+        ``trigger()`` again before the pulse ends restarts the pulse. The output is turned off at
+        the end of the pulse even if its voltage was changed in the meantime.
+        """
+        if self._pulses is None:
+            raise ValueError("Output is not driven by a PulseScheduler")
+        self._pulses.trigger(self._pulse_index, duration_ms)
+
     def toggle(self):
         """Invert the Output's current state."""
         if self._duty > 500:
@@ -559,6 +1793,207 @@ class Output:
             self.off()
 
 
+class Outputs(list):
+    """A list of :class:`Output` instances with methods for updating them all at once.
+
+    ``cvs`` is an instance of this class, so all six outputs can be updated in a single call::
+
+        cvs.set_voltages([1, 2.5, 3, 4, 5, 6])
+
+    Outputs whose duty cycle would not change are not written to. A value of ``None`` leaves
+    the corresponding output untouched. Any outputs beyond the end of the given values are also
+    left untouched.
+    """
+
+    def set_voltages(self, voltages):
+        """Set the voltage of each output to the corresponding value, in volts."""
+        for index in range(min(len(voltages), len(self))):
+            voltage = voltages[index]
+            if voltage is not None:
+                self[index].voltage(voltage)
+
+    def set_millivolts(self, millivolts):
+        """Set the voltage of each output to the corresponding integer number of millivolts."""
+        for index in range(min(len(millivolts), len(self))):
+            value = millivolts[index]
+            if value is not None:
+                self[index].voltage_mv(value)
+
+
+class PulseScheduler:
+    """Ends the trigger pulses of a set of outputs from a single hardware timer.
+
+    Each output has an entry in a preallocated table holding the ``ticks_ms`` at which its pulse
+    ends. The timer checks the table and turns off the outputs whose pulses are over, so starting
+    a pulse neither blocks nor allocates memory. The timer only runs while there are pulses to
+    end, it is started by :meth:`trigger` and stops itself once the last pulse is over. The outputs are usually triggered with
+    :meth:`Output.trigger` rather than through the scheduler.
+
+    A scheduler for all six outputs is available as ``europi.pulses``, so this class does not need
+    to be used by user scripts.
+
+    :param outputs: the :class:`Output` instances to drive
+    :param freq: the number of times per second the pulses are checked, which sets their
+        resolution
+    """
+
+    def __init__(self, outputs, freq=DEFAULT_PULSE_FREQ):
+        self.outputs = outputs
+        self.freq = freq
+        self._deadlines = array("l", [0] * len(outputs))
+        self._active = bytearray(len(outputs))
+        self._timer = None
+        self._running = False
+        for index, output in enumerate(outputs):
+            output._pulses = self
+            output._pulse_index = index
+
+    @property
+    def running(self):
+        """True if the scheduler is currently ending pulses."""
+        return self._running
+
+    def start(self):
+        """Start checking for the end of pulses in the background."""
+        if self._running:
+            return
+        if self._timer is None:
+            self._timer = Timer()
+        self._running = True
+        self._timer.init(mode=Timer.PERIODIC, freq=self.freq, callback=self._tick)
+
+    def stop(self):
+        """Stop checking for the end of pulses, and turn off the outputs in the middle of one."""
+        if self._running:
+            self._timer.deinit()
+            self._running = False
+        for index in range(len(self._active)):
+            if self._active[index]:
+                self._active[index] = 0
+                self.outputs[index].off()
+
+    def trigger(self, index, duration_ms):
+        """Turn on the output at ``index`` and turn it off after ``duration_ms`` milliseconds."""
+        # Deactivate the entry while it changes, so the timer never sees a new pulse with an old
+        # deadline.
+        self._active[index] = 0
+        self._deadlines[index] = ticks_add(ticks_ms(), duration_ms)
+        self.outputs[index].on()
+        self._active[index] = 1
+        self.start()
+
+    def active(self, index):
+        """Return True if the output at ``index`` is in the middle of a pulse."""
+        return self._active[index] == 1
+
+    def _tick(self, timer):
+        # Timer callback, must not allocate.
+        now = ticks_ms()
+        active = self._active
+        pending = False
+        for index in range(len(active)):
+            if active[index]:
+                if ticks_diff(self._deadlines[index], now) <= 0:
+                    active[index] = 0
+                    self.outputs[index].off()
+                else:
+                    pending = True
+        if not pending:
+            self._timer.deinit()
+            self._running = False
+
+
+class AnalogueSnapshot:
+    """A single reading of an :class:`AnalogueReader`, taken by :func:`snapshot`, with the same
+    methods as the reader. None of the methods read the ADC, they all use the same reading.
+
+    ``read_voltage()`` and ``read_millivolts()`` are only available on the snapshot of ``ain``.
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+        self.raw = 0
+
+    def capture(self, samples=None):
+        """Take a new reading from the reader."""
+        self.raw = self._reader._sample_adc(samples)
+
+    def percent(self):
+        """See :meth:`AnalogueReader.percent`."""
+        return self._reader._percent(self.raw)
+
+    def read_u16_filtered(self):
+        """See :meth:`AnalogueReader.read_u16_filtered`."""
+        return self._reader._u16(self.raw)
+
+    def range(self, steps=100):
+        """See :meth:`AnalogueReader.range_int`."""
+        return (self._reader._u16(self.raw) * steps) >> 16
+
+    def read_position(self, steps=100):
+        """See :meth:`Knob.read_position`."""
+        return self.range(steps)
+
+    def choice(self, values):
+        """See :meth:`AnalogueReader.choice`."""
+        return values[self.range(len(values))]
+
+    def read_voltage(self):
+        """See :meth:`AnalogueInput.read_voltage`."""
+        return self._reader._millivolts[self.raw >> ADC_SHIFT] / 1000
+
+    def read_millivolts(self):
+        """See :meth:`AnalogueInput.read_millivolts`."""
+        return self._reader._millivolts[self.raw >> ADC_SHIFT]
+
+
+class Snapshot:
+    """The state of all of the inputs at one moment, see :func:`snapshot`."""
+
+    def __init__(self, ain, k1, k2, din, b1, b2):
+        self.ain = AnalogueSnapshot(ain)
+        self.k1 = AnalogueSnapshot(k1)
+        self.k2 = AnalogueSnapshot(k2)
+        self._digital_readers = (din, b1, b2)
+        self.din = 0
+        self.b1 = 0
+        self.b2 = 0
+
+    def read(self, samples=None):
+        """Read every input once, returning this snapshot."""
+        self.ain.capture(samples)
+        self.k1.capture(samples)
+        self.k2.capture(samples)
+        din, b1, b2 = self._digital_readers
+        self.din = din.value()
+        self.b1 = b1.value()
+        self.b2 = b2.value()
+        return self
+
+
+def snapshot(samples=None):
+    """Read ``ain``, ``k1``, ``k2``, ``din``, ``b1`` and ``b2`` once each, and return the readings.
+
+    Scripts that use the same input several times per loop can take a snapshot at the start of the
+    loop instead, so that the ADC is only read once per input and every part of the loop sees the
+    same values::
+
+        while True:
+            inputs = snapshot()
+            x = inputs.k1.percent()
+            division = inputs.k2.choice([1, 2, 4, 8])
+            if inputs.din:
+                ...
+
+    The analogue readings have the same methods as ``ain``, ``k1`` and ``k2``, and the digital
+    readings are the values of ``din``, ``b1`` and ``b2``. The same object is reused by every call,
+    so readings from one snapshot are replaced by the next.
+
+    :param samples: the number of ADC samples to average for each analogue input
+    """
+    return _snapshot.read(samples)
+
+
 ## Initialize EuroPi global singleton instance variables.
 
 europi_config = load_europi_config()
@@ -571,14 +2006,22 @@ k2 = Knob(28)
 b1 = Button(4)
 b2 = Button(5)
 
-oled = Display(0, 1)
+_snapshot = Snapshot(ain, k1, k2, din, b1, b2)
+
+oled = Display(0, 1, max_fps=europi_config["display_max_fps"])
 cv1 = Output(21)
 cv2 = Output(20)
 cv3 = Output(16)
 cv4 = Output(17)
 cv5 = Output(18)
 cv6 = Output(19)
-cvs = [cv1, cv2, cv3, cv4, cv5, cv6]
+cvs = Outputs([cv1, cv2, cv3, cv4, cv5, cv6])
+
+# Ends the pulses started by Output.trigger().
+pulses = PulseScheduler(cvs)
+
+# Opt-in background sampling of the analogue inputs, see BackgroundSampler.
+sampler = BackgroundSampler([ain, k1, k2])
 
 usb_connected = DigitalReader(24, 0)
 
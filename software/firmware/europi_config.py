@@ -6,6 +6,12 @@ from configuration import ConfigFile, ConfigSpec
 PICO_DEFAULT_CPU_FREQ = 125_000_000
 OVERCLOCKED_CPU_FREQ = 250_000_000
 
+# Maximum display refresh rate, 0 means unlimited.
+DEFAULT_DISPLAY_MAX_FPS = 30
+
+# Filters applied to every reading of the analogue input and knobs, see europi.INPUT_FILTERS.
+INPUT_FILTER_CHOICES = ["none", "ema", "moving_average", "median", "slew"]
+
 
 class EuroPiConfig:
     """This class provides EuroPi's global config points."""
@@ -19,6 +25,13 @@ class EuroPiConfig:
                 choices=[PICO_DEFAULT_CPU_FREQ, OVERCLOCKED_CPU_FREQ],
                 default=OVERCLOCKED_CPU_FREQ,
             ),
+            configuration.choice(
+                name="display_max_fps",
+                choices=[0, 10, 15, 20, 25, 30, 60],
+                default=DEFAULT_DISPLAY_MAX_FPS,
+            ),
+            configuration.choice(name="ain_filter", choices=INPUT_FILTER_CHOICES, default="none"),
+            configuration.choice(name="knob_filter", choices=INPUT_FILTER_CHOICES, default="none"),
         ]
 
 
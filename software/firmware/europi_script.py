@@ -34,6 +34,25 @@ class EuroPiScript:
 
     To include your script in the menu it must be added to the ``EUROPI_SCRIPTS`` list in ``contrib/menu.py``.
 
+    **Async Scripts**
+
+    ``main()`` may instead be an ``async def``, in which case it is run in the ``uasyncio`` event
+    loop by ``run()``, which the menu calls for every script. The guard should then call ``run()``
+    rather than ``main()``::
+
+       class HelloAsync(EuroPiScript):
+           async def main(self):
+               uasyncio.create_task(self.blink())
+               while True:
+                   await din.rising()
+                   cv1.trigger()
+
+       if __name__ == "__main__":
+           HelloAsync().run()
+
+    Inputs and buttons can be awaited with ``await din.rising()`` or ``await b1.pressed()``, and
+    the display sent with ``await oled.flush()``, see ``europi``.
+
     **Save/Load Script State**
 
     Optionally, you can add a bit of code to enable your script to save state, and load previous state at startup. By default, when exiting the script to menu selection, ``save_state()`` will be called. Additionally, you can add calls to ``save_state()`` whenever state changes.
@@ -142,6 +161,15 @@ class EuroPiScript:
         """Override this method with your script's main loop method."""
         raise NotImplementedError
 
+    def run(self):
+        """Run ``main()``, in the ``uasyncio`` event loop if it is an ``async def``."""
+        result = self.main()
+        if result is not None and hasattr(result, "send"):
+            # Only async scripts pay for loading uasyncio
+            import uasyncio
+
+            uasyncio.run(result)
+
     @classmethod
     def display_name(cls) -> str:
         """Returns the string used to identify this script in the Menu. Defaults to the class name. Override it if you
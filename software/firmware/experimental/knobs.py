@@ -1,5 +1,5 @@
 from collections import OrderedDict
-from europi import Knob, MAX_UINT16
+from europi import Knob, MAX_UINT16, configure_filter, europi_config
 
 DEFAULT_THRESHOLD = 0.05
 
@@ -25,6 +25,9 @@ class LockableKnob(Knob):
         lockable_knob.lock()
         internal_rep = lockable_knob.value
 
+    Like ``k1`` and ``k2``, readings are passed through the ``knob_filter`` of the EuroPi
+    configuration.
+
     :param knob: The knob to wrap.
     :param initial_uint16_value: The UINT16 (0-`europi.MAXINT16`) value to lock the knob at. If a value is provided the new knob is locked, otherwise it is unlocked.
     :param initial_percentage_value: The percentage (as a decimal 0-1) value to lock the knob at. If a value is provided the new knob is locked, otherwise it is unlocked.
@@ -44,12 +47,13 @@ class LockableKnob(Knob):
     ):
         super().__init__(knob.pin_id)
         self.pin = knob.pin  # Share the ADC
+        configure_filter(self, europi_config["knob_filter"])
 
         if initial_uint16_value != None:
-            self.value = initial_uint16_value
+            self.value = int(initial_uint16_value)
             self.state = LockableKnob.STATE_LOCKED
         elif initial_percentage_value != None:
-            self.value = (1 - initial_percentage_value) * MAX_UINT16
+            self.value = int((1 - initial_percentage_value) * MAX_UINT16)
             self.state = LockableKnob.STATE_LOCKED
         else:
             self.value = MAX_UINT16  # Min value
@@ -88,6 +92,8 @@ class LockableKnob(Knob):
         before the knob unlocks, the unlock is aborted.
         """
         if self.state == LockableKnob.STATE_LOCKED:
+            # Forget the readings from before the knob was locked
+            self.reset_filters()
             self.state = LockableKnob.STATE_UNLOCK_REQUESTED
 
 
@@ -182,6 +188,12 @@ class KnobBank:
     def current_name(self) -> str:
         return self.names[self.index]
 
+    def poll(self, samples=None):
+        """Poll the currently active knob, calling its :meth:`~europi.Knob.on_change()` callback if
+        its position has changed. Locked knobs never change, so only the active knob's callback can
+        be called, and only once it has been unlocked."""
+        return self.current.poll(samples)
+
     def next(self):  # potential race condition: next() and _sample_adc() can both change state
         """Select the next knob by locking the current knob, and requesting an unlock on the next in
         the bank."""
@@ -0,0 +1,167 @@
+"""Runs garbage collection between clock edges rather than in the middle of them.
+
+MicroPython collects garbage when an allocation finds the heap full, or has allocated more than the
+``gc.threshold()``, wherever the script happens to be at the time. A collection pauses everything,
+including pin IRQ handlers, for several milliseconds, so one that lands just before a clock edge
+makes that edge's triggers late. A :class:`GCManager` instead collects while there is time to spare
+before the next edge, as predicted by a :class:`clock_tracker.ClockTracker`, so that the heap rarely
+fills up at the wrong moment::
+
+    from europi import *
+    from clock_tracker import ClockTracker
+    from gc_manager import GCManager
+
+    gc_manager = GCManager(ClockTracker(din))
+
+    while True:
+        ...  # draw the display, read the knobs
+        gc_manager.idle()
+
+Work that must not be interrupted can be run in a critical section, during which the threshold is
+raised to the free heap, so that only a full heap causes a collection::
+
+    with gc_manager.critical():
+        ...  # send a burst of triggers
+
+The duration of every collection the manager runs is measured, and kept in ``last_pause_us``,
+``max_pause_us`` and ``total_pause_us``, so scripts can check how long they are paused for.
+"""
+import gc
+
+from utime import ticks_diff, ticks_us
+
+# The time a collection is expected to take, before one has been measured.
+DEFAULT_PAUSE_US = 5000
+
+# A collection is only started if the next edge is due at least this long after the collection is
+# expected to end.
+DEFAULT_MARGIN_US = 1000
+
+# Collections are only started once this many bytes have been allocated since the last one, as
+# each collection takes about as long however little garbage there is.
+DEFAULT_MIN_ALLOC = 4096
+
+
+class GCManager:
+    """Collects garbage in the slack between the edges of a clock.
+
+    :param tracker: the :class:`clock_tracker.ClockTracker` that predicts the next edge, or None to
+        collect whenever enough has been allocated. Its edges must be timed with ``ticks_us()``, as
+        they are when it tracks a :class:`europi.DigitalReader`, rather than by an
+        :class:`edge_capture.EdgeCapture`, otherwise use :meth:`collect_before`.
+    :param threshold: if given, passed to ``gc.threshold()``, so that collections happen before the
+        heap is full, outside of critical sections
+    :param margin_us: how long, in microseconds, before the next edge a collection must end
+    :param min_alloc: the number of bytes that must be allocated between collections
+    """
+
+    def __init__(
+        self,
+        tracker=None,
+        threshold=None,
+        margin_us=DEFAULT_MARGIN_US,
+        min_alloc=DEFAULT_MIN_ALLOC,
+    ):
+        self.tracker = tracker
+        self.margin_us = margin_us
+        self.min_alloc = min_alloc
+        if threshold is not None:
+            gc.threshold(threshold)
+        self._depth = 0
+        self._saved_threshold = -1
+        self._alloc_after_collect = gc.mem_alloc()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the collection statistics:
+
+        * ``collections``: the number of collections run by the manager
+        * ``late_collections``: the number of collections that ended after the next edge was due
+        * ``last_pause_us``: the duration of the last collection, in microseconds
+        * ``max_pause_us``: the duration of the longest collection, in microseconds
+        * ``total_pause_us``: the total duration of the collections, in microseconds
+        """
+        self.collections = 0
+        self.late_collections = 0
+        self.last_pause_us = 0
+        self.max_pause_us = 0
+        self.total_pause_us = 0
+
+    def critical(self):
+        """Return a context manager which holds off collections caused by ``gc.threshold()`` until
+        it exits, by raising the threshold to at least the free heap and restoring the previous
+        threshold on exit. Critical sections can be nested.
+
+        A collection still happens if the heap fills up, which :meth:`idle` makes unlikely.
+        """
+        return self
+
+    def __enter__(self):
+        if not self._depth:
+            self._saved_threshold = gc.threshold()
+            gc.threshold(max(self._saved_threshold, gc.mem_free()))
+        self._depth += 1
+        return self
+
+    def __exit__(self, *args):
+        self._depth -= 1
+        if not self._depth:
+            gc.threshold(self._saved_threshold)
+
+    @property
+    def in_critical(self):
+        """True while in a critical section."""
+        return self._depth > 0
+
+    def expected_pause_us(self):
+        """Return how long, in microseconds, the next collection is expected to take."""
+        return self.max_pause_us or DEFAULT_PAUSE_US
+
+    def collect(self, deadline=None):
+        """Collect garbage now and measure the pause.
+
+        :param deadline: the ``ticks_us`` of the next edge, if known, used to count late collections
+        """
+        start = ticks_us()
+        gc.collect()
+        end = ticks_us()
+        pause = ticks_diff(end, start)
+        self._alloc_after_collect = gc.mem_alloc()
+        self.collections += 1
+        self.last_pause_us = pause
+        self.total_pause_us += pause
+        if pause > self.max_pause_us:
+            self.max_pause_us = pause
+        if deadline is not None and ticks_diff(end, deadline) > 0:
+            self.late_collections += 1
+
+    def collect_before(self, deadline):
+        """Collect garbage if enough has been allocated since the last collection and it is
+        expected to end at least ``margin_us`` before the ``ticks_us`` deadline.
+
+        Returns True if garbage was collected.
+        """
+        if self._depth or gc.mem_alloc() - self._alloc_after_collect < self.min_alloc:
+            return False
+        slack = ticks_diff(deadline, ticks_us())
+        if slack < self.expected_pause_us() + self.margin_us:
+            return False
+        self.collect(deadline)
+        return True
+
+    def idle(self):
+        """Collect garbage if enough has been allocated since the last collection and the tracker
+        predicts enough time before the next edge. If there is no tracker, or its clock has
+        stopped, garbage is collected whenever enough has been allocated.
+
+        Call this from the script's main loop. Returns True if garbage was collected.
+        """
+        tracker = self.tracker
+        if tracker is not None and tracker.period_us():
+            since_edge = ticks_diff(ticks_us(), tracker.last_edge_us)
+            if since_edge <= tracker.timeout_us:
+                return self.collect_before(tracker.next_edge_us())
+        if self._depth or gc.mem_alloc() - self._alloc_after_collect < self.min_alloc:
+            return False
+        self.collect()
+        return True
@@ -0,0 +1,54 @@
+"""Draws 1-bit icons stored in ``bytes``, such as those in the generated ``icons`` module.
+
+Icons are kept in ``bytes`` rather than ``bytearray`` so that, when the firmware is frozen, they
+stay in flash instead of being copied into RAM. To add an icon, add its image to
+``software/icons`` and run ``scripts/generate_icons.py``.
+"""
+from framebuf import FrameBuffer, MONO_HLSB
+
+
+class IconAtlas:
+    """A group of equally sized 1-bit icons packed one after another into a single ``bytes``
+    object, in ``MONO_HLSB`` format.
+
+    Drawing an icon copies it into a small scratch buffer and blits it, which is a lot cheaper
+    than drawing it pixel by pixel::
+
+        from icons import LFO_SHAPES
+
+        LFO_SHAPES.blit(oled, 2, x=3, y=23)  # draw the third icon
+
+    :param data: the packed icons
+    :param width: the width of each icon, in pixels
+    :param height: the height of each icon, in pixels
+    """
+
+    def __init__(self, data, width, height):
+        self.width = width
+        self.height = height
+        self.icon_bytes = ((width + 7) // 8) * height
+        if len(data) % self.icon_bytes:
+            raise ValueError(f"Icon data is not a whole number of {width}x{height} icons")
+        self._data = memoryview(data)
+        self._scratch = bytearray(self.icon_bytes)
+        self._icon = FrameBuffer(self._scratch, width, height, MONO_HLSB)
+
+    def __len__(self):
+        return len(self._data) // self.icon_bytes
+
+    def blit(self, display, index, x, y, colour=1):
+        """Draw the icon at ``index`` with its top left corner at (``x``, ``y``). Only the icon's
+        set pixels are drawn, in the given colour, the rest are transparent."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Icon index {index} out of range")
+        start = index * self.icon_bytes
+        self._scratch[:] = self._data[start : start + self.icon_bytes]
+        if colour:
+            display.blit(self._icon, x, y, 0)
+        else:
+            self._invert_scratch()
+            display.blit(self._icon, x, y, 1)
+
+    def _invert_scratch(self):
+        for i in range(self.icon_bytes):
+            self._scratch[i] ^= 0xFF
@@ -0,0 +1,49 @@
+"""1-bit icons and images, generated from the images in ``software/icons`` by
+``scripts/generate_icons.py``. Do not edit this file by hand, edit the images and regenerate it.
+
+The data is stored in ``bytes`` literals, which stay in flash when the firmware is frozen, see
+:class:`icon_atlas.IconAtlas`.
+"""
+from icon_atlas import IconAtlas
+
+
+# lfo_sine, lfo_saw, lfo_square, lfo_off, lfo_random, lfo_noise
+LFO_SHAPES = IconAtlas(
+    (
+        b"\x18\x04\x24\x04\x42\x04\x42\x08\x42\x08\x41\x08\x81\x08\x80\x90\x80\x60\x00\x00\x02\x08"
+        b"\x06\x18\x0a\x28\x12\x48\x12\x48\x22\x88\x43\x08\x82\x08\x00\x00\xfe\x08\x82\x08\x82\x08"
+        b"\x82\x08\x82\x08\x82\x08\x82\x08\x83\xf8\x00\x00\x80\x08\x60\x30\x18\xc0\x05\x00\x07\x00"
+        b"\x18\xc0\x60\x30\x80\x08\x00\x00\x00\x80\x01\x40\x31\x20\x49\x20\x46\x10\x80\x10\x00\x0c"
+        b"\x00\x00\x50\x40\x42\x88\x18\x60\x85\x10\x02\x04\x00\x10\x29\x20\x84\x84\x20\x08"
+    ),
+    14,
+    9,
+)
+
+
+# bootsplash
+BOOTSPLASH = (
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x80\x60\x10\x10\x08"
+    b"\x08\x08\x08\x10\x20\x40\xbc\x42\x41\x41\x41\x01\x01\x02\x0c\x10\x20\xc0\x00\x00\x00\x00\x00"
+    b"\x00\x80\xe0\x30\x10\x18\x18\x10\x30\xe0\xc0\x00\x00\x00\xf0\xf0\x00\x00\x00\x00\x00\xf0\xf0"
+    b"\x00\x00\x00\xf0\x60\x10\x10\x10\x00\xe0\x30\x10\x08\x08\x08\x10\x30\xe0\x00\x00\x00\xf0\x70"
+    b"\x10\x08\x08\x08\x10\x30\xe0\x00\x00\x00\xf3\xf3\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\xbf\x50\x28\xa4\x92\x4a\x49\xc5\x02\x80\x80\xff\x00\x03\x04\x08"
+    b"\x63\xa5\x25\x45\x89\x8a\x0a\x13\x12\xe0\x00\x00\x00\x00\x03\x0f\x09\x11\x11\x11\x11\x09\x09"
+    b"\x00\x00\x00\x00\x07\x0f\x08\x10\x10\x10\x08\x0f\x07\x00\x00\x00\x1f\x00\x00\x00\x00\x00\x07"
+    b"\x0c\x08\x10\x10\x10\x08\x0c\x07\x00\x00\x00\xff\xfc\x08\x10\x10\x10\x08\x0c\x07\x00\x00\x00"
+    b"\x1f\x1f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x07\x64\x92\x09"
+    b"\x24\x12\x0a\x05\x02\x01\x00\xdf\x20\x20\xcc\x12\x64\x88\x10\x21\x42\x84\x88\x09\xf2\x04\x07"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x03\x04\x08\x10\x20\x40\x48\x86\x81\x80\x40"
+    b"\x40\x20\x10\x09\x06\x00\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00"
+)
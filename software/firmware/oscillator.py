@@ -0,0 +1,131 @@
+"""Wavetable oscillators for generating LFOs and other periodic control voltages.
+
+Each :class:`Oscillator` keeps its position in the waveform as an integer phase accumulator and
+looks its value up in a precomputed table, so producing a value costs one table lookup and a
+linear interpolation, with no trigonometry or floating point math::
+
+    from europi import *
+    from oscillator import Oscillator, SINE, cycles_per_step
+
+    lfo = Oscillator(SINE)
+    lfo.increment = cycles_per_step(0.5, 1000)  # 0.5Hz when stepped 1000 times per second
+
+    while True:
+        cv1.voltage_mv(lfo.step())
+        sleep_ms(1)
+
+Phases and increments are fixed point numbers where ``PHASE_ONE`` is one full cycle of the
+waveform. Integer math on them does not allocate, so oscillators can be stepped from timer
+callbacks, such as those of a :class:`control_rate.ControlRate` engine.
+"""
+from array import array
+from math import cos, pi
+
+import micropython
+
+TABLE_BITS = 8
+TABLE_SIZE = 1 << TABLE_BITS
+TABLE_MAX = 0xFFFF
+
+PHASE_BITS = 24
+PHASE_ONE = 1 << PHASE_BITS
+PHASE_MASK = PHASE_ONE - 1
+
+# The top TABLE_BITS of the phase select the table entry, the next 8 bits interpolate to the next.
+INDEX_SHIFT = PHASE_BITS - TABLE_BITS
+FRACTION_SHIFT = INDEX_SHIFT - 8
+
+SMOOTH_RANDOM_POINTS = 32
+SMOOTH_RANDOM_SEED = 0x5EED
+
+
+def make_table(function):
+    """Return a wavetable built from a function mapping a position in the cycle, from 0 to 1, to
+    a value from 0 to 1.
+
+    The table has one extra entry, a copy of the first, so that interpolating from the last entry
+    does not need to wrap around.
+    """
+    table = array("H", [0] * (TABLE_SIZE + 1))
+    for i in range(TABLE_SIZE):
+        table[i] = round(min(max(function(i / TABLE_SIZE), 0), 1) * TABLE_MAX)
+    table[TABLE_SIZE] = table[0]
+    return table
+
+
+def _smooth_random(points, seed):
+    # Cosine interpolation between a fixed sequence of pseudo random points, so that the table is
+    # the same on every boot. A local generator avoids reseeding the random module.
+    values = []
+    for _ in range(points):
+        seed = (seed * 1103515245 + 12345) & 0x7FFFFFFF
+        values.append(seed / 0x7FFFFFFF)
+
+    def function(position):
+        position *= points
+        i = int(position)
+        blend = (1 - cos((position - i) * pi)) / 2
+        return values[i] + (values[(i + 1) % points] - values[i]) * blend
+
+    return function
+
+
+SINE = make_table(lambda position: (1 - cos(position * 2 * pi)) / 2)
+SAW = make_table(lambda position: position)
+TRIANGLE = make_table(lambda position: 1 - abs(1 - 2 * position))
+SQUARE = make_table(lambda position: 1 if position < 0.5 else 0)
+SMOOTH_RANDOM = make_table(_smooth_random(SMOOTH_RANDOM_POINTS, SMOOTH_RANDOM_SEED))
+
+
+def cycles_per_step(frequency, steps_per_second):
+    """Return the increment that makes an oscillator stepped ``steps_per_second`` times a second
+    run at ``frequency`` Hz.
+
+    This uses floating point math, so calculate increments when a setting changes rather than on
+    every step.
+    """
+    return int(frequency / steps_per_second * PHASE_ONE) & PHASE_MASK
+
+
+class Oscillator:
+    """An oscillator reading a wavetable with an integer phase accumulator.
+
+    The sine, saw and triangle waves start at their lowest value and rise, the square wave starts
+    at its highest value and falls half way through the cycle. Their values range from 0 to ``max_mv`` millivolts, which should be at most 16383 to keep the math
+    within MicroPython's small integers.
+
+    :param table: the wavetable, one of ``SINE``, ``SAW``, ``TRIANGLE``, ``SQUARE`` or
+        ``SMOOTH_RANDOM``, or a table returned by :func:`make_table`
+    :param increment: the phase added by each :meth:`step`, where ``PHASE_ONE`` is a full cycle
+    :param max_mv: the value at the top of the waveform, in millivolts
+    """
+
+    def __init__(self, table=SINE, increment=0, max_mv=10000):
+        self.table = table
+        self.increment = increment
+        self.max_mv = max_mv
+        self.phase = 0
+
+    def reset(self):
+        """Return to the start of the waveform."""
+        self.phase = 0
+
+    def advance(self, delta):
+        """Move the phase forward by ``delta``, where ``PHASE_ONE`` is a full cycle."""
+        self.phase = (self.phase + delta) & PHASE_MASK
+
+    def step(self):
+        """Advance the phase by one increment, and return the new value in millivolts."""
+        self.phase = (self.phase + self.increment) & PHASE_MASK
+        return self.value()
+
+    @micropython.native
+    def value(self):
+        """Return the value at the current phase, in millivolts."""
+        phase = self.phase
+        index = phase >> INDEX_SHIFT
+        fraction = (phase >> FRACTION_SHIFT) & 0xFF
+        table = self.table
+        low = table[index]
+        sample = low + (((table[index + 1] - low) * fraction) >> 8)
+        return (sample * self.max_mv) >> 16
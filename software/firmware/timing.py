@@ -0,0 +1,122 @@
+"""Runs periodic work on time, with absolute deadlines that do not drift.
+
+A loop that sleeps for its period after doing its work runs slow by however long the work took,
+which is why tempos set that way need per-device compensation. A :class:`Ticker` instead keeps the
+``ticks_us`` deadline of each tick, and moves it on by exactly one period every tick, so the time
+spent working is absorbed and the average period is exact::
+
+    from europi import *
+    from timing import Ticker
+
+    ticker = Ticker(period_us=125_000)  # 16th notes at 120 BPM
+
+    while True:
+        ticker.wait()
+        cv1.trigger()
+        ...  # other work, as long as it takes less than a period
+
+:func:`wait_until` sleeps rather than spinning, so the CPU is idle while waiting. It sleeps with
+``utime.sleep_ms()`` and ``machine.idle()``, which wait for the next interrupt, rather than
+``machine.lightsleep()``, which stops the clocks that drive the outputs' PWM.
+
+In a ``uasyncio`` script, ``await ticker.wait_async()`` lets other tasks run while waiting.
+"""
+from machine import idle
+from utime import sleep_ms, ticks_add, ticks_diff, ticks_us
+
+# wait_until() sleeps until this long before the deadline, then idles until the deadline, as
+# sleep_ms() can overshoot by up to a millisecond.
+SLEEP_MARGIN_US = 2000
+
+
+def wait_until(deadline):
+    """Wait until ``ticks_us()`` reaches ``deadline``, and return how late, in microseconds, the
+    wait returned. If the deadline has already passed, return straight away."""
+    remaining = ticks_diff(deadline, ticks_us())
+    if remaining > SLEEP_MARGIN_US:
+        sleep_ms((remaining - SLEEP_MARGIN_US) // 1000)
+    late = ticks_diff(ticks_us(), deadline)
+    while late < 0:
+        idle()
+        late = ticks_diff(ticks_us(), deadline)
+    return late
+
+
+class Ticker:
+    """Ticks at a fixed period, measured from the first tick rather than from each wait.
+
+    The period can be changed at any time, and applies from the last tick. If a tick is more than
+    a whole period late, the ticks that were missed are skipped rather than run in a burst, and
+    counted in ``missed``. The lateness of the last tick is kept in ``late_us`` and the greatest
+    lateness in ``max_late_us``, so scripts can check that they keep up.
+
+    :param period_us: the time between ticks, in microseconds
+    """
+
+    def __init__(self, period_us):
+        self.period_us = period_us
+        self.reset()
+
+    def reset(self, immediate=False):
+        """Start ticking afresh from now, and clear the lateness statistics.
+
+        :param immediate: if True the first tick is due now, otherwise it is due in one period
+        """
+        self._last_tick = ticks_us()
+        if immediate:
+            self._last_tick = ticks_add(self._last_tick, -self.period_us)
+        self.late_us = 0
+        self.max_late_us = 0
+        self.missed = 0
+
+    def deadline(self):
+        """Return the ``ticks_us`` at which the next tick is due."""
+        return ticks_add(self._last_tick, self.period_us)
+
+    def due(self):
+        """Return True, and tick, if the next tick is due, otherwise return False straight away."""
+        late = ticks_diff(ticks_us(), self.deadline())
+        if late < 0:
+            return False
+        self._tick(late)
+        return True
+
+    def wait(self, timeout_us=None):
+        """Wait for the next tick, then return True.
+
+        :param timeout_us: if given, wait at most this long, and return False if the tick did not
+            come in time
+        """
+        deadline = self.deadline()
+        if timeout_us is not None:
+            limit = ticks_add(ticks_us(), timeout_us)
+            if ticks_diff(limit, deadline) < 0:
+                wait_until(limit)
+                return False
+        self._tick(wait_until(deadline))
+        return True
+
+    async def wait_async(self):
+        """Wait for the next tick, from a ``uasyncio`` task, then return True.
+
+        Other tasks run until shortly before the tick is due, the rest of the wait is the same as
+        :meth:`wait`, so the tick is as punctual as long as the other tasks yield often enough.
+        """
+        import uasyncio
+
+        remaining = ticks_diff(self.deadline(), ticks_us())
+        if remaining > SLEEP_MARGIN_US:
+            await uasyncio.sleep_ms((remaining - SLEEP_MARGIN_US) // 1000)
+        self._tick(wait_until(self.deadline()))
+        return True
+
+    def _tick(self, late):
+        self.late_us = late
+        if late > self.max_late_us:
+            self.max_late_us = late
+        self._last_tick = self.deadline()
+        period = self.period_us
+        if 0 < period <= late:
+            skipped = late // period
+            self.missed += skipped
+            self._last_tick = ticks_add(self._last_tick, skipped * period)
@@ -1,6 +1,8 @@
 """This module provides reusable UI components.
 """
-from europi import CHAR_HEIGHT, CHAR_WIDTH, b1, k1, oled
+from array import array
+
+from europi import CHAR_HEIGHT, CHAR_WIDTH, OLED_HEIGHT, OLED_WIDTH, b1, clamp, k1, oled
 
 
 class Menu:
@@ -31,20 +33,134 @@ class Menu:
     @property
     def selected(self):
         """The currently selected menu item."""
-        return self.select_knob.read_position(steps=len(self.items) - 1)
+        return self.select_knob.read_stable_position(steps=len(self.items) - 1)
 
     def _inverted_text(self, s, x, y):
         """displays the given text with an inverted background"""
         oled.fill_rect(x, y - 1, CHAR_WIDTH * len(s), CHAR_HEIGHT + 2, 1)
-        oled.text(s, x, y, 0)
+        oled.cached_text(s, x, y, 0)
+
+    def draw_menu(self, current=None):
+        """This function should be called by your script's main loop in order to display and refresh the menu.
 
-    def draw_menu(self):
-        """This function should be called by your script's main loop in order to display and refresh the menu."""
-        current = self.selected
+        :param current: the selected menu item, if it has already been read from ``selected``
+        """
+        if current is None:
+            current = self.selected
         oled.fill(0)
-        oled.text(f"{self.items[current - 1]}", 2, 3, 1)
+        oled.cached_text(f"{self.items[current - 1]}", 2, 3, 1)
         self._inverted_text(f"{self.items[current]}", 2, 13)
         if current != len(self.items) - 2:
             # don't show the title at the bottom of the menu
-            oled.text(f"{self.items[current + 1]}", 2, 23, 1)
+            oled.cached_text(f"{self.items[current + 1]}", 2, 23, 1)
         oled.show()
+
+
+class Plot:
+    """A scrolling plot of one or more traces, such as an oscilloscope view or the recent history
+    of some CVs. The newest sample is drawn in the rightmost column.
+
+    Samples are stored in preallocated ring buffers holding one value per column, so adding a
+    sample is cheap and does not touch the display. :meth:`draw` renders the whole visible window
+    in one pass and only needs to be called once per frame, independently of how often samples
+    are added::
+
+        plot = Plot(traces=2, max_value=10)
+
+        while True:
+            plot.add(cv1_volts, cv2_volts)
+            if frame_due:
+                plot.draw()
+                oled.show()
+
+    :param traces: the number of traces
+    :param min_value: the value drawn at the bottom of the plot
+    :param max_value: the value drawn at the top of the plot, values outside of the range are
+        drawn at the edges
+    :param x: the left edge of the plot on the display
+    :param y: the top edge of the plot on the display
+    :param width: the width of the plot, which is also the number of samples shown
+    :param height: the height of the plot
+    :param decimation: only one of every ``decimation`` samples added is plotted
+    :param connected: draw vertical lines joining consecutive points rather than single pixels
+    """
+
+    def __init__(
+        self,
+        traces=1,
+        min_value=0,
+        max_value=1,
+        x=0,
+        y=0,
+        width=OLED_WIDTH,
+        height=OLED_HEIGHT,
+        decimation=1,
+        connected=False,
+    ):
+        self.traces = traces
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.decimation = decimation
+        self.connected = connected
+        self.visible = [True] * traces
+        self._samples = [array("f", [0] * width) for _ in range(traces)]
+        self._head = 0  # the column the next sample will be written to
+        self._count = 0
+        self._skipped = 0
+        self.set_range(min_value, max_value)
+
+    def set_range(self, min_value, max_value):
+        """Change the range of values shown. This also applies to the samples already added."""
+        self.min_value = min_value
+        self.max_value = max_value
+        self._scale = (self.height - 1) / (max_value - min_value)
+
+    def add(self, *values):
+        """Add a sample, with one value per trace."""
+        self._skipped += 1
+        if self._skipped < self.decimation:
+            return
+        self._skipped = 0
+        head = self._head
+        for trace in range(self.traces):
+            self._samples[trace][head] = values[trace]
+        head += 1
+        self._head = 0 if head == self.width else head
+        if self._count < self.width:
+            self._count += 1
+
+    def clear(self):
+        """Remove all of the samples."""
+        self._head = 0
+        self._count = 0
+        self._skipped = 0
+
+    def row(self, value):
+        """Return the display row that the given value is drawn on."""
+        offset = clamp(int((value - self.min_value) * self._scale), 0, self.height - 1)
+        return self.y + self.height - 1 - offset
+
+    def draw(self, clear=True):
+        """Draw the visible traces. Unless ``clear`` is False, the plot's area is cleared first."""
+        if clear:
+            oled.fill_rect(self.x, self.y, self.width, self.height, 0)
+        end = self.x + self.width
+        first_column = end - self._count
+        for trace in range(self.traces):
+            if not self.visible[trace]:
+                continue
+            samples = self._samples[trace]
+            index = (self._head - self._count) % self.width
+            previous = -1
+            for column in range(first_column, end):
+                row = self.row(samples[index])
+                if self.connected and previous >= 0 and previous != row:
+                    oled.vline(column, min(row, previous), abs(row - previous) + 1, 1)
+                else:
+                    oled.pixel(column, row, 1)
+                previous = row
+                index += 1
+                if index == self.width:
+                    index = 0
@@ -3,6 +3,11 @@ import pytest
 from contrib.scope import Scope
 
 
+@pytest.fixture
+def analog_plot():
+    return Scope().analog_plot
+
+
 @pytest.mark.parametrize(
     "a_voltage, expected_pos",
     [
@@ -19,8 +24,9 @@ from contrib.scope import Scope
         (12.0, 0),
     ],
 )
-def test_calc_y_pos(a_voltage, expected_pos):
-    assert Scope.calc_y_pos(12, a_voltage) == expected_pos
+def test_analog_row(analog_plot, a_voltage, expected_pos):
+    analog_plot.set_range(0, 12)
+    assert analog_plot.row(a_voltage) == expected_pos
 
 
 
@@ -35,10 +41,12 @@ def test_calc_y_pos(a_voltage, expected_pos):
         (6.0, 3.0, 16),
         (6.0, 4.0, 11),
         (6.0, 6.0, 0),
-        (6.0, 8.0, -10),
-        (6.0, 10.0, -20),
-        (6.0, 12.0, -31),
+        # voltages above the scale are drawn at the top of the display
+        (6.0, 8.0, 0),
+        (6.0, 10.0, 0),
+        (6.0, 12.0, 0),
     ],
 )
-def test_calc_y_pos_scale(max_disp_voltage, a_voltage, expected_pos):
-    assert Scope.calc_y_pos(max_disp_voltage, a_voltage) == expected_pos
\ No newline at end of file
+def test_analog_row_scale(analog_plot, max_disp_voltage, a_voltage, expected_pos):
+    analog_plot.set_range(0, max_disp_voltage)
+    assert analog_plot.row(a_voltage) == expected_pos
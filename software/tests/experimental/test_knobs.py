@@ -1,6 +1,7 @@
 import pytest
 from experimental.knobs import LockableKnob, KnobBank, DEFAULT_THRESHOLD
-from europi import k1, MAX_UINT16
+import europi
+from europi import k1, MAX_UINT16, MedianFilter
 from machine import ADC
 
 from mock_hardware import MockHardware
@@ -399,3 +400,33 @@ def test_builder_threshold_from_choice_count():
     assert kb.index == 0
     assert kb.param1.threshold == int(1 / 7 * MAX_UINT16)
     assert kb.param2.threshold == int(DEFAULT_THRESHOLD * MAX_UINT16)
+
+
+def test_poll_only_active_knob(mockHardware: MockHardware, knob_bank: KnobBank):
+    changes = []
+    knob_bank.param1.on_change(lambda position: changes.append(("param1", position)), steps=10)
+    knob_bank.param2.on_change(lambda position: changes.append(("param2", position)), steps=10)
+
+    mockHardware.set_ADC_u16_value(k1, MAX_UINT16 / 10)
+    assert knob_bank.poll()
+    assert changes == [("param1", 9)]
+
+    knob_bank.next()  # param2, locked until the knob is moved to its value
+    mockHardware.set_ADC_u16_value(k1, MAX_UINT16 / 2)
+    assert not knob_bank.poll()
+    assert changes == [("param1", 9)]
+
+
+def test_configured_knob_filter(monkeypatch):
+    monkeypatch.setitem(europi.europi_config, "knob_filter", "median")
+
+    knob_bank = (
+        KnobBank.Builder(k1)
+        .with_locked_knob("a", initial_percentage_value=0)
+        .with_locked_knob("b", initial_percentage_value=1)
+        .build()
+    )
+
+    assert isinstance(LockableKnob(k1)._filters[0], MedianFilter)
+    assert isinstance(knob_bank.a._filters[0], MedianFilter)
+    assert knob_bank.a._filters[0] is not knob_bank.b._filters[0]
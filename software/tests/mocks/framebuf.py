@@ -2,5 +2,12 @@ class FrameBuffer:
     def __init__(self, *args):
         pass
 
+    def fill(self, *args):
+        pass
+
+    def text(self, *args):
+        pass
+
 
+MONO_VLSB = 0
 MONO_HLSB = 3
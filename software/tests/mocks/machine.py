@@ -20,7 +20,7 @@ class Pin:
     def __init__(self, id, *args):
         pass
 
-    def irq(self, handler=None, trigger=None):
+    def irq(self, handler=None, trigger=None, hard=False):
         pass
 
     def value(self, *args):
@@ -38,5 +38,23 @@ class PWM:
         pass
 
 
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def deinit(self):
+        pass
+
+
 def freq(_):
     pass
+
+
+def idle():
+    pass
@@ -0,0 +1,6 @@
+def native(func):
+    return func
+
+
+def schedule(func, arg):
+    func(arg)
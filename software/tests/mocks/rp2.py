@@ -1,20 +1,113 @@
-import functools
+import types
 
 
 class PIO:
     OUT_LOW = 0
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
 
 
 class StateMachine:
-    pass
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def active(self, *args):
+        pass
+
+    def exec(self, instr):
+        pass
+
+    def put(self, value, shift=0):
+        pass
+
+    def get(self, buf=None, shift=0):
+        return 0
+
+    def rx_fifo(self):
+        return 0
+
+
+_INSTRUCTIONS = ("jmp", "wait", "in_", "out", "push", "pull", "mov", "irq", "set", "nop", "word")
+_OPERANDS = (
+    "x",
+    "y",
+    "null",
+    "pins",
+    "pin",
+    "pindirs",
+    "isr",
+    "osr",
+    "pc",
+    "exec",
+    "not_x",
+    "x_dec",
+    "not_y",
+    "y_dec",
+    "x_not_y",
+    "not_osre",
+    "noblock",
+    "block",
+    "iffull",
+    "ifempty",
+    "gpio",
+    "invert",
+    "reverse",
+    "clear",
+    "rel",
+)
+
+
+class Instruction:
+    def __init__(self, op, args):
+        self.op = op
+        self.args = args
+        self.delay = 0
+        self.side_value = None
+
+    def __getitem__(self, delay):
+        self.delay = delay
+        return self
+
+    def side(self, value):
+        self.side_value = value
+        return self
+
+
+class Program:
+    """The instructions recorded by asm_pio(), so that tests can inspect or simulate a program."""
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.instructions = []
+        self.labels = {}
+        self.wrap_target = 0
+        self.wrap = None
 
 
 def asm_pio(**kwargs):
     def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            pass
+        prog = Program(kwargs)
+
+        def emitter(op):
+            def emit(*args):
+                instr = Instruction(op, args)
+                prog.instructions.append(instr)
+                return instr
+
+            return emit
 
-        return wrapper
+        # Like MicroPython, run the program's body with the assembler's names as its globals.
+        names = {name: name for name in _OPERANDS}
+        names.update({name: emitter(name) for name in _INSTRUCTIONS})
+        names["label"] = lambda name: prog.labels.__setitem__(name, len(prog.instructions))
+        names["wrap_target"] = lambda: setattr(prog, "wrap_target", len(prog.instructions))
+        names["wrap"] = lambda: setattr(prog, "wrap", len(prog.instructions) - 1)
+        types.FunctionType(func.__code__, names)()
+        if prog.wrap is None:
+            prog.wrap = len(prog.instructions) - 1
+        return prog
 
     return decorator
@@ -1,10 +1,31 @@
 class SSD1306_I2C:
-    def __init__(self, *args):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+        self.i2c = i2c
+        self.addr = addr
+        self.width = width
+        self.height = height
+        self.pages = self.height // 8
+        self.buffer = bytearray(self.pages * self.width)
+        self.show()
+
+    def write_cmd(self, cmd):
+        pass
+
+    def write_data(self, buf):
         pass
 
     def contrast(self, *args):
         pass
 
+    def invert(self, *args):
+        pass
+
+    def poweroff(self):
+        pass
+
+    def poweron(self):
+        pass
+
     def fill(self, *args):
         pass
 
@@ -25,3 +46,15 @@ class SSD1306_I2C:
 
     def hline(self, *args):
         pass
+
+    def pixel(self, *args):
+        pass
+
+    def vline(self, *args):
+        pass
+
+    def line(self, *args):
+        pass
+
+    def scroll(self, *args):
+        pass
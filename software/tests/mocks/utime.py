@@ -16,3 +16,7 @@ def ticks_diff(*args):
 
 def ticks_ms():
     return 0
+
+
+def ticks_us():
+    return 0
@@ -0,0 +1,128 @@
+import pytest
+
+import europi
+
+from europi import AnalogueInput, INPUT_CALIBRATION_VALUES, MAX_UINT16
+
+from mock_hardware import MockHardware
+
+
+@pytest.fixture
+def analogueInput():
+    return AnalogueInput(pin=1)  # actual pin value doesn't matter
+
+
+@pytest.mark.parametrize(
+    "percent, expected",
+    [
+        (0, 0.0),
+        (0.1, 1.0),
+        (0.25, 2.5),
+        (0.5, 5.0),
+        (0.9, 9.0),
+        (1, 10.0),
+    ],
+)
+def test_read_voltage(mockHardware: MockHardware, analogueInput, percent, expected):
+    mockHardware.set_analogue_input_percent(analogueInput, percent)
+
+    assert analogueInput.read_voltage() == pytest.approx(expected, abs=0.01)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (0, 0),
+        (INPUT_CALIBRATION_VALUES[0] - 16, 0),
+        (MAX_UINT16, 12000),
+    ],
+)
+def test_read_millivolts_clamped(mockHardware: MockHardware, analogueInput, value, expected):
+    mockHardware.set_ADC_u16_value(analogueInput, value)
+
+    assert analogueInput.read_millivolts() == expected
+
+
+def test_lookup_matches_calculation(mockHardware: MockHardware, analogueInput):
+    for value in range(0, MAX_UINT16, 997):
+        mockHardware.set_ADC_u16_value(analogueInput, value)
+
+        assert analogueInput.read_voltage() == pytest.approx(
+            analogueInput._calc_voltage(value), abs=0.01
+        )
+
+
+@pytest.mark.parametrize("percent", [0, 0.05, 0.33, 0.47, 0.77, 0.93, 1])
+def test_positions_are_calibrated(mockHardware: MockHardware, monkeypatch, percent):
+    monkeypatch.setattr(europi, "INPUT_CALIBRATION_VALUES", [1000, 50000])
+    analogueInput = AnalogueInput(pin=1)
+    mockHardware.set_ADC_u16_value(analogueInput, round(1000 + percent * 49000))
+    expected = min(int(analogueInput.percent() * 10), 9)
+
+    assert analogueInput.percent() == pytest.approx(percent)
+    assert analogueInput.range_int(10) == expected
+    assert analogueInput.choice(list(range(10))) == expected
+    assert analogueInput.read_u16_filtered() == pytest.approx(percent * MAX_UINT16, abs=4)
+
+
+@pytest.fixture
+def comparator(mockHardware: MockHardware, analogueInput):
+    edges = []
+    mockHardware.set_analogue_input_percent(analogueInput, 0)
+    analogueInput.comparator(threshold=1.0, hysteresis=0.2, freq=0)
+    analogueInput.comparator_handler(lambda: edges.append("rising"))
+    analogueInput.comparator_handler_falling(lambda: edges.append("falling"))
+    yield edges
+    analogueInput.reset_handler()
+
+
+@pytest.mark.parametrize(
+    "voltages, expected_gates, expected_edges",
+    [
+        ([0.5, 1.05, 1.2, 0.95, 0.85, 0.5], [0, 0, 1, 1, 0, 0], ["rising", "falling"]),
+        ([1.2, 0.95, 1.05, 1.2], [1, 1, 1, 1], ["rising"]),
+    ],
+)
+def test_comparator_hysteresis(
+    mockHardware: MockHardware,
+    analogueInput,
+    comparator,
+    voltages,
+    expected_gates,
+    expected_edges,
+):
+    gates = []
+    for voltage in voltages:
+        mockHardware.set_analogue_input_percent(analogueInput, voltage / 10)
+        gates.append(analogueInput.poll_comparator())
+
+    assert gates == expected_gates
+    assert [analogueInput.comparator_value()] == expected_gates[-1:]
+    assert comparator == expected_edges
+
+
+def test_comparator_initial_state(mockHardware: MockHardware, analogueInput):
+    mockHardware.set_analogue_input_percent(analogueInput, 0.5)
+
+    analogueInput.comparator(threshold=1.0, freq=0)
+
+    assert analogueInput.comparator_value() == 1
+
+
+def test_comparator_off(mockHardware: MockHardware, analogueInput, comparator):
+    mockHardware.set_analogue_input_percent(analogueInput, 0.5)
+
+    analogueInput.comparator_off()
+
+    assert analogueInput.poll_comparator() == 0
+    assert comparator == []
+
+
+def test_comparator_timer(mockHardware: MockHardware, analogueInput):
+    mockHardware.set_analogue_input_percent(analogueInput, 0)
+
+    analogueInput.comparator(threshold=1.0)
+    assert analogueInput._comparator_timer is not None
+
+    analogueInput.comparator_off()
+    assert analogueInput._comparator_timer is None
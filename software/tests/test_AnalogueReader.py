@@ -77,3 +77,37 @@ def test_choice(mockHardware: MockHardware, analogueReader, values, value, expec
     mockHardware.set_ADC_u16_value(analogueReader, value)
 
     assert analogueReader.choice(values) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (0, 0),
+        (MAX_UINT16 // 4, MAX_UINT16 // 4),
+        (MAX_UINT16 // 2, MAX_UINT16 // 2),
+        (MAX_UINT16, MAX_UINT16),
+    ],
+)
+def test_read_u16_filtered(mockHardware: MockHardware, analogueReader, value, expected):
+    mockHardware.set_ADC_u16_value(analogueReader, value)
+
+    assert analogueReader.read_u16_filtered() == pytest.approx(expected, abs=1)
+
+
+def test_read_u16_filtered_deadzone(mockHardware: MockHardware, analogueReader):
+    analogueReader.set_deadzone(0.1)
+
+    mockHardware.set_ADC_u16_value(analogueReader, MAX_UINT16 // 20)
+    assert analogueReader.read_u16_filtered() == 0
+    mockHardware.set_ADC_u16_value(analogueReader, MAX_UINT16 - MAX_UINT16 // 20)
+    assert analogueReader.read_u16_filtered() == MAX_UINT16
+
+
+@pytest.mark.parametrize("value", range(0, MAX_UINT16 + 1, 1111))
+@pytest.mark.parametrize("deadzone", [0.0, 0.01, 0.1])
+def test_range_int_matches_range(mockHardware: MockHardware, analogueReader, value, deadzone):
+    analogueReader.set_deadzone(deadzone)
+    mockHardware.set_ADC_u16_value(analogueReader, value)
+
+    assert analogueReader.range_int(10) == analogueReader.range(10)
+    assert isinstance(analogueReader.range_int(10), int)
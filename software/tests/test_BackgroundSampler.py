@@ -0,0 +1,79 @@
+import pytest
+
+from europi import AnalogueInput, BackgroundSampler, Knob, MAX_UINT16, SampleRing
+
+from mock_hardware import MockHardware
+
+
+@pytest.fixture
+def knob():
+    return Knob(pin=1)  # actual pin value doesn't matter
+
+
+@pytest.fixture
+def sampler(knob):
+    s = BackgroundSampler([knob], samples=4)
+    yield s
+    s.stop()
+
+
+def test_ring_running_average(mockHardware: MockHardware, knob):
+    ring = SampleRing(knob.pin, 4)
+    ring.fill(100)
+    assert ring.average() == 100
+
+    for value in (200, 200, 200, 200):
+        ring.push(value)
+    assert ring.average() == 200
+
+    ring.push(0)
+    assert ring.total == 600
+    assert ring.average() == 150
+
+
+def test_start_primes_readers(mockHardware: MockHardware, knob, sampler):
+    mockHardware.set_ADC_u16_value(knob, MAX_UINT16 // 2)
+
+    sampler.start()
+
+    assert sampler.running
+    assert knob._sample_adc() == MAX_UINT16 // 2
+
+
+def test_readings_do_not_touch_adc(mockHardware: MockHardware, knob, sampler):
+    mockHardware.set_ADC_u16_value(knob, 0)
+    sampler.start()
+
+    mockHardware.set_ADC_u16_value(knob, MAX_UINT16)
+    assert knob.percent(deadzone=0.0) == 1.0
+
+    for _ in range(4):
+        sampler._sample(None)
+    assert knob.percent(deadzone=0.0) == 0.0
+    assert knob.range(steps=10, deadzone=0.0) == 0
+
+
+def test_stop_detaches_readers(mockHardware: MockHardware, knob, sampler):
+    mockHardware.set_ADC_u16_value(knob, 0)
+    sampler.start()
+    sampler.stop()
+
+    mockHardware.set_ADC_u16_value(knob, MAX_UINT16)
+    assert not sampler.running
+    assert knob.percent(deadzone=0.0) == 0.0
+
+
+def test_analogue_input_voltage(mockHardware: MockHardware):
+    ain = AnalogueInput(pin=1)
+    sampler = BackgroundSampler([ain], samples=2)
+    mockHardware.set_ADC_u16_value(ain, 0)
+    sampler.start()
+
+    assert ain.read_voltage() == 0
+
+    sampler.stop()
+
+
+def test_invalid_samples(knob):
+    with pytest.raises(ValueError):
+        BackgroundSampler([knob], samples=0)
@@ -1,6 +1,11 @@
+import asyncio
+
 import pytest
+from machine import Pin
+
+import europi
 
-from europi import DigitalReader
+from europi import Button, DigitalReader, EventQueue, EVENT_BOTH, EVENT_FALLING, EVENT_RISING
 
 from mock_hardware import MockHardware
 
@@ -21,3 +26,238 @@ def test_value(mockHardware: MockHardware, digitalReader, value, expected):
     mockHardware.set_digital_value(digitalReader, value)
 
     assert digitalReader.value() == expected
+
+
+@pytest.fixture
+def deferredReader():
+    reader = DigitalReader(pin=1, debounce_delay=0)
+    reader.defer(size=4)
+    return reader
+
+
+def edge(mockHardware, reader, value):
+    mockHardware.set_digital_value(reader, value)
+    reader._bounce_wrapper(reader.pin)
+
+
+def test_handlers_called_from_irq(mockHardware: MockHardware):
+    reader = DigitalReader(pin=1, debounce_delay=0)
+    calls = []
+    reader.handler(lambda: calls.append("rising"))
+    reader.handler_falling(lambda: calls.append("falling"))
+
+    edge(mockHardware, reader, 1)
+    edge(mockHardware, reader, 0)
+
+    assert calls == ["rising", "falling"]
+
+
+def test_deferred_handlers_wait_for_dispatch(mockHardware: MockHardware, deferredReader):
+    calls = []
+    deferredReader.handler(lambda: calls.append("rising"))
+    deferredReader.handler_falling(lambda: calls.append("falling"))
+
+    edge(mockHardware, deferredReader, 1)
+    edge(mockHardware, deferredReader, 0)
+    edge(mockHardware, deferredReader, 1)
+
+    assert calls == []
+    assert deferredReader.dispatch() == 3
+    assert calls == ["rising", "falling", "rising"]
+    assert deferredReader.dispatch() == 0
+
+
+def test_deferred_overflow(mockHardware: MockHardware, deferredReader):
+    calls = []
+    deferredReader.handler(lambda: calls.append("rising"))
+
+    for _ in range(6):
+        edge(mockHardware, deferredReader, 1)
+
+    assert deferredReader.event_queue.overflows == 2
+    assert deferredReader.dispatch() == 4
+    assert len(calls) == 4
+
+
+def test_deferred_scheduled(mockHardware: MockHardware):
+    reader = DigitalReader(pin=1, debounce_delay=0)
+    reader.defer(schedule=True)
+    calls = []
+    reader.handler(lambda: calls.append("rising"))
+
+    edge(mockHardware, reader, 1)
+
+    # The mock micropython.schedule() calls the function straight away.
+    assert calls == ["rising"]
+    assert len(reader.event_queue) == 0
+
+
+def test_dispatch_without_defer():
+    assert DigitalReader(pin=1).dispatch() == 0
+
+
+def test_reset_handler_stops_deferring(deferredReader):
+    deferredReader.reset_handler()
+
+    assert deferredReader.event_queue is None
+
+
+def test_event_queue_order():
+    queue = EventQueue(3)
+    queue.push(EVENT_RISING, 10)
+    queue.push(EVENT_FALLING, 20)
+    queue.push(EVENT_BOTH, 30)
+
+    assert not queue.push(EVENT_RISING, 40)
+    assert len(queue) == 3
+    assert queue.pop() == EVENT_RISING
+    assert queue.ticks_us == 10
+
+    # wraps around the end of the buffer
+    assert queue.push(EVENT_RISING, 50)
+    assert [queue.pop(), queue.pop(), queue.pop()] == [EVENT_FALLING, EVENT_BOTH, EVENT_RISING]
+    assert queue.ticks_us == 50
+    assert queue.pop() is None
+
+
+def test_event_queue_clear():
+    queue = EventQueue(2)
+    queue.push(EVENT_RISING, 10)
+    queue.clear()
+
+    assert len(queue) == 0
+    assert queue.pop() is None
+
+
+def test_stats(mockHardware: MockHardware):
+    reader = DigitalReader(pin=1, debounce_delay=0)
+    reader.handler(lambda: None)
+
+    edge(mockHardware, reader, 1)
+    edge(mockHardware, reader, 0)
+
+    assert reader.edges_seen == 2
+    assert reader.edges_debounced == 0
+    assert reader.edges_dispatched == 2
+
+    reader.reset_stats()
+
+    assert reader.edges_seen == 0
+    assert reader.edges_dispatched == 0
+
+
+def test_stats_debounced(mockHardware: MockHardware):
+    # the mock ticks_ms() is always 0, so every edge is within the debounce delay
+    reader = DigitalReader(pin=1, debounce_delay=100)
+
+    edge(mockHardware, reader, 1)
+
+    assert reader.edges_seen == 1
+    assert reader.edges_debounced == 1
+    assert reader.edges_dispatched == 0
+
+
+def test_stats_handler_overruns(mockHardware: MockHardware, monkeypatch):
+    now = [0]
+    monkeypatch.setattr(europi, "ticks_us", lambda: now[0])
+    monkeypatch.setattr(europi, "ticks_diff", lambda a, b: a - b)
+    reader = DigitalReader(pin=1, debounce_delay=0)
+    handler_us = [0]
+
+    def slow_handler():
+        now[0] += handler_us[0]
+
+    reader.handler(slow_handler)
+    reader.handler_falling(slow_handler)
+
+    # edges every 1000us, handlers take 300us
+    handler_us[0] = 300
+    for value in (1, 0, 1):
+        edge(mockHardware, reader, value)
+        now[0] += 1000 - handler_us[0]
+
+    assert reader.handler_overruns == 0
+    assert reader.max_handler_us == 300
+
+    # handlers now take longer than the time between edges
+    handler_us[0] = 1500
+    edge(mockHardware, reader, 0)
+
+    assert reader.handler_overruns == 1
+    assert reader.max_handler_us == 1500
+
+
+def test_stats_deferred(mockHardware: MockHardware, deferredReader):
+    for value in (1, 0, 1, 0, 1, 0):
+        edge(mockHardware, deferredReader, value)
+
+    assert deferredReader.edges_seen == 6
+    assert deferredReader.edges_dispatched == 0
+    assert deferredReader.event_queue.overflows == 2
+
+    deferredReader.dispatch()
+
+    assert deferredReader.edges_dispatched == 4
+
+
+def test_await_rising_and_falling(mockHardware: MockHardware):
+    reader = DigitalReader(pin=1, debounce_delay=0)
+    events = []
+
+    async def waiter():
+        await reader.rising()
+        events.append("rising")
+        await reader.falling()
+        events.append("falling")
+
+    async def run():
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        edge(mockHardware, reader, 1)
+        await asyncio.sleep(0)
+        edge(mockHardware, reader, 0)
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(run())
+
+    assert events == ["rising", "falling"]
+
+
+def test_await_pressed_after_press(mockHardware: MockHardware):
+    button = Button(pin=1, debounce_delay=0)
+
+    async def run():
+        waiter = asyncio.create_task(button.pressed())
+        await asyncio.sleep(0)
+        edge(mockHardware, button, 1)
+        await asyncio.wait_for(waiter, 1)
+        # a press while no task was waiting is not lost
+        edge(mockHardware, button, 0)
+        edge(mockHardware, button, 1)
+        await asyncio.wait_for(button.pressed(), 1)
+
+    asyncio.run(run())
+
+
+def test_await_rising_after_reset_handler(mockHardware: MockHardware, monkeypatch):
+    irqs = {}
+    monkeypatch.setattr(
+        Pin, "irq", lambda pin, handler=None, trigger=None, hard=False: irqs.update({pin: handler})
+    )
+    reader = DigitalReader(pin=1, debounce_delay=0)
+
+    async def run():
+        first = asyncio.create_task(reader.rising())
+        await asyncio.sleep(0)
+        first.cancel()
+        reader.reset_handler()
+        assert irqs[reader.pin] is None
+
+        waiter = asyncio.create_task(reader.rising())
+        await asyncio.sleep(0)
+        # waiting again turns the IRQ back on
+        mockHardware.set_digital_value(reader, 1)
+        irqs[reader.pin](reader.pin)
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(run())
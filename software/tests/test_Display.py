@@ -0,0 +1,291 @@
+import asyncio
+
+import pytest
+import uasyncio
+
+import europi
+
+from europi import (
+    CHAR_WIDTH,
+    Display,
+    OLED_WIDTH,
+    SSD1306_SET_COL_ADDR,
+    SSD1306_SET_PAGE_ADDR,
+    TextCache,
+)
+
+
+@pytest.fixture
+def display():
+    d = Display(0, 1)  # actual pin values don't matter
+    d.commands = []
+    d.data = []
+    d.write_cmd = d.commands.append
+    d.write_data = lambda buf: d.data.append(bytes(buf))
+    return d
+
+
+def test_first_show_sends_whole_frame():
+    d = Display(0, 1)
+
+    assert d.frames_sent == 1
+    assert d.last_frame_bytes == len(d.buffer)
+
+
+def test_unchanged_frame_is_skipped(display):
+    display.show()
+
+    assert display.data == []
+    assert display.last_frame_bytes == 0
+    assert display.frames_skipped == 1
+
+
+def test_changed_columns_are_sent(display):
+    display.buffer[OLED_WIDTH + 10] = 0xFF
+    display.buffer[OLED_WIDTH + 12] = 0x01
+
+    display.show()
+
+    assert display.commands == [SSD1306_SET_COL_ADDR, 10, 12, SSD1306_SET_PAGE_ADDR, 1, 1]
+    assert display.data == [b"\xff\x00\x01"]
+    assert display.last_frame_bytes == 3
+
+    display.show()
+    assert display.last_frame_bytes == 0
+
+
+def test_changed_regions_on_several_pages(display):
+    display.buffer[5] = 1
+    display.buffer[3 * OLED_WIDTH + 100] = 1
+
+    display.show()
+
+    assert display.data == [b"\x01", b"\x01"]
+    assert display.bytes_sent == len(display.buffer) + 2
+
+
+def test_full_pages_are_sent_when_cheaper(display):
+    for i in range(len(display.buffer)):
+        display.buffer[i] = 0xAA
+
+    display.show()
+
+    assert display.commands == [
+        SSD1306_SET_COL_ADDR,
+        0,
+        OLED_WIDTH - 1,
+        SSD1306_SET_PAGE_ADDR,
+        0,
+        3,
+    ]
+    assert display.data == [bytes(display.buffer)]
+
+
+def test_invalidate(display):
+    display.invalidate()
+
+    display.show()
+
+    assert display.last_frame_bytes == len(display.buffer)
+
+
+def test_show_async_sends_in_chunks(display):
+    display.chunk_bytes = 4
+    for x in range(10):
+        display.buffer[x] = 1
+    display.buffer[2 * OLED_WIDTH] = 1
+
+    display.show_async()
+    for x in range(10):
+        display.buffer[x] = 0  # drawing the next frame doesn't affect the one in flight
+
+    assert display.flushing
+    assert display.data == []
+    assert display.tick()
+    assert display.data == [b"\x01" * 4]
+    assert display.tick()
+    assert display.tick()
+    assert display.tick()
+    assert display.data == [b"\x01" * 4, b"\x01" * 4, b"\x01" * 2, b"\x01"]
+    assert not display.tick()
+    assert not display.flushing
+    assert display.last_frame_bytes == 11
+
+
+def test_show_async_newer_frame_replaces_pending(display):
+    display.chunk_bytes = 2
+    display.buffer[0] = 1
+    display.buffer[1] = 1
+    display.buffer[5] = 1
+    display.show_async()
+    display.tick()
+
+    display.buffer[5] = 0
+    display.show_async()
+
+    assert not display.tick()
+    assert display.data == [b"\x01\x01"]
+
+
+def test_show_cancels_show_async(display):
+    display.buffer[0] = 1
+    display.show_async()
+
+    display.show()
+
+    assert not display.flushing
+    assert not display.tick()
+    assert display.data == [b"\x01"]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0]
+    monkeypatch.setattr(europi, "ticks_ms", lambda: now[0])
+    monkeypatch.setattr(europi, "ticks_diff", lambda a, b: a - b)
+    return now
+
+
+def test_max_fps_defers_frames(clock, display):
+    display.set_max_fps(10)
+    display.buffer[0] = 1
+    display.show()
+    assert display.data == [b"\x01"]
+
+    clock[0] = 50
+    display.buffer[0] = 2
+    display.show()
+    display.buffer[0] = 3
+    display.show()
+    assert display.data == [b"\x01"]
+    assert display.frames_dropped == 1
+
+    display.buffer[0] = 4  # not shown yet
+    clock[0] = 100
+    display._show_deferred(None)
+    assert display.data == [b"\x01", b"\x03"]
+
+    clock[0] = 150
+    display.show()
+    assert display.data == [b"\x01", b"\x03"]
+
+    clock[0] = 250
+    display._show_deferred(None)
+    display.show()
+    assert display.data == [b"\x01", b"\x03", b"\x04"]
+
+
+def test_deferred_frame_waits_for_commands(clock, display, monkeypatch):
+    def contrast(self, value):
+        self.write_cmd(0x81)
+        self._show_deferred(None)  # the timer fires between the two commands
+        self.write_cmd(value)
+
+    monkeypatch.setattr(europi.SSD1306_I2C, "contrast", contrast)
+    display.set_max_fps(10)
+    display.show()
+    clock[0] = 50
+    display.buffer[0] = 1
+    display.show()
+
+    display.contrast(100)
+    assert display.commands == [0x81, 100]
+
+    display._show_deferred(None)
+    assert display.data == [b"\x01"]
+
+
+def test_cancel_pending_drops_deferred_frame(clock, display):
+    display.set_max_fps(10)
+    display.show()
+    clock[0] = 50
+    display.buffer[0] = 1
+    display.show()
+
+    display.cancel_pending()
+    clock[0] = 100
+    display._show_deferred(None)
+    assert display.data == []
+
+
+def test_max_fps_allows_spaced_frames(clock, display):
+    display.set_max_fps(10)
+    for i in range(1, 4):
+        display.buffer[0] = i
+        clock[0] = i * 100
+        display.show()
+
+    assert display.data == [b"\x01", b"\x02", b"\x03"]
+    assert display.frames_dropped == 0
+
+
+def test_invalid_max_fps(display):
+    with pytest.raises(ValueError):
+        display.set_max_fps(-1)
+
+
+def test_text_cache_hits_and_eviction():
+    cache = TextCache(max_bytes=4 * CHAR_WIDTH)
+
+    a = cache.get("ab")
+    assert cache.get("ab") is a
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get("cd")
+    cache.get("ab")  # "cd" is now the least recently used
+    cache.get("e")
+
+    assert len(cache) == 2
+    assert cache.get("ab") is a
+    assert cache.size == 3 * CHAR_WIDTH
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_text_cache_colours_are_separate():
+    cache = TextCache()
+
+    assert cache.get("ab", 1) is not cache.get("ab", 0)
+    assert len(cache) == 2
+
+
+def test_centre_text_layout(display):
+    blits = []
+    display.blit = lambda fb, x, y, key: blits.append((x, y, key))
+
+    display.centre_text("hello\nworld")
+    display.centre_text("hello\nworld")
+
+    assert display.text_cache.hits == 2
+    assert blits == [(42, 6, 0), (42, 15, 0)] * 2
+
+
+def test_flush_sends_in_chunks(display):
+    display.chunk_bytes = 2
+    display.show()
+    display.data = []
+    for x in range(5):
+        display.buffer[x] = 1
+
+    asyncio.run(display.flush())
+
+    assert display.data == [b"\x01\x01", b"\x01\x01", b"\x01"]
+    assert not display.flushing
+
+
+def test_flush_waits_for_max_fps(clock, display, monkeypatch):
+    slept = []
+
+    async def sleep_ms(ms):
+        slept.append(ms)
+        clock[0] += ms
+
+    monkeypatch.setattr(uasyncio, "sleep_ms", sleep_ms)
+    display.set_max_fps(10)
+    display.show()
+    clock[0] = 30
+    display.buffer[0] = 1
+
+    asyncio.run(display.flush())
+
+    assert slept[0] == 70
+    assert display.data[-1] == b"\x01"
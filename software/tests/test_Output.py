@@ -0,0 +1,156 @@
+import pytest
+
+import europi
+from europi import Output, Outputs, OUTPUT_CALIBRATION_VALUES, PulseScheduler
+from machine import PWM
+
+
+@pytest.fixture
+def duty_writes(monkeypatch):
+    writes = []
+    monkeypatch.setattr(PWM, "duty_u16", lambda pwm, duty: writes.append(duty))
+    return writes
+
+
+@pytest.fixture
+def output():
+    return Output(pin=1)  # actual pin value doesn't matter
+
+
+@pytest.mark.parametrize(
+    "millivolts, expected",
+    [
+        (-1000, 0),
+        (0, 0),
+        (1000, OUTPUT_CALIBRATION_VALUES[1]),
+        (2500, (OUTPUT_CALIBRATION_VALUES[2] + OUTPUT_CALIBRATION_VALUES[3]) / 2),
+        (4321, None),
+        (9999, None),
+        (10000, OUTPUT_CALIBRATION_VALUES[10]),
+        (12000, OUTPUT_CALIBRATION_VALUES[10]),
+    ],
+)
+def test_voltage_mv_matches_voltage(output, millivolts, expected):
+    output.voltage(millivolts / 1000)
+    float_duty = output._duty
+
+    output.voltage_mv(millivolts)
+
+    assert abs(output._duty - float_duty) <= 1
+    if expected is not None:
+        assert abs(output._duty - expected) <= 1
+
+
+def test_unchanged_duty_is_not_written(duty_writes, output):
+    duty_writes.clear()
+
+    output.voltage(2)
+    output.voltage(2)
+    output.voltage_mv(2000)
+
+    assert duty_writes == [OUTPUT_CALIBRATION_VALUES[2]]
+
+
+def test_set_voltages(duty_writes):
+    outputs = Outputs([Output(pin=1), Output(pin=2), Output(pin=3)])
+    duty_writes.clear()
+
+    outputs.set_voltages([1, None, 0])
+
+    assert duty_writes == [OUTPUT_CALIBRATION_VALUES[1]]
+    assert [cv._duty for cv in outputs] == [OUTPUT_CALIBRATION_VALUES[1], 0, 0]
+
+
+def test_set_millivolts(duty_writes):
+    outputs = Outputs([Output(pin=1), Output(pin=2)])
+    duty_writes.clear()
+
+    outputs.set_millivolts([3000, 5000, 7000])
+
+    assert duty_writes == [OUTPUT_CALIBRATION_VALUES[3], OUTPUT_CALIBRATION_VALUES[5]]
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    now = [0]
+    monkeypatch.setattr(europi, "ticks_ms", lambda: now[0])
+    monkeypatch.setattr(europi, "ticks_add", lambda a, b: a + b)
+    monkeypatch.setattr(europi, "ticks_diff", lambda a, b: a - b)
+    outputs = [Output(pin=1), Output(pin=2)]
+    s = PulseScheduler(outputs)
+    s.now = now
+    yield s
+    s.stop()
+
+
+def test_trigger(scheduler):
+    output = scheduler.outputs[0]
+
+    output.trigger(20)
+
+    assert scheduler.running
+    assert scheduler.active(0)
+    assert not scheduler.active(1)
+    assert output._duty > 0
+
+    scheduler.now[0] = 19
+    scheduler._tick(None)
+    assert output._duty > 0
+
+    scheduler.now[0] = 20
+    scheduler._tick(None)
+    assert output._duty == 0
+    assert not scheduler.active(0)
+
+
+def test_retrigger_extends_pulse(scheduler):
+    output = scheduler.outputs[1]
+
+    output.trigger(10)
+    scheduler.now[0] = 5
+    output.trigger(10)
+    scheduler.now[0] = 10
+    scheduler._tick(None)
+
+    assert output._duty > 0
+
+    scheduler.now[0] = 15
+    scheduler._tick(None)
+
+    assert output._duty == 0
+
+
+def test_timer_stops_when_idle(scheduler):
+    scheduler.outputs[0].trigger(10)
+    scheduler.outputs[1].trigger(20)
+
+    scheduler.now[0] = 10
+    scheduler._tick(None)
+    assert scheduler.running
+
+    scheduler.now[0] = 20
+    scheduler._tick(None)
+    assert not scheduler.running
+
+    scheduler.outputs[1].trigger(10)
+    assert scheduler.running
+    assert scheduler.outputs[1]._duty > 0
+
+
+def test_stop_clears_pulses(scheduler):
+    scheduler.outputs[0].trigger()
+    scheduler.stop()
+
+    assert not scheduler.running
+    assert not scheduler.active(0)
+    assert scheduler.outputs[0]._duty == 0
+
+
+def test_trigger_without_scheduler(output):
+    with pytest.raises(ValueError):
+        output.trigger()
+
+
+def test_cvs_triggers():
+    assert europi.cv1._pulses is europi.pulses
+    assert europi.cv6._pulse_index == 5
@@ -0,0 +1,129 @@
+import pytest
+
+import clock_tracker
+from clock_tracker import ClockTracker
+from europi import DigitalReader
+
+from mock_hardware import MockHardware
+
+
+@pytest.fixture(autouse=True)
+def ticks(monkeypatch):
+    """The mock utime's ticks functions always return 0, use plain arithmetic instead."""
+    monkeypatch.setattr(clock_tracker, "ticks_diff", lambda a, b: a - b)
+    monkeypatch.setattr(clock_tracker, "ticks_add", lambda a, b: a + b)
+
+
+@pytest.fixture
+def tracker():
+    return ClockTracker(size=4)
+
+
+def feed(tracker, *intervals):
+    """Send edges separated by the given intervals, continuing from the last edge if there was
+    one."""
+    if tracker.last_edge_us:
+        start = tracker.last_edge_us
+    else:
+        start = 1000
+        tracker.on_edge(start)
+    for interval in intervals:
+        start += interval
+        tracker.on_edge(start)
+    return start
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        ClockTracker(size=0)
+
+
+def test_no_edges(tracker):
+    assert tracker.period_us() == 0
+    assert tracker.bpm() == 0
+    assert not tracker.stable()
+
+
+def test_period_and_bpm(tracker):
+    feed(tracker, 500_000, 500_000)
+
+    assert tracker.period_us() == 500_000
+    assert tracker.bpm() == 120
+    assert tracker.bpm(ppqn=4) == 30
+    assert not tracker.stable()
+
+
+def test_stable_once_full(tracker):
+    feed(tracker, 100_000, 101_000, 99_000, 100_000)
+
+    assert tracker.stable()
+    assert tracker.period_us() == 100_000
+
+
+def test_window_slides(tracker):
+    feed(tracker, 100_000, 100_000, 100_000, 100_000, 110_000, 110_000, 110_000, 110_000)
+
+    assert tracker.period_us() == 110_000
+
+
+def test_rejects_outlier(tracker):
+    # a missed pulse doubles one interval
+    feed(tracker, 100_000, 100_000, 100_000, 100_000, 200_000)
+
+    assert tracker.period_us() == 100_000
+    assert not tracker.stable()
+
+    feed(tracker, 100_000)
+
+    assert tracker.stable()
+
+
+def test_tempo_change(tracker):
+    feed(tracker, 100_000, 100_000, 100_000, 50_000, 50_000)
+    assert tracker.period_us() == 100_000
+
+    feed(tracker, 50_000)
+    assert tracker.period_us() == 50_000
+
+
+def test_timeout_restarts(tracker):
+    feed(tracker, 100_000, 100_000, 3_000_000, 200_000)
+
+    assert tracker.period_us() == 200_000
+
+
+def test_next_edge(tracker):
+    last = feed(tracker, 100_000, 100_000)
+
+    assert tracker.next_edge_us() == last + 100_000
+
+
+def test_reset(tracker):
+    feed(tracker, 100_000, 100_000)
+    tracker.reset()
+    assert tracker.last_edge_us == 0
+
+    assert tracker.period_us() == 0
+    tracker.on_edge(5_000_000)
+    assert tracker.period_us() == 0
+
+
+def test_tracks_reader(mockHardware: MockHardware, monkeypatch):
+    reader = DigitalReader(pin=1, debounce_delay=0)
+    tracker = ClockTracker(reader, size=4)
+    edges = []
+    monkeypatch.setattr(tracker, "on_edge", edges.append)
+
+    mockHardware.set_digital_value(reader, 1)
+    reader._bounce_wrapper(reader.pin)
+    mockHardware.set_digital_value(reader, 0)
+    reader._bounce_wrapper(reader.pin)
+
+    # only rising edges are tracked
+    assert edges == [0]
+
+    reader.reset_handler()
+    mockHardware.set_digital_value(reader, 1)
+    reader._bounce_wrapper(reader.pin)
+
+    assert edges == [0]
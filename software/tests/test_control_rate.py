@@ -0,0 +1,78 @@
+import pytest
+
+from europi import Output
+from control_rate import TICKS_MASK, ControlRate
+
+
+@pytest.fixture
+def millivolts(monkeypatch):
+    """Records the millivolts written to each output."""
+    written = []
+    monkeypatch.setattr(
+        Output, "voltage_mv", lambda self, mv: written.append((self.pin, mv)), raising=True
+    )
+    return written
+
+
+@pytest.fixture
+def outputs():
+    return [Output(0), Output(1)]
+
+
+@pytest.fixture
+def engine(outputs):
+    e = ControlRate(outputs, freq=1000)
+    yield e
+    e.stop()
+
+
+def test_invalid_freq(outputs):
+    with pytest.raises(ValueError):
+        ControlRate(outputs, freq=0)
+
+
+def test_start_stop(engine):
+    assert not engine.running
+    engine.start()
+    assert engine.running
+    engine.stop()
+    assert not engine.running
+
+
+def test_tick_calls_channels(engine, outputs, millivolts):
+    engine.channel(1, lambda tick: tick * 100)
+
+    engine._tick(None)
+    engine._tick(None)
+
+    assert millivolts == [(outputs[1].pin, 0), (outputs[1].pin, 100)]
+    assert engine.ticks == 2
+
+
+def test_none_leaves_output_unchanged(engine, millivolts):
+    engine.channel(0, lambda tick: None)
+
+    engine._tick(None)
+
+    assert millivolts == []
+
+
+def test_remove_and_clear(engine, millivolts):
+    engine.channel(0, lambda tick: 1000)
+    engine.channel(1, lambda tick: 2000)
+
+    engine.channel(0, None)
+    engine._tick(None)
+    assert len(millivolts) == 1
+
+    engine.clear()
+    engine._tick(None)
+    assert len(millivolts) == 1
+
+
+def test_ticks_wrap(engine):
+    engine.ticks = TICKS_MASK
+
+    engine._tick(None)
+
+    assert engine.ticks == 0
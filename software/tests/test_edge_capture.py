@@ -0,0 +1,169 @@
+import pytest
+
+import clock_tracker
+import europi
+from clock_tracker import ClockTracker
+from edge_capture import COUNT_MASK, COUNT_WRAP, CYCLES_PER_COUNT, EdgeCapture, capture_prog
+from europi import EVENT_FALLING, EVENT_RISING, DigitalInput
+
+
+def raw(count, event):
+    """Returns the FIFO entry the PIO program pushes for an edge at the given count."""
+    return ((COUNT_MASK - count) << 1) | event
+
+
+def simulate(prog, pin_high, cycles):
+    """Runs a PIO program cycle by cycle, with the jmp pin's level given by pin_high(cycle).
+
+    Returns the cycles at which X was decremented, and the cycle and value of each push.
+    """
+    decrements = []
+    pushes = []
+    regs = {"x": 0, "y": 0, "null": 0}
+    isr = 0
+    pc = 0
+    cycle = 0
+    while cycle < cycles:
+        instr = prog.instructions[pc]
+        op, args = instr.op, instr.args
+        next_pc = prog.wrap_target if pc == prog.wrap else pc + 1
+        if op == "set":
+            regs[args[0]] = args[1]
+        elif op == "jmp":
+            if len(args) == 1:
+                next_pc = prog.labels[args[0]]
+            elif args[0] == "x_dec":
+                taken = regs["x"] != 0
+                regs["x"] = (regs["x"] - 1) & 0xFFFFFFFF
+                decrements.append(cycle)
+                if taken:
+                    next_pc = prog.labels[args[1]]
+            elif args[0] == "pin":
+                if pin_high(cycle):
+                    next_pc = prog.labels[args[1]]
+            else:
+                raise NotImplementedError(args[0])
+        elif op == "in_":
+            bits = args[1]
+            isr = ((isr << bits) | (regs[args[0]] & ((1 << bits) - 1))) & 0xFFFFFFFF
+        elif op == "push":
+            pushes.append((cycle, isr))
+            isr = 0
+        elif op != "nop":
+            raise NotImplementedError(op)
+        pc = next_pc
+        cycle += 1 + instr.delay
+    return decrements, pushes
+
+
+def square_wave(period_counts):
+    """Returns the level of din's pin for a clock of the given period, which is low while the gate
+    is high, starting with the gate low."""
+    period = period_counts * CYCLES_PER_COUNT
+    return lambda cycle: cycle % period < period // 2
+
+
+def test_program_counts_every_3_cycles():
+    decrements, pushes = simulate(capture_prog, square_wave(100), 3000 * CYCLES_PER_COUNT)
+
+    # edges on both paths were captured, and neither lost a count
+    assert len(pushes) > 50
+    assert {raw & 1 for _, raw in pushes} == {EVENT_RISING, EVENT_FALLING}
+    assert {b - a for a, b in zip(decrements, decrements[1:])} == {CYCLES_PER_COUNT}
+
+
+def test_program_measures_period():
+    _, pushes = simulate(capture_prog, square_wave(1000), 10_000 * CYCLES_PER_COUNT)
+    rising = [COUNT_MASK - (raw >> 1) for _, raw in pushes if raw & 1 == EVENT_RISING]
+    falling = [COUNT_MASK - (raw >> 1) for _, raw in pushes if raw & 1 == EVENT_FALLING]
+
+    assert {b - a for a, b in zip(rising, rising[1:])} == {1000}
+    assert {b - a for a, b in zip(falling, falling[1:])} == {1000}
+    # each edge is seen within a count of when it happens
+    assert all(abs(f - r - 500) <= 1 for r, f in zip(rising, falling))
+
+
+@pytest.fixture
+def fifo(monkeypatch):
+    """Entries waiting in the capture's FIFO."""
+    entries = []
+    monkeypatch.setattr("rp2.StateMachine.rx_fifo", lambda sm: len(entries))
+    monkeypatch.setattr("rp2.StateMachine.get", lambda sm, buf=None, shift=0: entries.pop(0))
+    return entries
+
+
+@pytest.fixture
+def capture():
+    c = EdgeCapture(DigitalInput(22))
+    c.start()
+    yield c
+    c.stop()
+
+
+def test_not_running():
+    capture = EdgeCapture(DigitalInput(22))
+
+    assert not capture.running
+    assert capture.available() == 0
+    assert capture.read() is None
+
+
+def test_start_stop(capture):
+    assert capture.running
+    capture.stop()
+    assert not capture.running
+
+
+def test_reset_state_stops_capture(capture):
+    europi.reset_state()
+    assert not capture.running
+
+
+def test_read(fifo, capture):
+    fifo.extend([raw(100, EVENT_RISING), raw(350, EVENT_FALLING)])
+
+    assert capture.available() == 2
+    assert capture.read() == EVENT_RISING
+    assert capture.ticks == 100
+    assert capture.read() == EVENT_FALLING
+    assert capture.ticks == 350
+    assert capture.read() is None
+    assert capture.edges == 2
+    assert capture.rising_edges == 1
+
+
+def test_count_wraps(fifo, capture):
+    fifo.extend([raw(COUNT_MASK - 10, EVENT_RISING), raw(20, EVENT_RISING)])
+
+    capture.read()
+    capture.read()
+
+    assert capture.ticks == COUNT_WRAP + 20
+
+
+def test_poll(fifo, capture, monkeypatch):
+    monkeypatch.setattr(clock_tracker, "ticks_diff", lambda a, b: a - b)
+    tracker = ClockTracker(size=2)
+    capture.track(tracker)
+    events = []
+    capture.handler(lambda event, ticks: events.append((event, ticks)))
+    fifo.extend(
+        [
+            raw(1000, EVENT_RISING),
+            raw(1200, EVENT_FALLING),
+            raw(3000, EVENT_RISING),
+            raw(3200, EVENT_FALLING),
+            raw(5000, EVENT_RISING),
+        ]
+    )
+
+    assert capture.poll() == 5
+    assert events[0] == (EVENT_RISING, 1000)
+    assert events[-1] == (EVENT_RISING, 5000)
+    assert tracker.period_us() == 2000
+    assert tracker.stable()
+
+
+def test_invalid_handler(capture):
+    with pytest.raises(ValueError):
+        capture.handler(None)
@@ -1,4 +1,5 @@
 import pytest
+import uasyncio
 from firmware import configuration as config
 from europi_script import EuroPiScript
 from configuration import ConfigFile
@@ -79,3 +80,29 @@ def test_load_config_defaults(script_for_testing_with_config):
 
 def test_load_europi_config(script_for_testing_with_config):
     assert script_for_testing_with_config.europi_config["pico_model"] == "pico"
+
+
+class AsyncScriptForTesting(EuroPiScript):
+    def __init__(self):
+        super().__init__()
+        self.ran = False
+
+    async def main(self):
+        await uasyncio.sleep_ms(0)
+        self.ran = True
+
+
+def test_run_async_main():
+    script = AsyncScriptForTesting()
+    script.run()
+    assert script.ran
+
+
+def test_run_sync_main():
+    class SyncScript(EuroPiScript):
+        def main(self):
+            self.ran = True
+
+    script = SyncScript()
+    script.run()
+    assert script.ran
@@ -0,0 +1,99 @@
+import pytest
+
+import europi
+
+from europi import (
+    AnalogueReader,
+    EMAFilter,
+    MedianFilter,
+    MovingAverageFilter,
+    SlewFilter,
+    configure_filter,
+)
+
+from mock_hardware import MockHardware
+
+
+def run(f, values):
+    return [f.update(value) for value in values]
+
+
+def test_ema():
+    f = EMAFilter(shift=1)
+
+    assert run(f, [100, 200, 200, 0]) == [100, 150, 175, 87]
+
+    f.reset()
+    assert f.update(40) == 40
+
+
+def test_moving_average():
+    f = MovingAverageFilter(size=4)
+
+    assert run(f, [100, 200, 200, 200, 200]) == [100, 125, 150, 175, 200]
+
+    f.reset()
+    assert f.update(40) == 40
+
+
+def test_median_ignores_spikes():
+    f = MedianFilter(size=3)
+
+    assert run(f, [100, 65535, 100, 0, 120, 130, 110]) == [100, 100, 100, 100, 100, 120, 120]
+
+
+@pytest.mark.parametrize("size", [0, 2, 4])
+def test_median_odd_size(size):
+    with pytest.raises(ValueError):
+        MedianFilter(size)
+
+
+def test_median_matches_sorted():
+    values = [5, 3, 9, 9, 1, 7, 2, 8, 8, 0, 6, 4]
+    f = MedianFilter(size=5)
+    f.update(values[0])
+    history = [values[0]] * 5
+
+    for value in values[1:]:
+        history = history[1:] + [value]
+        assert f.update(value) == sorted(history)[2]
+
+
+def test_slew():
+    f = SlewFilter(max_step=100)
+
+    assert run(f, [0, 1000, 1000, 50, 50]) == [0, 100, 200, 100, 50]
+
+
+def test_reader_filters(mockHardware: MockHardware):
+    reader = AnalogueReader(pin=1, samples=1)
+    reader.set_filters(SlewFilter(max_step=100), EMAFilter(shift=1))
+
+    mockHardware.set_ADC_u16_value(reader, 0)
+    assert reader._sample_adc() == 0
+    mockHardware.set_ADC_u16_value(reader, 1000)
+    assert reader._sample_adc() == 50
+
+    reader.reset_filters()
+    assert reader._sample_adc() == 1000
+
+    reader.set_filters()
+    assert reader._sample_adc() == 1000
+
+
+def test_configure_filter():
+    reader = AnalogueReader(pin=1)
+
+    configure_filter(reader, "median")
+    assert isinstance(reader._filters[0], MedianFilter)
+
+    configure_filter(reader, "none")
+    assert reader._filters == ()
+
+
+def test_reset_state_restores_configured_filters():
+    europi.ain.set_filters(MedianFilter())
+
+    europi.reset_state()
+
+    assert europi.ain._filters == ()
@@ -0,0 +1,146 @@
+import pytest
+
+import clock_tracker
+import gc_manager
+from clock_tracker import ClockTracker
+from gc_manager import DEFAULT_MARGIN_US, DEFAULT_PAUSE_US, GCManager
+
+
+class FakeGC:
+    """Stands in for MicroPython's gc module, advancing a ticks_us clock while collecting."""
+
+    def __init__(self):
+        self.now = 0
+        self.pause_us = 3000
+        self.allocated = 0
+        self.free = 100_000
+        self.collections = 0
+        self._threshold = -1
+
+    def collect(self):
+        self.collections += 1
+        self.allocated = 0
+        self.now += self.pause_us
+
+    def mem_alloc(self):
+        return self.allocated
+
+    def mem_free(self):
+        return self.free
+
+    def threshold(self, amount=None):
+        if amount is None:
+            return self._threshold
+        self._threshold = amount
+
+
+@pytest.fixture
+def fake_gc(monkeypatch):
+    g = FakeGC()
+    monkeypatch.setattr(gc_manager, "gc", g)
+    monkeypatch.setattr(gc_manager, "ticks_us", lambda: g.now)
+    monkeypatch.setattr(gc_manager, "ticks_diff", lambda a, b: a - b)
+    monkeypatch.setattr(clock_tracker, "ticks_add", lambda a, b: a + b)
+    monkeypatch.setattr(clock_tracker, "ticks_diff", lambda a, b: a - b)
+    return g
+
+
+@pytest.fixture
+def tracker():
+    t = ClockTracker(size=2)
+    for ticks in (0, 20_000, 40_000):
+        t.on_edge(ticks)
+    return t
+
+
+def test_collect_measures_pause(fake_gc):
+    manager = GCManager()
+
+    manager.collect()
+    fake_gc.pause_us = 5000
+    manager.collect()
+
+    assert manager.collections == 2
+    assert manager.last_pause_us == 5000
+    assert manager.max_pause_us == 5000
+    assert manager.total_pause_us == 8000
+
+    manager.reset_stats()
+
+    assert manager.collections == 0
+    assert manager.max_pause_us == 0
+
+
+def test_collect_late(fake_gc):
+    manager = GCManager()
+
+    manager.collect(deadline=1000)
+
+    assert manager.late_collections == 1
+
+
+def test_collect_before_needs_allocations(fake_gc):
+    manager = GCManager(min_alloc=1000)
+    fake_gc.allocated = 500
+
+    assert not manager.collect_before(100_000)
+
+    fake_gc.allocated = 1000
+
+    assert manager.collect_before(100_000)
+    assert fake_gc.collections == 1
+
+
+def test_collect_before_needs_slack(fake_gc):
+    manager = GCManager(min_alloc=0)
+
+    assert not manager.collect_before(DEFAULT_PAUSE_US + DEFAULT_MARGIN_US - 1)
+    assert manager.collect_before(DEFAULT_PAUSE_US + DEFAULT_MARGIN_US)
+    # the measured pause is used from now on
+    fake_gc.now = 0
+    assert manager.collect_before(3000 + DEFAULT_MARGIN_US)
+
+
+def test_idle_waits_for_slack(fake_gc, tracker):
+    manager = GCManager(tracker, min_alloc=0)
+
+    # the next edge is due at 60ms
+    fake_gc.now = 55_000
+    assert not manager.idle()
+    fake_gc.now = 41_000
+    assert manager.idle()
+    assert manager.late_collections == 0
+
+
+def test_idle_without_clock(fake_gc, tracker):
+    manager = GCManager(tracker, min_alloc=0)
+
+    # the clock stopped, so there's no edge to wait for
+    fake_gc.now = 40_000 + tracker.timeout_us + 1
+    assert manager.idle()
+    assert GCManager(min_alloc=0).idle()
+
+
+def test_critical_holds_off_threshold(fake_gc):
+    manager = GCManager(threshold=2048, min_alloc=0)
+    assert fake_gc.threshold() == 2048
+
+    with manager.critical():
+        with manager.critical():
+            assert fake_gc.threshold() == 100_000
+        assert manager.in_critical
+        assert not manager.idle()
+        assert not manager.collect_before(100_000)
+
+    assert not manager.in_critical
+    assert fake_gc.threshold() == 2048
+
+
+def test_critical_without_threshold(fake_gc):
+    manager = GCManager()
+    assert fake_gc.threshold() == -1
+
+    with manager.critical():
+        assert fake_gc.threshold() == 100_000
+
+    assert fake_gc.threshold() == -1
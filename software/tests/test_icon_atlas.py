@@ -0,0 +1,57 @@
+import pytest
+
+from icon_atlas import IconAtlas
+from icons import BOOTSPLASH, LFO_SHAPES
+from europi import OLED_HEIGHT, OLED_WIDTH
+
+
+class RecordingDisplay:
+    def __init__(self):
+        self.blits = []
+
+    def blit(self, fb, x, y, key):
+        self.blits.append((x, y, key))
+
+
+@pytest.fixture
+def atlas():
+    # two 10x2 icons, 2 bytes per row
+    return IconAtlas(b"\x80\x40\x00\x00" + b"\xff\xc0\xff\xc0", 10, 2)
+
+
+def test_len(atlas):
+    assert len(atlas) == 2
+    assert atlas.icon_bytes == 4
+
+
+def test_blit_copies_icon(atlas):
+    display = RecordingDisplay()
+
+    atlas.blit(display, 1, 3, 4)
+
+    assert atlas._scratch == bytearray(b"\xff\xc0\xff\xc0")
+    assert display.blits == [(3, 4, 0)]
+
+
+def test_blit_inverted(atlas):
+    display = RecordingDisplay()
+
+    atlas.blit(display, 0, 0, 0, colour=0)
+
+    assert atlas._scratch == bytearray(b"\x7f\xbf\xff\xff")
+    assert display.blits == [(0, 0, 1)]
+
+
+def test_blit_index_out_of_range(atlas):
+    with pytest.raises(IndexError):
+        atlas.blit(RecordingDisplay(), 2, 0, 0)
+
+
+def test_partial_icon_data():
+    with pytest.raises(ValueError):
+        IconAtlas(b"\x00\x00\x00", 10, 2)
+
+
+def test_generated_icons():
+    assert len(LFO_SHAPES) == 6
+    assert len(BOOTSPLASH) == OLED_WIDTH * OLED_HEIGHT // 8
@@ -1,6 +1,6 @@
 import pytest
 
-from europi import k1, k2, MAX_UINT16
+from europi import Knob, k1, k2, MAX_UINT16
 
 from mock_hardware import MockHardware
 
@@ -107,3 +107,67 @@ def test_knobs_are_independent(mockHardware: MockHardware):
 
     assert k1.percent(deadzone=0.01) == 1.0
     assert k2.percent(deadzone=0.01) == 0.0
+
+
+@pytest.fixture
+def knob():
+    return Knob(pin=1, deadzone=0.0)  # actual pin value doesn't matter
+
+
+def test_read_stable_position_hysteresis(mockHardware: MockHardware, knob):
+    mockHardware.set_knob_percent(knob, 0.45)
+    assert knob.read_stable_position(steps=10) == 4
+
+    # jitter just past the boundary does not change the position
+    mockHardware.set_knob_percent(knob, 0.51)
+    assert knob.read_stable_position(steps=10) == 4
+    mockHardware.set_knob_percent(knob, 0.38)
+    assert knob.read_stable_position(steps=10) == 4
+
+    mockHardware.set_knob_percent(knob, 0.53)
+    assert knob.read_stable_position(steps=10) == 5
+    mockHardware.set_knob_percent(knob, 0.48)
+    assert knob.read_stable_position(steps=10) == 5
+
+    mockHardware.set_knob_percent(knob, 1.0)
+    assert knob.read_stable_position(steps=10) == 9
+
+
+def test_read_stable_position_new_steps(mockHardware: MockHardware, knob):
+    mockHardware.set_knob_percent(knob, 0.45)
+    assert knob.read_stable_position(steps=10) == 4
+
+    assert knob.read_stable_position(steps=4) == 1
+
+
+def test_on_change(mockHardware: MockHardware, knob):
+    positions = []
+    mockHardware.set_knob_percent(knob, 0.45)
+    knob.on_change(positions.append, steps=10)
+
+    assert not knob.poll()
+    mockHardware.set_knob_percent(knob, 0.51)
+    assert not knob.poll()
+    mockHardware.set_knob_percent(knob, 0.75)
+    assert knob.poll()
+    assert positions == [7]
+
+    knob.reset_handler()
+    mockHardware.set_knob_percent(knob, 0.1)
+    assert knob.poll()
+    assert positions == [7]
+
+
+def test_on_change_not_callable(knob):
+    with pytest.raises(ValueError):
+        knob.on_change(None)
+
+
+def test_read_u16_filtered_reversed(mockHardware: MockHardware, knob):
+    mockHardware.set_knob_percent(knob, 1)
+    assert knob.read_u16_filtered() == MAX_UINT16
+    assert knob.range_int(10) == 9
+
+    mockHardware.set_knob_percent(knob, 0)
+    assert knob.read_u16_filtered() == 0
+    assert knob.range_int(10) == 0
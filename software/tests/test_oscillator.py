@@ -0,0 +1,95 @@
+import pytest
+
+from oscillator import (
+    PHASE_ONE,
+    SAW,
+    SINE,
+    SMOOTH_RANDOM,
+    SMOOTH_RANDOM_POINTS,
+    SMOOTH_RANDOM_SEED,
+    SQUARE,
+    TABLE_MAX,
+    TABLE_SIZE,
+    TRIANGLE,
+    Oscillator,
+    _smooth_random,
+    cycles_per_step,
+)
+
+
+@pytest.mark.parametrize("table", [SINE, SAW, TRIANGLE, SQUARE, SMOOTH_RANDOM])
+def test_tables_wrap(table):
+    assert len(table) == TABLE_SIZE + 1
+    assert table[TABLE_SIZE] == table[0]
+
+
+@pytest.mark.parametrize(
+    "table, expected",
+    [
+        (SINE, 0),
+        (SAW, 0),
+        (TRIANGLE, 0),
+        (SQUARE, TABLE_MAX),
+        (
+            SMOOTH_RANDOM,
+            round(_smooth_random(SMOOTH_RANDOM_POINTS, SMOOTH_RANDOM_SEED)(0) * TABLE_MAX),
+        ),
+    ],
+)
+def test_phase_zero(table, expected):
+    assert table[0] == expected
+
+
+@pytest.mark.parametrize(
+    "table, phase, expected",
+    [
+        (SINE, 0, 0),
+        (SINE, PHASE_ONE // 2, 10000),
+        (SAW, 0, 0),
+        (SAW, PHASE_ONE // 4, 2500),
+        (TRIANGLE, PHASE_ONE // 2, 10000),
+        (TRIANGLE, PHASE_ONE // 4, 5000),
+        (SQUARE, PHASE_ONE // 4, 10000),
+        (SQUARE, PHASE_ONE * 3 // 4, 0),
+    ],
+)
+def test_value(table, phase, expected):
+    oscillator = Oscillator(table)
+    oscillator.phase = phase
+
+    assert oscillator.value() == pytest.approx(expected, abs=2)
+
+
+def test_interpolation():
+    oscillator = Oscillator(SAW, max_mv=TABLE_MAX + 1)
+    oscillator.phase = PHASE_ONE // TABLE_SIZE // 2  # half way between the first two entries
+
+    assert oscillator.value() == pytest.approx(TABLE_MAX / TABLE_SIZE / 2, abs=1)
+
+
+def test_step_and_wrap():
+    oscillator = Oscillator(SAW, increment=PHASE_ONE // 4)
+
+    assert [oscillator.step() for _ in range(4)] == pytest.approx([2500, 5000, 7500, 0], abs=2)
+    assert oscillator.phase == 0
+
+
+def test_advance_and_reset():
+    oscillator = Oscillator(SAW)
+
+    oscillator.advance(PHASE_ONE + PHASE_ONE // 2)
+    assert oscillator.phase == PHASE_ONE // 2
+
+    oscillator.reset()
+    assert oscillator.phase == 0
+
+
+def test_cycles_per_step():
+    assert cycles_per_step(1, 1000) == PHASE_ONE // 1000
+    assert cycles_per_step(250, 1000) == PHASE_ONE // 4
+
+
+def test_smooth_random_is_deterministic_and_in_range():
+    assert min(SMOOTH_RANDOM) >= 0
+    assert max(SMOOTH_RANDOM) <= TABLE_MAX
+    assert len(set(SMOOTH_RANDOM)) > TABLE_SIZE // 2
@@ -0,0 +1,70 @@
+import pytest
+
+from europi import (
+    INPUT_CALIBRATION_VALUES,
+    MAX_UINT16,
+    ain,
+    b1,
+    b2,
+    din,
+    k1,
+    k2,
+    snapshot,
+)
+
+from mock_hardware import MockHardware
+
+
+def test_snapshot_reads_each_input_once(mockHardware: MockHardware, monkeypatch):
+    mockHardware.set_knob_percent(k1, 0.3)
+    mockHardware.set_knob_percent(k2, 1)
+    mockHardware.set_ADC_u16_value(ain, INPUT_CALIBRATION_VALUES[-1])
+    mockHardware.set_digital_value(din, True)
+    mockHardware.set_digital_value(b1, False)
+    mockHardware.set_digital_value(b2, True)
+
+    inputs = snapshot(samples=1)
+    k1_percent = k1.percent(1)
+
+    # later changes don't affect the snapshot
+    mockHardware.set_knob_percent(k1, 0.75)
+
+    assert inputs.k1.percent() == k1_percent
+    assert inputs.k1.read_position(4) == 1
+    assert inputs.k2.choice([1, 2, 3]) == 3
+    assert inputs.k2.range(10) == 9
+    assert inputs.ain.read_voltage() == ain.read_voltage(1)
+    assert inputs.ain.read_millivolts() == ain.read_millivolts(1)
+    assert inputs.ain.percent() == ain.percent(1)
+    assert (inputs.din, inputs.b1, inputs.b2) == (din.value(), b1.value(), b2.value())
+
+
+def test_snapshot_is_reused(mockHardware: MockHardware):
+    mockHardware.set_ADC_u16_value(k1, MAX_UINT16)
+    mockHardware.set_ADC_u16_value(k2, MAX_UINT16)
+    mockHardware.set_ADC_u16_value(ain, 0)
+    for reader in (din, b1, b2):
+        mockHardware.set_digital_value(reader, False)
+
+    first = snapshot()
+    mockHardware.set_ADC_u16_value(k1, 0)
+    second = snapshot()
+
+    assert first is second
+    assert second.k1.read_u16_filtered() == MAX_UINT16
+
+
+@pytest.mark.parametrize("percent", [0, 0.05, 0.33, 0.47, 0.77, 0.93, 1])
+def test_snapshot_ain_positions_are_calibrated(mockHardware: MockHardware, percent):
+    mockHardware.set_ADC_u16_value(k1, 0)
+    mockHardware.set_ADC_u16_value(k2, 0)
+    for reader in (din, b1, b2):
+        mockHardware.set_digital_value(reader, False)
+    mockHardware.set_analogue_input_percent(ain, percent)
+    expected = min(int(ain.percent(1) * 10), 9)
+
+    inputs = snapshot(samples=1)
+
+    assert inputs.ain.choice(list(range(10))) == expected
+    assert inputs.ain.read_position(10) == expected
+    assert inputs.ain.read_u16_filtered() == ain.read_u16_filtered(1)
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+import uasyncio
+
+import timing
+from timing import Ticker, wait_until
+
+
+class FakeClock:
+    """A ticks_us clock that only moves when the code under test sleeps or idles."""
+
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+        self.idles = 0
+
+    def sleep_ms(self, ms):
+        self.sleeps.append(ms)
+        self.now += ms * 1000
+
+    def idle(self):
+        self.idles += 1
+        self.now += 100
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = FakeClock()
+    monkeypatch.setattr(timing, "ticks_us", lambda: c.now)
+    monkeypatch.setattr(timing, "ticks_add", lambda a, b: a + b)
+    monkeypatch.setattr(timing, "ticks_diff", lambda a, b: a - b)
+    monkeypatch.setattr(timing, "sleep_ms", c.sleep_ms)
+    monkeypatch.setattr(timing, "idle", c.idle)
+    return c
+
+
+def test_wait_until_sleeps_then_idles(clock):
+    late = wait_until(10_000)
+
+    assert clock.sleeps == [8]
+    assert clock.idles == 20
+    assert clock.now == 10_000
+    assert late == 0
+
+
+def test_wait_until_passed_deadline(clock):
+    clock.now = 5_000
+
+    assert wait_until(4_000) == 1_000
+    assert clock.sleeps == []
+    assert clock.idles == 0
+
+
+def test_ticker_does_not_drift(clock):
+    ticker = Ticker(period_us=10_000)
+
+    for tick in range(1, 6):
+        # work that takes a varying amount of time between ticks
+        clock.now += 3_000 + tick * 500
+        assert ticker.wait()
+        assert clock.now == tick * 10_000
+
+    assert ticker.missed == 0
+
+
+def test_ticker_reset_immediate(clock):
+    ticker = Ticker(period_us=10_000)
+    ticker.reset(immediate=True)
+
+    assert ticker.deadline() == 0
+    assert ticker.due()
+    assert not ticker.due()
+
+
+def test_ticker_lateness(clock):
+    ticker = Ticker(period_us=10_000)
+    clock.now = 12_500
+
+    assert ticker.due()
+    assert ticker.late_us == 2_500
+    assert ticker.max_late_us == 2_500
+    assert ticker.deadline() == 20_000
+
+
+def test_ticker_skips_missed_ticks(clock):
+    ticker = Ticker(period_us=10_000)
+    clock.now = 35_000
+
+    assert ticker.due()
+    assert ticker.missed == 2
+    assert ticker.late_us == 25_000
+    assert ticker.deadline() == 40_000
+
+
+def test_ticker_period_change(clock):
+    ticker = Ticker(period_us=10_000)
+    ticker.wait()
+    ticker.period_us = 5_000
+
+    assert ticker.deadline() == 15_000
+
+
+def test_ticker_timeout(clock):
+    ticker = Ticker(period_us=100_000)
+
+    assert not ticker.wait(timeout_us=20_000)
+    assert clock.now == 20_000
+    assert ticker.wait(timeout_us=200_000)
+    assert clock.now == 100_000
+
+
+def test_ticker_wait_async(clock, monkeypatch):
+    async def sleep_ms(ms):
+        clock.sleep_ms(ms)
+
+    monkeypatch.setattr(uasyncio, "sleep_ms", sleep_ms)
+    ticker = Ticker(period_us=10_000)
+    clock.now = 1_000
+
+    assert asyncio.run(ticker.wait_async())
+    assert clock.sleeps == [7]
+    assert clock.now == 10_000
+    assert ticker.deadline() == 20_000
@@ -0,0 +1,85 @@
+import pytest
+
+import ui
+from ui import Plot
+
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """Records the pixels and vertical lines drawn by a Plot."""
+    calls = []
+    monkeypatch.setattr(ui.oled, "pixel", lambda x, y, c: calls.append(("pixel", x, y)))
+    monkeypatch.setattr(ui.oled, "vline", lambda x, y, h, c: calls.append(("vline", x, y, h)))
+    monkeypatch.setattr(ui.oled, "fill_rect", lambda *args: calls.append(("fill_rect",) + args))
+    return calls
+
+
+def test_plot_newest_sample_on_right(drawn):
+    plot = Plot(max_value=3, width=4, height=4)
+    plot.add(0)
+    plot.add(3)
+
+    plot.draw()
+
+    assert drawn == [("fill_rect", 0, 0, 4, 4, 0), ("pixel", 2, 3), ("pixel", 3, 0)]
+
+
+def test_plot_ring_wraps(drawn):
+    plot = Plot(max_value=3, width=3, height=4)
+    for value in [3, 0, 1, 2, 3]:
+        plot.add(value)
+
+    plot.draw(clear=False)
+
+    assert drawn == [("pixel", 0, 2), ("pixel", 1, 1), ("pixel", 2, 0)]
+
+
+def test_plot_clamps_values(drawn):
+    plot = Plot(min_value=-1, max_value=1, x=10, y=5, width=2, height=3)
+    plot.add(-5)
+    plot.add(5)
+
+    plot.draw(clear=False)
+
+    assert drawn == [("pixel", 10, 7), ("pixel", 11, 5)]
+
+
+def test_plot_traces_and_visibility(drawn):
+    plot = Plot(traces=2, max_value=3, width=2, height=4)
+    plot.add(0, 3)
+    plot.add(1, 2)
+    plot.visible[0] = False
+
+    plot.draw(clear=False)
+
+    assert drawn == [("pixel", 0, 0), ("pixel", 1, 1)]
+
+
+def test_plot_decimation(drawn):
+    plot = Plot(max_value=3, width=4, height=4, decimation=2)
+    for value in [0, 1, 2, 3]:
+        plot.add(value)
+
+    plot.draw(clear=False)
+
+    assert drawn == [("pixel", 2, 2), ("pixel", 3, 0)]
+
+
+def test_plot_connected(drawn):
+    plot = Plot(width=3, height=4, connected=True, y=1)
+    for value in [0, 1, 1]:
+        plot.add(value)
+
+    plot.draw(clear=False)
+
+    assert drawn == [("pixel", 0, 4), ("vline", 1, 1, 4), ("pixel", 2, 1)]
+
+
+def test_plot_clear(drawn):
+    plot = Plot(width=3, height=4)
+    plot.add(1)
+    plot.clear()
+
+    plot.draw(clear=False)
+
+    assert drawn == []